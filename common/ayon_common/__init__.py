@@ -10,9 +10,13 @@ from .utils import (
     get_ayon_launch_args,
     get_downloads_dir,
     get_archive_ext_and_type,
+    get_tar_open_mode,
     extract_archive_file,
     validate_file_checksum,
+    validate_files_checksums,
+    create_hash_object,
     calculate_file_checksum,
+    calculate_files_checksums,
 )
 
 
@@ -28,7 +32,11 @@ __all__ = (
     "get_ayon_launch_args",
     "get_downloads_dir",
     "get_archive_ext_and_type",
+    "get_tar_open_mode",
     "extract_archive_file",
     "validate_file_checksum",
+    "validate_files_checksums",
+    "create_hash_object",
     "calculate_file_checksum",
+    "calculate_files_checksums",
 )
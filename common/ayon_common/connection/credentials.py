@@ -28,9 +28,11 @@ from ayon_api.utils import (
 
 from ayon_common.utils import (
     get_launcher_local_dir,
+    get_launcher_state_store,
     get_local_site_id,
     get_ayon_launch_args,
 )
+from ayon_common.state_store import StateStore
 
 
 class ChangeUserResult:
@@ -59,6 +61,22 @@ def _get_servers_path():
     return get_launcher_local_dir("used_servers.json")
 
 
+def _import_servers_info(conn, data):
+    for url, url_info in (data.get("urls") or {}).items():
+        StateStore.write_server(
+            conn, url, url_info.get("username"), url_info.get("updated_dt")
+        )
+    StateStore.write_value(conn, "last_server", data.get("last_server"))
+
+
+def _get_state_store():
+    store = get_launcher_state_store()
+    store.migrate_json_file(
+        "used_servers", _get_servers_path(), _import_servers_info
+    )
+    return store
+
+
 def _get_ui_dir_path(*args) -> str:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(current_dir, "ui", *args)
@@ -75,17 +93,11 @@ def get_servers_info_data():
         dict[str, Any]: Information about servers.
     """
 
-    data = {}
-    servers_info_path = _get_servers_path()
-    if not os.path.exists(servers_info_path):
-        dirpath = os.path.dirname(servers_info_path)
-        os.makedirs(dirpath, exist_ok=True)
-
-        return data
-
-    with open(servers_info_path, "r") as stream:
-        with contextlib.suppress(BaseException):
-            data = json.load(stream)
+    store = _get_state_store()
+    data = {"last_server": store.get_value("last_server")}
+    urls = store.get_servers()
+    if urls:
+        data["urls"] = urls
     return data
 
 
@@ -100,18 +112,12 @@ def add_server(url: str, username: str):
         username (str): Name of user used to log in.
     """
 
-    servers_info_path = _get_servers_path()
-    data = get_servers_info_data()
-    data["last_server"] = url
-    if "urls" not in data:
-        data["urls"] = {}
-    data["urls"][url] = {
-        "updated_dt": datetime.datetime.now().strftime("%Y/%m/%d %H:%M:%S"),
-        "username": username,
-    }
-
-    with open(servers_info_path, "w") as stream:
-        json.dump(data, stream)
+    _get_state_store().set_server(
+        url,
+        username,
+        datetime.datetime.now().strftime("%Y/%m/%d %H:%M:%S"),
+        last_server=True,
+    )
 
 
 def remove_server(url: str):
@@ -127,16 +133,7 @@ def remove_server(url: str):
     if not url:
         return
 
-    servers_info_path = _get_servers_path()
-    data = get_servers_info_data()
-    if data.get("last_server") == url:
-        data["last_server"] = None
-
-    if "urls" in data:
-        data["urls"].pop(url, None)
-
-    with open(servers_info_path, "w") as stream:
-        json.dump(data, stream)
+    _get_state_store().remove_server(url)
 
 
 def get_last_server(
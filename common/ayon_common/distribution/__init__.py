@@ -3,6 +3,14 @@ from .exceptions import (
     InstallerDistributionError,
 )
 from .control import AyonDistribution
+from .garbage_collector import (
+    lease_directories,
+    lease_directories_in_background,
+    is_lease_recent,
+    collect_garbage,
+    schedule_garbage_collection,
+)
+from .trash import wait_for_trash_cleanup
 from .utils import (
     show_missing_bundle_information,
     show_installer_issue_information,
@@ -16,6 +24,13 @@ __all__ = (
 
     "AyonDistribution",
 
+    "lease_directories",
+    "lease_directories_in_background",
+    "is_lease_recent",
+    "collect_garbage",
+    "schedule_garbage_collection",
+    "wait_for_trash_cleanup",
+
     "show_missing_bundle_information",
     "show_installer_issue_information",
     "UpdateWindowManager",
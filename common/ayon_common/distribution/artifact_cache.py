@@ -0,0 +1,249 @@
+"""Content-addressable cache of downloaded archives.
+
+Archives of addons and dependency packages are stored by their checksum,
+so re-distribution of the same archive (e.g. after bundle rollback or
+removal of the addons directory) does not have to download it again.
+
+Cache size is limited, least recently used archives are removed when
+the limit is exceeded. The limit can be changed with
+'AYON_ARTIFACT_CACHE_SIZE' environment variable (in bytes), value '0'
+disables the cache.
+"""
+
+import os
+import time
+import uuid
+import shutil
+import logging
+import threading
+
+from ayon_common import (
+    calculate_file_checksum,
+    validate_file_checksum,
+    get_archive_ext_and_type,
+)
+
+from .utils import get_artifacts_dir
+
+DEFAULT_CACHE_SIZE = 10 * 1024 * 1024 * 1024
+# Suffix of files that are being added to cache
+TMP_SUFFIX = ".tmp"
+
+
+def get_artifact_cache_size():
+    """Maximum size of artifact cache in bytes.
+
+    Returns:
+        int: Maximum size, 0 if cache is disabled.
+    """
+
+    value = os.getenv("AYON_ARTIFACT_CACHE_SIZE")
+    if not value:
+        return DEFAULT_CACHE_SIZE
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return DEFAULT_CACHE_SIZE
+
+
+class ArtifactCache:
+    """Cache of archives stored by checksum.
+
+    Archive is stored in '{root}/{algorithm}/{checksum[:2]}/{checksum}{ext}'.
+    Extension of archive is kept, so it can be extracted directly from
+    the cache. Access time of archive is used to track usage, modification
+    time is kept so checksum of verified archive is not calculated again.
+
+    Args:
+        root (Optional[str]): Cache root directory. Output of
+            'get_artifacts_dir' is used if not passed.
+        max_size (Optional[int]): Maximum size of cache in bytes. Output of
+            'get_artifact_cache_size' is used if not passed.
+        logger (Optional[logging.Logger]): Logger object.
+    """
+
+    def __init__(self, root=None, max_size=None, logger=None):
+        if max_size is None:
+            max_size = get_artifact_cache_size()
+        if logger is None:
+            logger = logging.getLogger(self.__class__.__name__)
+        self.log = logger
+        self._root = root
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    @property
+    def root(self):
+        if self._root is None:
+            self._root = get_artifacts_dir()
+        return self._root
+
+    @property
+    def enabled(self):
+        return self._max_size > 0
+
+    def _get_dirpath(self, checksum, checksum_algorithm):
+        checksum = checksum.lower()
+        return os.path.join(self.root, checksum_algorithm, checksum[:2])
+
+    def _find_path(self, checksum, checksum_algorithm):
+        dirpath = self._get_dirpath(checksum, checksum_algorithm)
+        if not os.path.isdir(dirpath):
+            return None
+        checksum = checksum.lower()
+        for filename in os.listdir(dirpath):
+            if filename.endswith(TMP_SUFFIX):
+                continue
+            name = filename.split(".", 1)[0]
+            if name == checksum:
+                return os.path.join(dirpath, filename)
+        return None
+
+    def get(self, checksum, checksum_algorithm, validate=True):
+        """Cached archive with checksum.
+
+        Args:
+            checksum (str): Checksum of archive.
+            checksum_algorithm (str): Algorithm used to calculate checksum.
+            validate (Optional[bool]): Validate checksum of cached file.
+                Archive that did not change since last validation is not
+                hashed again. Invalid file is removed from cache.
+
+        Returns:
+            Union[str, None]: Path to cached archive or None.
+        """
+
+        if not self.enabled or not checksum or not checksum_algorithm:
+            return None
+
+        filepath = self._find_path(checksum, checksum_algorithm)
+        if filepath is None:
+            return None
+
+        if validate and not self._validate(
+            filepath, checksum.lower(), checksum_algorithm
+        ):
+            self.log.warning(f"Removing invalid cached file {filepath}")
+            self._remove(filepath)
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(
+                filepath,
+                ns=(time.time_ns(), os.stat(filepath).st_mtime_ns)
+            )
+        except OSError:
+            pass
+        return filepath
+
+    def _validate(self, filepath, checksum, checksum_algorithm):
+        if validate_file_checksum(filepath, checksum, checksum_algorithm):
+            return True
+        # Remembered checksum might be outdated, calculate it from content
+        return calculate_file_checksum(
+            filepath, checksum_algorithm, 1024 * 1024
+        ) == checksum
+
+    def add(self, filepath, checksum, checksum_algorithm, move=False):
+        """Add archive to cache.
+
+        Checksum of the file is expected to be already validated.
+
+        Args:
+            filepath (str): Path to archive.
+            checksum (str): Checksum of archive.
+            checksum_algorithm (str): Algorithm used to calculate checksum.
+            move (Optional[bool]): Move the file to cache instead of copy.
+
+        Returns:
+            Union[str, None]: Path to cached archive or None if archive was
+                not added.
+        """
+
+        if not self.enabled or not checksum or not checksum_algorithm:
+            return None
+
+        archive_ext, _ = get_archive_ext_and_type(filepath)
+        if archive_ext is None:
+            return None
+
+        file_size = os.path.getsize(filepath)
+        if file_size > self._max_size:
+            return None
+
+        existing_path = self._find_path(checksum, checksum_algorithm)
+        if existing_path is not None:
+            return existing_path
+
+        dirpath = self._get_dirpath(checksum, checksum_algorithm)
+        os.makedirs(dirpath, exist_ok=True)
+        dst_path = os.path.join(dirpath, f"{checksum.lower()}{archive_ext}")
+        tmp_path = f"{dst_path}.{uuid.uuid4().hex}{TMP_SUFFIX}"
+        try:
+            if move:
+                try:
+                    os.replace(filepath, tmp_path)
+                except OSError:
+                    # Different volume
+                    shutil.copyfile(filepath, tmp_path)
+                    os.remove(filepath)
+            else:
+                shutil.copyfile(filepath, tmp_path)
+            os.replace(tmp_path, dst_path)
+
+        except OSError:
+            self.log.warning(
+                f"Failed to add {filepath} to cache", exc_info=True
+            )
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+        self.prune(keep_paths={dst_path})
+        return dst_path
+
+    def prune(self, keep_paths=None):
+        """Remove least recently used archives over the size limit.
+
+        Args:
+            keep_paths (Optional[set[str]]): Paths that should not be
+                removed.
+        """
+
+        keep_paths = keep_paths or set()
+        with self._lock:
+            files = []
+            total_size = 0
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    if filename.endswith(TMP_SUFFIX):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    total_size += stat.st_size
+                    files.append((
+                        max(stat.st_atime, stat.st_mtime),
+                        stat.st_size,
+                        path
+                    ))
+
+            files.sort()
+            for _, size, path in files:
+                if total_size <= self._max_size:
+                    break
+                if path in keep_paths:
+                    continue
+                self.log.debug(f"Removing {path} from cache")
+                if self._remove(path):
+                    total_size -= size
+
+    def _remove(self, filepath):
+        try:
+            os.remove(filepath)
+            return True
+        except OSError:
+            return False
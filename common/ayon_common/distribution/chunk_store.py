@@ -0,0 +1,439 @@
+"""Content-defined chunk store for delta distribution of big archives.
+
+Archive is split into chunks with boundaries defined by content (gear
+rolling hash), so a change in part of the archive changes only chunks
+around the change. Chunk index describes the archive as list of chunks
+identified by their checksum.
+
+Chunk index format:
+    {
+        "version": 1,
+        "algorithm": "sha256",
+        "filename": "package.zip",
+        "size": 123456789,
+        "checksum": "<checksum of whole archive>",
+        "chunks": [
+            {"checksum": "<checksum of chunk>", "size": 1048576},
+            ...
+        ]
+    }
+
+Chunks are published next to the index in '{chunks url}/{checksum[:2]}/
+{checksum}'. Launcher keeps received chunks in local chunk store and
+downloads only chunks that are missing when the archive changes.
+
+Size of chunk store is limited, least recently used chunks are removed
+by garbage collection when the limit is exceeded. The limit can be changed
+with 'AYON_CHUNK_STORE_SIZE' environment variable (in bytes).
+"""
+
+import os
+import time
+import uuid
+import random
+import hashlib
+import logging
+
+from .utils import get_chunks_dir
+
+CHUNK_INDEX_VERSION = 1
+CHUNK_ALGORITHM = "sha256"
+MIN_CHUNK_SIZE = 256 * 1024
+AVG_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+_READ_SIZE = 8 * 1024 * 1024
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+DEFAULT_CHUNK_STORE_SIZE = 10 * 1024 * 1024 * 1024
+# Suffix of chunks that are being added to store
+TMP_SUFFIX = ".tmp"
+
+
+def get_chunk_store_size():
+    """Maximum size of chunk store in bytes.
+
+    Returns:
+        int: Maximum size.
+    """
+
+    value = os.getenv("AYON_CHUNK_STORE_SIZE")
+    if not value:
+        return DEFAULT_CHUNK_STORE_SIZE
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return DEFAULT_CHUNK_STORE_SIZE
+
+
+def _create_gear_table():
+    # Table must be same everywhere, so seeded random generator is used
+    rng = random.Random(0x41594F4E)
+    return tuple(rng.getrandbits(64) for _ in range(256))
+
+
+_GEAR = _create_gear_table()
+
+
+def _get_cut_mask(avg_size):
+    bits = max(avg_size.bit_length() - 1, 1)
+    # Use upper bits of hash, lower bits are affected only by few bytes
+    return ((1 << bits) - 1) << (64 - bits)
+
+
+def _find_cut(data, start, end, min_size, max_size, mask):
+    """Find end of chunk starting at 'start' in 'data'.
+
+    Args:
+        data (bytes): Data buffer.
+        start (int): Start of chunk in buffer.
+        end (int): End of data in buffer.
+        min_size (int): Minimal chunk size.
+        max_size (int): Maximal chunk size.
+        mask (int): Mask for cut point detection.
+
+    Returns:
+        int: End of chunk (exclusive).
+    """
+
+    size = end - start
+    if size <= min_size:
+        return end
+    scan_end = start + min(size, max_size)
+    gear = _GEAR
+    value = 0
+    for idx in range(start + min_size, scan_end):
+        value = ((value << 1) + gear[data[idx]]) & _MASK_64
+        if not value & mask:
+            return idx + 1
+    return scan_end
+
+
+def iter_file_chunks(
+    filepath,
+    min_size=MIN_CHUNK_SIZE,
+    avg_size=AVG_CHUNK_SIZE,
+    max_size=MAX_CHUNK_SIZE,
+):
+    """Split file to content-defined chunks.
+
+    Args:
+        filepath (str): Path to a file.
+        min_size (Optional[int]): Minimal chunk size.
+        avg_size (Optional[int]): Expected average chunk size.
+        max_size (Optional[int]): Maximal chunk size.
+
+    Yields:
+        bytes: Chunk data.
+    """
+
+    mask = _get_cut_mask(avg_size)
+    buffer = b""
+    offset = 0
+    eof = False
+    with open(filepath, "rb") as stream:
+        while True:
+            available = len(buffer) - offset
+            # Cut point can be searched only with enough data in buffer
+            if not eof and available < max_size:
+                data = stream.read(_READ_SIZE)
+                if data:
+                    buffer = buffer[offset:] + data
+                    offset = 0
+                else:
+                    eof = True
+                continue
+
+            if not available:
+                break
+
+            cut = _find_cut(
+                buffer, offset, len(buffer), min_size, max_size, mask
+            )
+            yield buffer[offset:cut]
+            offset = cut
+
+
+def get_chunk_relpath(checksum):
+    """Relative path of chunk in chunk store or on server.
+
+    Args:
+        checksum (str): Chunk checksum.
+
+    Returns:
+        str: Relative path with forward slashes.
+    """
+
+    return f"{checksum[:2]}/{checksum}"
+
+
+def create_chunk_index(filepath, chunks_dirpath=None, **chunk_kwargs):
+    """Create chunk index of a file and optionally write its chunks.
+
+    Used to publish archive for chunked distribution.
+
+    Args:
+        filepath (str): Path to archive.
+        chunks_dirpath (Optional[str]): Directory where chunks are written.
+        **chunk_kwargs: Chunk size options for 'iter_file_chunks'.
+
+    Returns:
+        dict[str, Any]: Chunk index.
+    """
+
+    file_hash = hashlib.new(CHUNK_ALGORITHM)
+    chunks = []
+    for chunk in iter_file_chunks(filepath, **chunk_kwargs):
+        file_hash.update(chunk)
+        checksum = hashlib.new(CHUNK_ALGORITHM, chunk).hexdigest()
+        chunks.append({"checksum": checksum, "size": len(chunk)})
+        if chunks_dirpath is None:
+            continue
+        chunk_path = os.path.join(
+            chunks_dirpath, *get_chunk_relpath(checksum).split("/")
+        )
+        if not os.path.exists(chunk_path):
+            os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+            with open(chunk_path, "wb") as stream:
+                stream.write(chunk)
+
+    return {
+        "version": CHUNK_INDEX_VERSION,
+        "algorithm": CHUNK_ALGORITHM,
+        "filename": os.path.basename(filepath),
+        "size": sum(chunk["size"] for chunk in chunks),
+        "checksum": file_hash.hexdigest(),
+        "chunks": chunks,
+    }
+
+
+def validate_chunk_index(index):
+    """Validate chunk index data.
+
+    Args:
+        index (dict[str, Any]): Chunk index.
+
+    Raises:
+        ValueError: Index is not valid.
+    """
+
+    if not isinstance(index, dict):
+        raise ValueError("Chunk index is not a dictionary")
+    if index.get("version") != CHUNK_INDEX_VERSION:
+        raise ValueError(
+            f"Unsupported chunk index version '{index.get('version')}'"
+        )
+    if index.get("algorithm") not in hashlib.algorithms_available:
+        raise ValueError(
+            f"Unknown chunk algorithm '{index.get('algorithm')}'"
+        )
+    chunks = index.get("chunks")
+    if not isinstance(chunks, list):
+        raise ValueError("Chunk index does not contain chunks")
+    if sum(chunk["size"] for chunk in chunks) != index.get("size"):
+        raise ValueError("Size of chunks does not match size of file")
+
+
+class ChunkStore:
+    """Local store of chunks received for chunked distribution.
+
+    Modification time of chunk is used to track usage, it is updated when
+    the chunk is found in store.
+
+    Args:
+        root (Optional[str]): Store root directory. Output of
+            'get_chunks_dir' is used if not passed.
+        max_size (Optional[int]): Maximum size of store in bytes. Output of
+            'get_chunk_store_size' is used if not passed.
+        logger (Optional[logging.Logger]): Logger object.
+    """
+
+    def __init__(self, root=None, max_size=None, logger=None):
+        if max_size is None:
+            max_size = get_chunk_store_size()
+        if logger is None:
+            logger = logging.getLogger(self.__class__.__name__)
+        self.log = logger
+        self._root = root
+        self._max_size = max_size
+
+    @property
+    def root(self):
+        if self._root is None:
+            self._root = get_chunks_dir()
+        return self._root
+
+    def get_chunk_path(self, algorithm, checksum):
+        return os.path.join(
+            self.root, algorithm, *get_chunk_relpath(checksum).split("/")
+        )
+
+    def has_chunk(self, algorithm, checksum, size):
+        """Chunk is available in store.
+
+        Args:
+            algorithm (str): Chunk checksum algorithm.
+            checksum (str): Chunk checksum.
+            size (int): Expected chunk size.
+
+        Returns:
+            bool: Chunk is available.
+        """
+
+        path = self.get_chunk_path(algorithm, checksum)
+        try:
+            if os.path.getsize(path) != size:
+                return False
+            # Mark as recently used
+            os.utime(path, None)
+        except OSError:
+            return False
+        return True
+
+    def get_missing_chunks(self, index):
+        """Chunks of index which are not available in store.
+
+        Args:
+            index (dict[str, Any]): Chunk index.
+
+        Returns:
+            list[dict[str, Any]]: Unique missing chunks.
+        """
+
+        algorithm = index["algorithm"]
+        output = []
+        processed = set()
+        for chunk in index["chunks"]:
+            checksum = chunk["checksum"]
+            if checksum in processed:
+                continue
+            processed.add(checksum)
+            if not self.has_chunk(algorithm, checksum, chunk["size"]):
+                output.append(chunk)
+        return output
+
+    def add_chunk(self, algorithm, checksum, data):
+        """Validate chunk data and store them.
+
+        Args:
+            algorithm (str): Chunk checksum algorithm.
+            checksum (str): Expected chunk checksum.
+            data (bytes): Chunk data.
+
+        Raises:
+            ValueError: Data does not match checksum.
+        """
+
+        if hashlib.new(algorithm, data).hexdigest() != checksum:
+            raise ValueError(f"Chunk '{checksum}' has invalid content")
+
+        path = self.get_chunk_path(algorithm, checksum)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}{TMP_SUFFIX}"
+        with open(tmp_path, "wb") as stream:
+            stream.write(data)
+        os.replace(tmp_path, path)
+
+    def add_file(self, filepath, index):
+        """Store chunks of a local file described by index.
+
+        Can be used to fill the store from already available archive.
+
+        Args:
+            filepath (str): Path to archive matching the index.
+            index (dict[str, Any]): Chunk index of the archive.
+        """
+
+        algorithm = index["algorithm"]
+        with open(filepath, "rb") as stream:
+            for chunk in index["chunks"]:
+                data = stream.read(chunk["size"])
+                checksum = chunk["checksum"]
+                if not self.has_chunk(algorithm, checksum, chunk["size"]):
+                    self.add_chunk(algorithm, checksum, data)
+
+    def prune(self, grace_period=0):
+        """Remove least recently used chunks over the size limit.
+
+        Args:
+            grace_period (Optional[float]): Chunks used in last seconds
+                are not removed, they could be used by running
+                distribution.
+
+        Returns:
+            int: Number of removed chunks.
+        """
+
+        used_after = time.time() - grace_period
+        chunks = []
+        total_size = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                # Remove leftovers of interrupted writes
+                if filename.endswith(TMP_SUFFIX):
+                    if stat.st_mtime < used_after:
+                        self._remove(path)
+                    continue
+                total_size += stat.st_size
+                chunks.append((stat.st_mtime, stat.st_size, path))
+
+        removed = 0
+        chunks.sort()
+        for last_used, size, path in chunks:
+            if total_size <= self._max_size or last_used > used_after:
+                break
+            if self._remove(path):
+                total_size -= size
+                removed += 1
+        if removed:
+            self.log.debug(f"Removed {removed} chunks from chunk store")
+        return removed
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def rebuild_file(self, index, filepath, checksum=None):
+        """Rebuild file from stored chunks.
+
+        Args:
+            index (dict[str, Any]): Chunk index.
+            filepath (str): Output path.
+            checksum (Optional[TransferChecksum]): Checksum fed with
+                rebuilt content.
+
+        Raises:
+            ValueError: Rebuilt file does not match index checksum.
+        """
+
+        algorithm = index["algorithm"]
+        file_hash = hashlib.new(algorithm)
+        tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as stream:
+                for chunk in index["chunks"]:
+                    chunk_path = self.get_chunk_path(
+                        algorithm, chunk["checksum"]
+                    )
+                    with open(chunk_path, "rb") as chunk_stream:
+                        data = chunk_stream.read()
+                    stream.write(data)
+                    file_hash.update(data)
+                    if checksum is not None:
+                        checksum.update(data)
+
+            if file_hash.hexdigest() != index["checksum"]:
+                raise ValueError(
+                    f"Rebuilt file '{filepath}' does not match chunk index"
+                )
+            os.replace(tmp_path, filepath)
+
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -1,25 +1,27 @@
 import os
 import sys
 import json
+import time
 import uuid
 import ctypes
 import tempfile
 import traceback
-import collections
 import datetime
 import logging
 import shutil
-import threading
 import platform
 import subprocess
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 
 import attr
 import ayon_api
+from ayon_api.exceptions import HTTPRequestError
 
 from ayon_common.utils import (
     HEADLESS_MODE_ENABLED,
     extract_archive_file,
+    get_archive_ext_and_type,
     is_staging_enabled,
     is_dev_mode_enabled,
     get_executables_info_by_version,
@@ -30,16 +32,60 @@ from .exceptions import BundleNotFoundError, InstallerDistributionError
 from .utils import (
     get_addons_dir,
     get_dependencies_dir,
+    get_distribution_state_store,
 )
 from .downloaders import get_default_download_factory
+from .scheduler import DistributionScheduler
+from .artifact_cache import ArtifactCache
+from .response_cache import ResponseCache, is_response_cache_enabled
+from .manifest import (
+    is_incremental_update_enabled,
+    create_zip_manifest,
+    get_damaged_files,
+    read_manifest,
+    write_manifest,
+    extract_zip_incremental,
+)
+from .locks import (
+    LOCK_POLL_INTERVAL,
+    get_lock_timeout,
+    get_distribution_lock,
+    is_shared_storage_enabled,
+    read_completion_marker,
+    write_completion_marker,
+)
+from .fingerprint import (
+    is_fingerprint_enabled,
+    create_bundle_fingerprint,
+    get_fingerprint_data,
+    store_fingerprint_data,
+)
+from .garbage_collector import lease_directories, defer_lease
+from .trash import (
+    TRASH_DIRNAME,
+    move_to_trash,
+    get_trash_dirpath,
+    schedule_trash_cleanup,
+)
 from .data_structures import (
     Installer,
     AddonInfo,
     DependencyItem,
     Bundle,
+    LazyItems,
 )
 
 NOT_SET = type("UNKNOWN", (), {"__bool__": lambda: False})()
+# Subfolder of addons and dependency packages directories where are
+#   downloaded archives kept until they're extracted. Partial downloads
+#   in the folder can be resumed by next distribution.
+DOWNLOADS_DIRNAME = ".downloads"
+# Subfolder of addons and dependency packages directories where is new
+#   content extracted. Content is renamed to its final destination only
+#   after it is fully extracted and verified.
+STAGING_DIRNAME = ".staging"
+# Maximum of concurrent requests for information about addon versions
+MAX_ADDON_REQUESTS = 8
 
 
 class UpdateState(Enum):
@@ -182,6 +228,7 @@ class BaseDistributionItem:
         downloader_data (Dict[str, Any]): More information for downloaders.
         item_label (str): Label used in log outputs (and in UI).
         logger (logging.Logger): Logger object.
+        size (Optional[int]): Expected size of source file in bytes if known.
     """
 
     def __init__(
@@ -195,6 +242,7 @@ class BaseDistributionItem:
         downloader_data,
         item_label,
         logger=None,
+        size=None,
     ):
         if logger is None:
             logger = logging.getLogger(self.__class__.__name__)
@@ -207,6 +255,7 @@ class BaseDistributionItem:
         self.sources = self._prepare_sources(sources)
         self.downloader_data = downloader_data
         self.item_label = item_label
+        self.size = size
 
         self._need_distribution = state != UpdateState.UPDATED
         self._current_source_progress = None
@@ -303,13 +352,27 @@ class BaseDistributionItem:
 
         download_dirpath = self.download_dirpath
 
+        transfer_checksum = None
         try:
-            filepath = downloader.download(
-                source_data,
-                download_dirpath,
-                self.downloader_data,
-                source_progress.transfer_progress,
-            )
+            if self.checksum:
+                # Checksum is calculated during transfer if downloader
+                #   supports it, so file does not have to be read again
+                filepath, transfer_checksum = (
+                    downloader.download_with_checksum(
+                        source_data,
+                        download_dirpath,
+                        self.downloader_data,
+                        source_progress.transfer_progress,
+                        self.checksum_algorithm,
+                    )
+                )
+            else:
+                filepath = downloader.download(
+                    source_data,
+                    download_dirpath,
+                    self.downloader_data,
+                    source_progress.transfer_progress,
+                )
         except Exception:
             message = "Failed to download source"
             source_progress.set_failed(message)
@@ -324,7 +387,12 @@ class BaseDistributionItem:
             # WARNING This condition was added because addons don't have
             #   information about checksum at the moment.
             # TODO remove once addon can supply checksum.
-            if self.checksum:
+            if transfer_checksum is not None:
+                if transfer_checksum != self.checksum:
+                    raise ValueError(
+                        f"{filepath} doesn't match expected hash."
+                    )
+            elif self.checksum:
                 downloader.check_hash(
                     filepath, self.checksum, self.checksum_algorithm
                 )
@@ -373,10 +441,11 @@ class BaseDistributionItem:
         )
         return bool(filepath)
 
-    def _process_source(self, source, source_progress):
-        """Process single source item.
+    def receive_source(self, source, source_progress):
+        """Download stage of single source item.
 
-        Cares about download, validate and process source.
+        Prepares downloader and receives the source file. Result of this
+            method should be passed to 'process_received_source'.
 
         Args:
             source (SourceInfo): Source information.
@@ -384,8 +453,9 @@ class BaseDistributionItem:
                 about process of an source.
 
         Returns:
-            bool: Source was processed so any other sources can be skipped.
-                Does not have to be successfull.
+            Union[tuple[Union[str, None], dict[str, Any], SourceDownloader],
+                None]: Received filepath, source data and downloader or None
+                if source could not be used at all.
         """
 
         self._current_source_progress = source_progress
@@ -398,7 +468,7 @@ class BaseDistributionItem:
             message = f"Unknown downloader {source.type}"
             source_progress.set_failed(message)
             self.log.warning(message, exc_info=True)
-            return False
+            return None
 
         try:
             source_data = attr.asdict(source)
@@ -407,6 +477,33 @@ class BaseDistributionItem:
                 source_progress,
                 downloader
             )
+
+        except Exception:
+            message = "Failed to process source"
+            source_progress.set_failed(message)
+            self.log.warning(
+                f"{self.item_label}: {message}",
+                exc_info=True
+            )
+            return None
+        return filepath, source_data, downloader
+
+    def process_received_source(self, received, source_progress):
+        """Process stage of single source item (e.g. extraction).
+
+        Args:
+            received (tuple[Union[str, None], dict[str, Any],
+                SourceDownloader]): Output of 'receive_source'.
+            source_progress (DistributeTransferProgress): Object to keep track
+                about process of an source.
+
+        Returns:
+            bool: Source was processed so any other sources can be skipped.
+                Does not have to be successfull.
+        """
+
+        filepath, source_data, downloader = received
+        try:
             return self._post_source_process(
                 filepath, source_data, source_progress, downloader
             )
@@ -420,20 +517,60 @@ class BaseDistributionItem:
             )
             return False
 
-    def _distribute(self):
-        if not self.sources:
-            message = (
-                f"{self.item_label}: Don't have"
-                " any sources to download from."
-            )
-            self.log.error(message)
-            self._error_msg = message
-            self.state = UpdateState.MISS_SOURCE_FILES
-            return
+    def _process_source(self, source, source_progress):
+        """Process single source item.
 
-        for source, source_progress in self.sources:
-            if self._process_source(source, source_progress):
-                break
+        Cares about download, validate and process source.
+
+        Args:
+            source (SourceInfo): Source information.
+            source_progress (DistributeTransferProgress): Object to keep track
+                about process of an source.
+
+        Returns:
+            bool: Source was processed so any other sources can be skipped.
+                Does not have to be successfull.
+        """
+
+        received = self.receive_source(source, source_progress)
+        if received is None:
+            return False
+        return self.process_received_source(received, source_progress)
+
+    def validate_sources(self):
+        """Validate that item has any sources to distribute from.
+
+        Item is marked with 'UpdateState.MISS_SOURCE_FILES' if there are none.
+
+        Returns:
+            bool: Item has sources.
+        """
+
+        if self.sources:
+            return True
+
+        message = (
+            f"{self.item_label}: Don't have"
+            " any sources to download from."
+        )
+        self.log.error(message)
+        self._error_msg = message
+        self.state = UpdateState.MISS_SOURCE_FILES
+        return False
+
+    def can_process_sources(self):
+        """Item is outdated and has sources to distribute from.
+
+        Returns:
+            bool: Sources of item should be processed.
+        """
+
+        if self.state != UpdateState.OUTDATED:
+            return False
+        return self.validate_sources()
+
+    def finish_sources(self):
+        """Resolve state after all sources were processed."""
 
         last_progress = self._current_source_progress
         self._current_source_progress = None
@@ -445,38 +582,76 @@ class BaseDistributionItem:
         self.log.error(f"{self.item_label}: Failed to distribute")
         self._error_msg = "Failed to receive or install source files"
 
+    def _distribute(self):
+        if not self.validate_sources():
+            return
+
+        for source, source_progress in self.sources:
+            if self._process_source(source, source_progress):
+                break
+
+        self.finish_sources()
+
     def _post_distribute(self):
         pass
 
+    def start_distribution(self):
+        """Mark distribution as started.
+
+        Returns:
+            bool: Distribution should happen. False if item does not need
+                distribution or distribution already started.
+        """
+
+        if not self.need_distribution or self._dist_started:
+            return False
+        self._dist_started = True
+        return True
+
+    def set_distribution_failed(self, exc):
+        """Mark distribution as failed because of unexpected exception.
+
+        Should be called from 'except' block, so traceback is available.
+
+        Args:
+            exc (Exception): Exception that caused the failure.
+        """
+
+        self.state = UpdateState.UPDATE_FAILED
+        self._error_msg = str(exc)
+        self._error_detail = "".join(
+            traceback.format_exception(*sys.exc_info())
+        )
+        self.log.error(
+            f"{self.item_label}: Distibution failed",
+            exc_info=True
+        )
+
+    def end_distribution(self):
+        """Mark distribution as finished and trigger post distribution."""
+
+        self._dist_finished = True
+        if self.state == UpdateState.OUTDATED:
+            self.state = UpdateState.UPDATE_FAILED
+            self._error_msg = "Distribution failed"
+
+        self._post_distribute()
+
     def distribute(self):
         """Execute distribution logic."""
 
-        if not self.need_distribution or self._dist_started:
+        if not self.start_distribution():
             return
 
-        self._dist_started = True
         try:
             if self.state == UpdateState.OUTDATED:
                 self._distribute()
 
         except Exception as exc:
-            self.state = UpdateState.UPDATE_FAILED
-            self._error_msg = str(exc)
-            self._error_detail = "".join(
-                traceback.format_exception(*sys.exc_info())
-            )
-            self.log.error(
-                f"{self.item_label}: Distibution failed",
-                exc_info=True
-            )
+            self.set_distribution_failed(exc)
 
         finally:
-            self._dist_finished = True
-            if self.state == UpdateState.OUTDATED:
-                self.state = UpdateState.UPDATE_FAILED
-                self._error_msg = "Distribution failed"
-
-            self._post_distribute()
+            self.end_distribution()
 
 
 def create_tmp_file(suffix=None, prefix=None):
@@ -806,12 +981,39 @@ class InstallerDistributionItem(BaseDistributionItem):
         return True
 
 
+def get_staging_dirpath(unzip_dirpath):
+    """Directory where content is extracted before it is promoted.
+
+    Args:
+        unzip_dirpath (str): Path to directory where content is installed.
+
+    Returns:
+        str: Path to staging directory.
+    """
+
+    unzip_dirpath = os.path.normpath(unzip_dirpath)
+    return os.path.join(
+        os.path.dirname(unzip_dirpath),
+        STAGING_DIRNAME,
+        os.path.basename(unzip_dirpath)
+    )
+
+
 class DistributionItem(BaseDistributionItem):
     """Distribution item with sources and target directories.
 
     Distribution item for addons and dependency packages. They have defined
     unzip directory where the downloaded content is unzipped.
 
+    Content is extracted to a staging directory next to the unzip directory
+    and renamed to the unzip directory only after successful extraction.
+    Previous content of unzip directory is kept until then and is moved
+    to trash, which is emptied in background.
+
+    Distribution is guarded by a lock, so only one process distributes
+    the item at a time. Process that waited for the lock uses content
+    distributed by the other process if its completion marker matches.
+
     Args:
         unzip_dirpath (str): Path to directory where zip is downloaded.
         download_dirpath (str): Path to directory where file is unzipped.
@@ -824,30 +1026,401 @@ class DistributionItem(BaseDistributionItem):
         downloader_data (Dict[str, Any]): More information for downloaders.
         item_label (str): Label used in log outputs (and in UI).
         logger (logging.Logger): Logger object.
+        artifact_cache (Optional[ArtifactCache]): Cache of downloaded
+            archives. Archive with matching checksum is used from cache
+            instead of downloading it.
+        previous_dirpath (Optional[str]): Directory with previously
+            installed version. Unchanged files are reused from it.
     """
 
-    def __init__(self,unzip_dirpath, *args, **kwargs):
+    def __init__(
+        self,
+        unzip_dirpath,
+        *args,
+        artifact_cache=None,
+        previous_dirpath=None,
+        **kwargs
+    ):
         self.unzip_dirpath = unzip_dirpath
+        self.artifact_cache = artifact_cache
+        self.previous_dirpath = previous_dirpath
+        self._dist_lock = get_distribution_lock(unzip_dirpath)
+        # Names of damaged files of distributed content that is repaired
+        self._damaged_files = None
         super().__init__(*args, **kwargs)
 
+    @property
+    def staging_dirpath(self):
+        """Directory where content is extracted before it is promoted.
+
+        Returns:
+            str: Path to staging directory.
+        """
+
+        return get_staging_dirpath(self.unzip_dirpath)
+
+    @property
+    def trash_dirpath(self):
+        """Directory where are replaced directories moved before removal.
+
+        Returns:
+            str: Path to trash directory.
+        """
+
+        return get_trash_dirpath(self.unzip_dirpath)
+
+    def set_damaged(self, damaged_files=None):
+        """Mark distributed content as damaged to distribute it again.
+
+        Undamaged files of the content are reused if the item is
+        distributed from the same zip archive.
+
+        Args:
+            damaged_files (Optional[Iterable[str]]): Names of damaged files
+                from manifest. Whole content is distributed if not passed.
+        """
+
+        self.state = UpdateState.OUTDATED
+        self._need_distribution = True
+        self._dist_started = False
+        self._dist_finished = False
+        self._error_msg = None
+        self._error_detail = None
+        self.sources = self._prepare_sources(
+            [source for source, _ in self.sources]
+        )
+        self.previous_dirpath = None
+        self._damaged_files = set()
+        if damaged_files is not None:
+            self.previous_dirpath = self.unzip_dirpath
+            self._damaged_files = set(damaged_files)
+
+    def _lock_distribution(self):
+        """Acquire distribution lock of the item.
+
+        Content distributed by other process is used if it finished
+        distribution while this process was waiting for the lock.
+
+        Returns:
+            bool: Item still needs distribution.
+        """
+
+        if self._dist_lock.locked:
+            return self.state == UpdateState.OUTDATED
+
+        initial_marker = read_completion_marker(self.unzip_dirpath) or {}
+        initial_marker_id = initial_marker.get("id")
+        if not self._dist_lock.try_acquire():
+            self.log.info(
+                f"{self.item_label}: Waiting for other process"
+                " to finish distribution"
+            )
+            timeout = get_lock_timeout()
+            start = time.time()
+            while True:
+                # Owner may be still cleaning up after distribution
+                if self._use_distributed_content(initial_marker_id):
+                    return False
+                if self._dist_lock.try_acquire():
+                    break
+                if time.time() - start > timeout:
+                    message = (
+                        "Other process did not finish distribution"
+                        f" in {timeout} seconds"
+                    )
+                    self.state = UpdateState.UPDATE_FAILED
+                    self._error_msg = message
+                    self.log.error(f"{self.item_label}: {message}")
+                    return False
+                time.sleep(LOCK_POLL_INTERVAL)
+
+        if self._use_distributed_content(initial_marker_id):
+            return False
+        return self.state == UpdateState.OUTDATED
+
+    def _use_distributed_content(self, initial_marker_id):
+        """Use content already distributed by other process.
+
+        Content is used if completion marker has the same checksum. Item
+        without checksum uses content with marker that was created after
+        this process started to wait for the lock.
+
+        Args:
+            initial_marker_id (Union[str, None]): Id of completion marker
+                before process started to wait for the lock.
+
+        Returns:
+            bool: Distributed content is used.
+        """
+
+        if self.state != UpdateState.OUTDATED:
+            return False
+
+        marker = read_completion_marker(self.unzip_dirpath)
+        if not marker:
+            return False
+
+        # Repaired content has the same checksum as damaged content
+        if self.checksum and self._damaged_files is None:
+            matching = (
+                marker.get("checksum") == self.checksum
+                and marker.get("checksum_algorithm")
+                == self.checksum_algorithm
+            )
+        else:
+            marker_id = marker.get("id")
+            matching = marker_id is not None and marker_id != initial_marker_id
+
+        if not matching:
+            return False
+
+        self.log.info(
+            f"{self.item_label}: Using content distributed"
+            f" by other process in {self.unzip_dirpath}"
+        )
+        self.state = UpdateState.UPDATED
+        self._used_source = marker.get("source")
+        return True
+
+    def can_process_sources(self):
+        if self.state != UpdateState.OUTDATED:
+            return False
+        if not self._lock_distribution():
+            return False
+        return super().can_process_sources()
+
+    def _distribute(self):
+        if self._lock_distribution():
+            super()._distribute()
+
+    def _discard_staging(self):
+        staging_dirpath = self.staging_dirpath
+        if os.path.isdir(staging_dirpath):
+            move_to_trash(staging_dirpath, self.trash_dirpath)
+
+    def _receive_file(self, source_data, source_progress, downloader):
+        cached_path = self._get_cached_file(source_progress)
+        if cached_path:
+            return cached_path
+
+        if downloader.can_extract_stream(source_data, self.downloader_data):
+            return self._receive_stream(
+                source_data, source_progress, downloader
+            )
+
+        filepath = super()._receive_file(
+            source_data, source_progress, downloader
+        )
+        if filepath:
+            filepath = self._cache_file(filepath)
+        return filepath
+
+    def _get_cached_file(self, source_progress):
+        """Archive from artifact cache matching item checksum.
+
+        Args:
+            source_progress (DistributeTransferProgress): Object where to
+                track process of a source.
+
+        Returns:
+            Union[str, None]: Path to cached archive.
+        """
+
+        if self.artifact_cache is None or not self.checksum:
+            return None
+
+        try:
+            filepath = self.artifact_cache.get(
+                self.checksum, self.checksum_algorithm
+            )
+        except Exception:
+            self.log.warning(
+                f"{self.item_label}: Failed to use artifact cache",
+                exc_info=True
+            )
+            filepath = None
+
+        if filepath:
+            self.log.info(f"{self.item_label}: Using cached {filepath}")
+            # Cache validated the checksum
+            source_progress.set_hash_check_started()
+            source_progress.set_hash_check_finished()
+        return filepath
+
+    def _cache_file(self, filepath):
+        """Store validated archive to artifact cache.
+
+        Only downloaded files are moved to the cache. Files from other
+        sources (e.g. shared drive) are used directly.
+
+        Args:
+            filepath (str): Path to received archive.
+
+        Returns:
+            str: Path to archive that should be extracted.
+        """
+
+        if self.artifact_cache is None or not self.checksum:
+            return filepath
+
+        download_dirpath = os.path.normpath(self.download_dirpath)
+        if os.path.dirname(os.path.normpath(filepath)) != download_dirpath:
+            return filepath
+
+        try:
+            cached_path = self.artifact_cache.add(
+                filepath, self.checksum, self.checksum_algorithm, move=True
+            )
+        except Exception:
+            self.log.warning(
+                f"{self.item_label}: Failed to add file to artifact cache",
+                exc_info=True
+            )
+            cached_path = None
+
+        if cached_path and os.path.exists(cached_path):
+            return cached_path
+        return filepath
+
+    def _receive_stream(self, source_data, source_progress, downloader):
+        """Extract archive to staging directory while it is downloaded.
+
+        Args:
+            source_data (dict[str, Any]): Source information.
+            source_progress (DistributeTransferProgress): Object where to
+                track process of a source.
+            downloader (SourceDownloader): Downloader object which supports
+                stream extraction of the source.
+
+        Returns:
+            Union[str, None]: Path to staging directory with extracted
+                content.
+        """
+
+        staging_dirpath = self.staging_dirpath
+        source_progress.set_unzip_started()
+        try:
+            checksum = downloader.extract_stream(
+                source_data,
+                staging_dirpath,
+                self.downloader_data,
+                source_progress.transfer_progress,
+                self.checksum_algorithm if self.checksum else None,
+            )
+        except Exception:
+            message = "Failed to download and extract source"
+            source_progress.set_failed(message)
+            self.log.warning(
+                f"{self.item_label}: {message}",
+                exc_info=True
+            )
+            self._discard_staging()
+            return None
+
+        source_progress.set_hash_check_started()
+        if self.checksum and checksum != self.checksum:
+            message = "File hash does not match"
+            source_progress.set_failed(message)
+            self.log.warning(f"{self.item_label}: {message}")
+            self._discard_staging()
+            return None
+        source_progress.set_hash_check_finished()
+        return staging_dirpath
+
+    def _promote_staging(self):
+        """Replace unzip directory with staging directory.
+
+        Both operations are renames on the same volume. Previous content
+        is moved to trash and removed in background.
+        """
+
+        unzip_dirpath = self.unzip_dirpath
+        if os.path.isdir(unzip_dirpath):
+            self.log.debug(f"Moving {unzip_dirpath} to trash")
+            move_to_trash(unzip_dirpath, self.trash_dirpath)
+        os.replace(self.staging_dirpath, unzip_dirpath)
+
     def _pre_source_process(self):
         super()._pre_source_process()
-        unzip_dirpath = self.unzip_dirpath
+        # Leftover from previous source or crashed distribution
+        self._discard_staging()
 
-        # Remove directory if exists
-        if os.path.isdir(unzip_dirpath):
-            self.log.debug(f"Cleaning {unzip_dirpath}")
-            shutil.rmtree(unzip_dirpath)
+    def _extract_archive(self, filepath, downloader):
+        """Extract archive to staging directory.
+
+        Zip archives are extracted incrementally if previous version
+        has manifest. Manifest is stored only with extracted zip content.
+
+        Args:
+            filepath (str): Path to archive.
+            downloader (SourceDownloader): Downloader which received
+                the archive.
+        """
+
+        staging_dirpath = self.staging_dirpath
+        os.makedirs(staging_dirpath, exist_ok=True)
+        archive_ext, _ = get_archive_ext_and_type(filepath)
+        if archive_ext != ".zip":
+            downloader.unzip(filepath, staging_dirpath)
+            return
+
+        previous_manifest = None
+        if self.previous_dirpath and (
+            self._damaged_files is not None
+            or is_incremental_update_enabled()
+        ):
+            previous_manifest = read_manifest(self.previous_dirpath)
+
+        # Damaged files must be extracted again
+        if previous_manifest is not None and self._damaged_files:
+            previous_manifest = {
+                **previous_manifest,
+                "files": {
+                    name: file_info
+                    for name, file_info in previous_manifest["files"].items()
+                    if name not in self._damaged_files
+                }
+            }
 
-        # Create directory
-        os.makedirs(unzip_dirpath, exist_ok=True)
+        if previous_manifest is None:
+            downloader.unzip(filepath, staging_dirpath)
+        else:
+            result = extract_zip_incremental(
+                filepath,
+                staging_dirpath,
+                self.previous_dirpath,
+                previous_manifest,
+            )
+            self.log.info(
+                f"{self.item_label}: Reused {result['reused']} files"
+                f" from {self.previous_dirpath},"
+                f" extracted {result['extracted']} files"
+            )
+        write_manifest(staging_dirpath, create_zip_manifest(filepath))
 
     def _post_source_process(
         self, filepath, source_data, source_progress, downloader
     ):
+        # Source was not received, only cleanup is needed
+        if not filepath:
+            return super()._post_source_process(
+                filepath, source_data, source_progress, downloader
+            )
+
+        staging_dirpath = self.staging_dirpath
         source_progress.set_unzip_started()
         try:
-            downloader.unzip(filepath, self.unzip_dirpath)
+            # Streamed sources are already extracted in staging directory
+            if filepath != staging_dirpath:
+                self._extract_archive(filepath, downloader)
+            write_completion_marker(staging_dirpath, {
+                "id": uuid.uuid4().hex,
+                "checksum": self.checksum,
+                "checksum_algorithm": self.checksum_algorithm,
+                "source": source_data,
+                "distributed_ts": time.time(),
+            })
+            self._promote_staging()
         except Exception:
             message = "Couldn't unzip source file"
             source_progress.set_failed(message)
@@ -855,6 +1428,7 @@ class DistributionItem(BaseDistributionItem):
                 f"{self.item_label}: {message}",
                 exc_info=True
             )
+            self._discard_staging()
             return False
         source_progress.set_unzip_finished()
 
@@ -863,13 +1437,36 @@ class DistributionItem(BaseDistributionItem):
         )
 
     def _post_distribute(self):
+        # Other process is distributing the item
+        if not self._dist_lock.locked:
+            return
+
+        try:
+            self._cleanup_after_distribution()
+        finally:
+            self._dist_lock.release()
+
+    def _cleanup_after_distribution(self):
+        # Unzip directory is replaced only on success, so previous content
+        #   is still available if distribution failed
+        self._discard_staging()
+        staging_root = os.path.dirname(self.staging_dirpath)
+        if os.path.isdir(staging_root) and not os.listdir(staging_root):
+            try:
+                os.rmdir(staging_root)
+            except OSError:
+                # Other item may have created its staging directory
+                pass
+
+        # Remove download directory if is empty, it may contain partially
+        #   downloaded file otherwise
+        download_dirpath = self.download_dirpath
         if (
-            self.state != UpdateState.UPDATED
-            and self.unzip_dirpath
-            and os.path.isdir(self.unzip_dirpath)
+            download_dirpath != self.unzip_dirpath
+            and os.path.isdir(download_dirpath)
+            and not os.listdir(download_dirpath)
         ):
-            self.log.debug(f"Cleaning {self.unzip_dirpath}")
-            shutil.rmtree(self.unzip_dirpath)
+            os.rmdir(download_dirpath)
 
 
 class AyonDistribution:
@@ -893,14 +1490,18 @@ class AyonDistribution:
             bundles.
         bundle_name (Optional[str]): Name of bundle to use. If not passed
             an environment variable 'AYON_BUNDLE_NAME' is checked for value.
-            When both are not available the bundle is defined by 'use_staging'
-            value.
+            When both are not available, or 'None' is passed, the bundle
+            is defined by 'use_staging' value.
         use_staging (Optional[bool]): Use staging versions of an addon.
             If not passed, 'is_staging_enabled' is used as default value.
         use_dev (Optional[bool]): Use develop versions of an addon.
             If not passed, 'is_dev_mode_enabled' is used as default value.
         skip_installer_dist (Optional[bool]): Skip installer distribution. This
             is for testing purposes and for running from code.
+        artifact_cache (Optional[ArtifactCache]): Cache of downloaded
+            archives of addons and dependency packages.
+        response_cache (Optional[ResponseCache]): Cache of server
+            responses. Used only when global connection is created.
     """
 
     def __init__(
@@ -917,20 +1518,36 @@ class AyonDistribution:
         use_dev=None,
         active_user=None,
         skip_installer_dist=False,
+        artifact_cache=None,
+        response_cache=None,
     ):
         self._log = None
 
         self._dist_started = False
         self._dist_finished = False
+        # Ids of distribution items of which metadata were stored
+        self._committed_item_ids = set()
+        # Stored paths of fully distributed bundle
+        self._fingerprint_data = None
+        self._lease_time = None
 
         self._addons_dirpath = addon_dirpath or get_addons_dir()
         self._dependency_dirpath = dependency_dirpath or get_dependencies_dir()
         self._dist_factory = (
             dist_factory or get_default_download_factory()
         )
+        if artifact_cache is None:
+            artifact_cache = ArtifactCache()
+        self._artifact_cache = artifact_cache
+        if response_cache is None and is_response_cache_enabled():
+            response_cache = ResponseCache()
+        self._response_cache = response_cache
 
         if bundle_name is NOT_SET:
             bundle_name = os.environ.get("AYON_BUNDLE_NAME") or NOT_SET
+        elif not bundle_name:
+            # Bundle is defined by 'use_staging' and 'use_dev'
+            bundle_name = NOT_SET
 
         self._installers_info = installers_info
         self._installer_items = NOT_SET
@@ -949,40 +1566,215 @@ class AyonDistribution:
         #   - only those addons and versions that should be distributed
         self._addon_dist_items = NOT_SET
 
-        # Raw dependency packages data from server
-        self._dependency_packages_info = dependency_packages_info
-        # Prepared dependency packages as objects
-        self._dependency_packages_items = NOT_SET
-        # Dependency package item that should be used
-        self._dependency_package_item = NOT_SET
-        # Distribution item of dependency package
-        self._dependency_dist_item = NOT_SET
+        # Raw dependency packages data from server
+        self._dependency_packages_info = dependency_packages_info
+        # Prepared dependency packages as objects
+        self._dependency_packages_items = NOT_SET
+        # Dependency package item that should be used
+        self._dependency_package_item = NOT_SET
+        # Distribution item of dependency package
+        self._dependency_dist_item = NOT_SET
+
+        # Raw bundles data from server
+        self._bundles_info = bundles_info
+        # Bundles as objects
+        self._bundle_items = NOT_SET
+        # Bundles as objects by name
+        self._bundle_items_by_name = NOT_SET
+
+        # Bundle that should be used in production
+        self._production_bundle = NOT_SET
+        # Bundle that should be used in staging
+        self._staging_bundle = NOT_SET
+        # Bundle that should be used in dev
+        self._dev_bundle = NOT_SET
+        # Boolean that defines if staging bundle should be used
+        self._use_staging = use_staging
+        self._use_dev = use_dev
+        self._active_user = active_user
+
+        # Specific bundle name should be used
+        self._bundle_name = bundle_name
+        # Final bundle that will be used
+        self._bundle = NOT_SET
+
+        # Futures of server requests started by 'prefetch_server_info'
+        self._prefetch_futures = {}
+
+    def prefetch_server_info(self):
+        """Request all information required from server concurrently.
+
+        Requests run in threads, properties use their responses once they
+            are accessed. Only information that was not passed to
+            '__init__' is requested. Global connection must be already
+            created.
+        """
+
+        requests = {}
+        if self._active_user is None:
+            requests["user"] = ayon_api.get_user
+        if self._bundles_info is NOT_SET:
+            requests["bundles"] = self._get_bundles_func()
+        # Addons are requested once bundle is known, see 'addons_info'
+        if self._dependency_packages_info is NOT_SET:
+            requests["dependency_packages"] = (
+                self._get_dependency_packages_func()
+            )
+        if self._installers_info is NOT_SET and not self._skip_installer_dist:
+            requests["installers"] = self._get_installers_func()
+
+        requests = {
+            key: func
+            for key, func in requests.items()
+            if key not in self._prefetch_futures
+        }
+        if not requests:
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=len(requests), thread_name_prefix="ayon_prefetch"
+        )
+        for key, func in requests.items():
+            self._prefetch_futures[key] = executor.submit(func)
+        executor.shutdown(wait=False)
+
+    def _cached_request(self, endpoint, func):
+        """Function doing request to server using response cache.
+
+        Args:
+            endpoint (str): Endpoint requested by the function.
+            func (Callable[[], Any]): Function doing the request.
+
+        Returns:
+            Callable[[], Any]: Function doing the request.
+        """
+
+        if (
+            self._response_cache is None
+            or not ayon_api.is_connection_created()
+        ):
+            return func
+        return lambda: self._response_cache.get(endpoint)
+
+    def _get_bundles_func(self):
+        return self._cached_request("bundles", ayon_api.get_bundles)
+
+    def _get_addons_func(self):
+        # Use details to get information about client.zip
+        return self._cached_request(
+            "addons?details=1",
+            lambda: ayon_api.get_addons_info(details=True)
+        )
+
+    def _get_addon_version_func(self, addon_name, addon_version):
+        endpoint = f"addons/{addon_name}/{addon_version}"
+
+        def _request():
+            response = ayon_api.get(endpoint)
+            response.raise_for_status()
+            return response.data
+
+        return self._cached_request(endpoint, _request)
+
+    def _get_addon_version_info(self, addon_name, addon_version):
+        """Server information about single addon version.
+
+        Args:
+            addon_name (str): Addon name.
+            addon_version (str): Addon version.
+
+        Returns:
+            Union[dict[str, Any], None]: Addon information with the version
+                under 'versions' or None if server does not provide
+                information about single addon version.
+        """
+
+        try:
+            data = self._get_addon_version_func(addon_name, addon_version)()
+        except HTTPRequestError:
+            return None
+
+        if not isinstance(data, dict) or "clientSourceInfo" not in data:
+            return None
+        return {
+            "name": addon_name,
+            "title": data.get("title"),
+            "versions": {addon_version: data},
+        }
+
+    def _request_bundle_addons_info(self, addon_versions):
+        """Request information only about addon versions used by bundle.
+
+        First version is requested alone, so servers without endpoint for
+        single addon version get only one request.
+
+        Args:
+            addon_versions (dict[str, str]): Addon versions by addon name.
+
+        Returns:
+            Union[list[dict[str, Any]], None]: Addons information or None
+                if server does not provide information about single addon
+                version.
+        """
+
+        items = list(addon_versions.items())
+        if not items:
+            return []
+
+        first_info = self._get_addon_version_info(*items[0])
+        if first_info is None:
+            return None
+
+        output = [first_info]
+        if len(items) == 1:
+            return output
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(items) - 1, MAX_ADDON_REQUESTS),
+            thread_name_prefix="ayon_addon_info"
+        ) as executor:
+            futures = [
+                executor.submit(self._get_addon_version_info, *item)
+                for item in items[1:]
+            ]
+            for future in futures:
+                addon_info = future.result()
+                if addon_info is None:
+                    return None
+                output.append(addon_info)
+        return output
+
+    def _get_dependency_packages_func(self):
+        return self._cached_request(
+            "desktop/dependencyPackages", ayon_api.get_dependency_packages
+        )
+
+    def _get_installers_func(self):
+        return self._cached_request(
+            "desktop/installers", ayon_api.get_installers
+        )
 
-        # Raw bundles data from server
-        self._bundles_info = bundles_info
-        # Bundles as objects
-        self._bundle_items = NOT_SET
+    def _get_server_response(self, key, func):
+        """Response of prefetched request or of new request.
 
-        # Bundle that should be used in production
-        self._production_bundle = NOT_SET
-        # Bundle that should be used in staging
-        self._staging_bundle = NOT_SET
-        # Bundle that should be used in dev
-        self._dev_bundle = NOT_SET
-        # Boolean that defines if staging bundle should be used
-        self._use_staging = use_staging
-        self._use_dev = use_dev
-        self._active_user = active_user
+        Args:
+            key (str): Key of request in prefetch.
+            func (Callable[[], Any]): Function doing the request if it
+                was not prefetched.
 
-        # Specific bundle name should be used
-        self._bundle_name = bundle_name
-        # Final bundle that will be used
-        self._bundle = NOT_SET
+        Returns:
+            Any: Response from server.
+        """
+
+        future = self._prefetch_futures.pop(key, None)
+        if future is not None:
+            return future.result()
+        return func()
 
     @property
     def active_user(self):
         if self._active_user is None:
-            user = ayon_api.get_user()
+            user = self._get_server_response("user", ayon_api.get_user)
             self._active_user = user["name"]
         return self._active_user
 
@@ -1019,14 +1811,7 @@ class AyonDistribution:
             if self._bundle_name is NOT_SET:
                 self._use_dev = is_dev_mode_enabled()
             else:
-                bundle = next(
-                    (
-                        bundle
-                        for bundle in self.bundle_items
-                        if bundle.name == self._bundle_name
-                    ),
-                    None
-                )
+                bundle = self.get_bundle_by_name(self._bundle_name)
                 if bundle is not None:
                     self._use_dev = bundle.is_dev
                 else:
@@ -1048,12 +1833,17 @@ class AyonDistribution:
     def bundles_info(self):
         """
 
+        Raw information is released once bundles are converted to objects.
+
         Returns:
-            dict[str, dict[str, Any]]: Bundles information from server.
+            Union[dict[str, dict[str, Any]], None]: Bundles information
+                from server or None if was already converted.
         """
 
         if self._bundles_info is NOT_SET:
-            self._bundles_info = ayon_api.get_bundles()
+            self._bundles_info = self._get_server_response(
+                "bundles", self._get_bundles_func()
+            )
         return self._bundles_info
 
     @property
@@ -1065,12 +1855,35 @@ class AyonDistribution:
         """
 
         if self._bundle_items is NOT_SET:
-            self._bundle_items = [
-                Bundle.from_dict(info)
-                for info in self.bundles_info["bundles"]
-            ]
+            self._prepare_bundle_items()
         return self._bundle_items
 
+    def get_bundle_by_name(self, bundle_name):
+        """Bundle by name.
+
+        Args:
+            bundle_name (str): Name of bundle.
+
+        Returns:
+            Union[Bundle, None]: Bundle or None if is not available.
+        """
+
+        if self._bundle_items_by_name is NOT_SET:
+            self._prepare_bundle_items()
+        return self._bundle_items_by_name.get(bundle_name)
+
+    def _prepare_bundle_items(self):
+        bundle_items = [
+            Bundle.from_dict(info)
+            for info in self.bundles_info["bundles"]
+        ]
+        self._bundle_items = bundle_items
+        self._bundle_items_by_name = {
+            bundle.name: bundle
+            for bundle in bundle_items
+        }
+        self._bundles_info = None
+
     @property
     def production_bundle(self):
         """
@@ -1135,14 +1948,7 @@ class AyonDistribution:
                 self._bundle = self.production_bundle
             return self._bundle
 
-        bundle = next(
-            (
-                bundle
-                for bundle in self.bundle_items
-                if bundle.name == self._bundle_name
-            ),
-            None
-        )
+        bundle = self.get_bundle_by_name(self._bundle_name)
         if bundle is None:
             raise BundleNotFoundError(self._bundle_name)
 
@@ -1172,7 +1978,9 @@ class AyonDistribution:
         """
 
         if self._installers_info is NOT_SET:
-            self._installers_info = ayon_api.get_installers()["installers"]
+            self._installers_info = self._get_server_response(
+                "installers", self._get_installers_func()
+            )["installers"]
         return self._installers_info
 
     @property
@@ -1357,6 +2165,7 @@ class AyonDistribution:
             "type": "installer",
             "version": installer_item.version,
             "filename": installer_item.filename,
+            "size": installer_item.size,
         }
 
         tmp_used = False
@@ -1376,7 +2185,8 @@ class AyonDistribution:
                 self._dist_factory,
                 list(installer_item.sources),
                 downloader_data,
-                f"Installer {installer_item.version}"
+                f"Installer {installer_item.version}",
+                size=installer_item.size,
             )
             dist_item.distribute()
             self._installer_executable = dist_item.executable
@@ -1414,68 +2224,107 @@ class AyonDistribution:
 
     @property
     def addons_info(self):
-        """Server information about available addons.
+        """Server information about addons.
+
+        Only addon versions used by bundle are requested. Information about
+        all addons is requested from servers which don't provide information
+        about single addon version.
+
+        Raw information is released once addons are converted to objects.
 
         Returns:
-            Dict[str, dict[str, Any]: Addon info by addon name.
+            Union[list[dict[str, Any]], None]: Addons information or None
+                if was already converted.
         """
 
         if self._addons_info is NOT_SET:
-            # Use details to get information about client.zip
-            server_info = ayon_api.get_addons_info(details=True)
-            self._addons_info = server_info["addons"]
+            bundle = self.bundle_to_use
+            addons_info = []
+            if bundle is not None:
+                addons_info = self._request_bundle_addons_info(
+                    bundle.addon_versions
+                )
+            if addons_info is None:
+                server_info = self._get_server_response(
+                    "addons", self._get_addons_func()
+                )
+                addons_info = server_info["addons"]
+            self._addons_info = addons_info
         return self._addons_info
 
     @property
     def addon_items(self):
-        """Information about available addons on server.
+        """Information about addons used by bundle.
 
         Addons may require distribution of files. For those addons will be
         created 'DistributionItem' handling distribution itself.
 
+        Only addon versions used by bundle are converted, server
+        information can contain all versions of all addons.
+
         Returns:
             Dict[str, AddonInfo]: Addon info object by addon name.
         """
 
         if self._addon_items is NOT_SET:
+            addon_versions = {}
+            bundle = self.bundle_to_use
+            if bundle is not None:
+                addon_versions = bundle.addon_versions
+
             addons_info = {}
             for addon in self.addons_info:
-                addon_info = AddonInfo.from_dict(addon)
+                addon_version = addon_versions.get(addon["name"])
+                if addon_version is None:
+                    continue
+                addon_info = AddonInfo.from_dict(addon, [addon_version])
                 addons_info[addon_info.name] = addon_info
             self._addon_items = addons_info
+            self._addons_info = None
         return self._addon_items
 
     @property
     def dependency_packages_info(self):
         """Server information about available dependency packages.
 
+        Raw information is released once dependency packages are
+            converted to objects.
+
         Notes:
             For testing purposes it is possible to pass dependency packages
                 information to '__init__'.
 
         Returns:
-            list[dict[str, Any]]: Dependency packages information.
+            Union[list[dict[str, Any]], None]: Dependency packages
+                information or None if was already converted.
         """
 
         if self._dependency_packages_info is NOT_SET:
-            self._dependency_packages_info = (
-                ayon_api.get_dependency_packages())["packages"]
+            self._dependency_packages_info = self._get_server_response(
+                "dependency_packages", self._get_dependency_packages_func()
+            )["packages"]
         return self._dependency_packages_info
 
     @property
     def dependency_packages_items(self):
         """Dependency packages as objects.
 
+        Packages are converted on first access.
+
         Returns:
-            dict[str, DependencyItem]: Dependency packages as objects by name.
+            Mapping[str, DependencyItem]: Dependency packages as objects
+                by name.
         """
 
         if self._dependency_packages_items is NOT_SET:
-            dependenc_package_items = {}
-            for item in self.dependency_packages_info:
-                item = DependencyItem.from_dict(item)
-                dependenc_package_items[item.filename] = item
-            self._dependency_packages_items = dependenc_package_items
+            self._dependency_packages_items = LazyItems(
+                {
+                    package["filename"]: package
+                    for package in self.dependency_packages_info
+                },
+                lambda _, package: DependencyItem.from_dict(package)
+            )
+            self._dependency_packages_info = None
         return self._dependency_packages_items
 
     @property
@@ -1514,8 +2363,39 @@ class AyonDistribution:
         self._staging_bundle = staging_bundle
         self._dev_bundle = dev_bundle
 
+    def _get_previous_addon_dirpath(self, addon_name, addon_version):
+        """Directory of last distributed other version of an addon.
+
+        Args:
+            addon_name (str): Addon name.
+            addon_version (str): Version that will be distributed.
+
+        Returns:
+            Union[str, None]: Path to directory of previous version.
+        """
+
+        versions_data = self.get_addons_state_store().get_addon_versions(
+            addon_name
+        )
+        candidates = []
+        for version, version_data in versions_data.items():
+            if version == addon_version:
+                continue
+            dirpath = os.path.join(
+                self._addons_dirpath, f"{addon_name}_{version}"
+            )
+            if os.path.isdir(dirpath):
+                distributed_dt = ""
+                if isinstance(version_data, dict):
+                    distributed_dt = version_data.get("distributed_dt") or ""
+                candidates.append((distributed_dt, dirpath))
+
+        if not candidates:
+            return None
+        return max(candidates)[1]
+
     def _prepare_current_addon_dist_items(self):
-        addons_metadata = self.get_addons_metadata()
+        state_store = self.get_addons_state_store()
         output = []
         addon_versions = {}
         dev_addons = {}
@@ -1550,11 +2430,19 @@ class AyonDistribution:
                 continue
             full_name = addon_version_item.full_name
             addon_dest = os.path.join(self._addons_dirpath, full_name)
-            self.log.debug(f"Checking {full_name} in {addon_dest}")
-            addon_in_metadata = (
-                addon_name in addons_metadata
-                and addon_version_item.version in addons_metadata[addon_name]
+            download_dirpath = os.path.join(
+                self._addons_dirpath, DOWNLOADS_DIRNAME, full_name
             )
+            self.log.debug(f"Checking {full_name} in {addon_dest}")
+            addon_in_metadata = state_store.get_addon_version(
+                addon_name, addon_version_item.version
+            ) is not None
+            # Addon could be distributed by other machine
+            if not addon_in_metadata and is_shared_storage_enabled():
+                addon_in_metadata = (
+                    read_completion_marker(addon_dest) is not None
+                )
+            previous_dirpath = None
             if addon_in_metadata and os.path.isdir(addon_dest):
                 self.log.debug(
                     f"Addon version folder {addon_dest} already exists."
@@ -1563,6 +2451,9 @@ class AyonDistribution:
 
             else:
                 state = UpdateState.OUTDATED
+                previous_dirpath = self._get_previous_addon_dirpath(
+                    addon_name, addon_version
+                )
 
             downloader_data = {
                 "type": "addon",
@@ -1572,7 +2463,7 @@ class AyonDistribution:
 
             dist_item = DistributionItem(
                 addon_dest,
-                download_dirpath=addon_dest,
+                download_dirpath=download_dirpath,
                 state=state,
                 checksum=addon_version_item.checksum,
                 checksum_algorithm=addon_version_item.checksum_algorithm,
@@ -1580,7 +2471,9 @@ class AyonDistribution:
                 sources=list(addon_version_item.sources),
                 downloader_data=downloader_data,
                 item_label=full_name,
-                logger=self.log
+                logger=self.log,
+                artifact_cache=self._artifact_cache,
+                previous_dirpath=previous_dirpath,
             )
             output.append({
                 "dist_item": dist_item,
@@ -1596,25 +2489,37 @@ class AyonDistribution:
         if package is None:
             return None
 
-        metadata = self.get_dependency_metadata()
+        package_metadata = (
+            self.get_dependency_state_store().get_dependency_package(
+                package.filename
+            )
+        )
         downloader_data = {
             "type": "dependency_package",
             "name": package.filename,
-            "platform": package.platform_name
+            "platform": package.platform_name,
+            "size": package.size,
         }
-        zip_dir = package_dir = os.path.join(
+        package_dir = os.path.join(
             self._dependency_dirpath, package.filename
         )
+        download_dirpath = os.path.join(
+            self._dependency_dirpath, DOWNLOADS_DIRNAME, package.filename
+        )
         self.log.debug(f"Checking {package.filename} in {package_dir}")
 
-        if not os.path.isdir(package_dir) or package.filename not in metadata:
+        # Package could be distributed by other machine
+        if package_metadata is None and is_shared_storage_enabled():
+            package_metadata = read_completion_marker(package_dir)
+
+        if not os.path.isdir(package_dir) or package_metadata is None:
             state = UpdateState.OUTDATED
         else:
             state = UpdateState.UPDATED
 
         return DistributionItem(
-            zip_dir,
-            download_dirpath=package_dir,
+            package_dir,
+            download_dirpath=download_dirpath,
             state=state,
             checksum=package.checksum,
             checksum_algorithm=package.checksum_algorithm,
@@ -1623,6 +2528,8 @@ class AyonDistribution:
             downloader_data=downloader_data,
             item_label=os.path.splitext(package.filename)[0],
             logger=self.log,
+            size=package.size,
+            artifact_cache=self._artifact_cache,
         )
 
     def get_addon_dist_items(self):
@@ -1674,10 +2581,12 @@ class AyonDistribution:
         return self._dependency_dist_item
 
     def get_dependency_metadata_filepath(self):
-        """Path to distribution metadata file.
+        """Path to legacy distribution metadata file.
 
         Metadata contain information about distributed packages, used source,
-        expected file hash and time when file was distributed.
+        expected file hash and time when file was distributed. Metadata are
+        stored in state store, content of the file is imported on first use.
+        The file is still written for older versions of AYON launcher.
 
         Returns:
             str: Path to a file where dependency package metadata are stored.
@@ -1686,10 +2595,12 @@ class AyonDistribution:
         return os.path.join(self._dependency_dirpath, "dependency.json")
 
     def get_addons_metadata_filepath(self):
-        """Path to addons metadata file.
+        """Path to legacy addons metadata file.
 
         Metadata contain information about distributed addons, used sources,
-        expected file hashes and time when files were distributed.
+        expected file hashes and time when files were distributed. Metadata
+        are stored in state store, content of the file is imported on first
+        use. The file is still written for older versions of AYON launcher.
 
         Returns:
             str: Path to a file where addons metadata are stored.
@@ -1735,83 +2646,355 @@ class AyonDistribution:
 
         """
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, "w") as stream:
-            json.dump(data, stream, indent=4)
+        tmp_filepath = f"{filepath}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_filepath, "w") as stream:
+                json.dump(data, stream, indent=4)
+            os.replace(tmp_filepath, filepath)
+        finally:
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
+
+    def _export_metadata_file(self, filepath, data):
+        """Write metadata from state store to legacy json file.
+
+        Older versions of AYON launcher read distribution metadata only
+        from json files.
+
+        Args:
+            filepath (str): Path to json file.
+            data (Union[Dict[str, Any], List[Any]]): Data to store into file.
+        """
+
+        try:
+            self.save_metadata_file(filepath, data)
+        except OSError:
+            self.log.warning(
+                f"Failed to write metadata file {filepath}", exc_info=True
+            )
+
+    def _export_dependency_metadata(self, store):
+        self._export_metadata_file(
+            self.get_dependency_metadata_filepath(),
+            store.get_dependency_packages(),
+        )
+
+    def _export_addons_metadata(self, store):
+        self._export_metadata_file(
+            self.get_addons_metadata_filepath(),
+            store.get_addons(),
+        )
+
+    def get_dependency_state_store(self):
+        """State store where dependency package metadata are stored.
+
+        Content of legacy json metadata file is imported on first access.
+
+        Returns:
+            StateStore: State store object.
+        """
+
+        store = get_distribution_state_store(self._dependency_dirpath)
+        store.migrate_json_file(
+            "dependency_packages",
+            self.get_dependency_metadata_filepath(),
+            store.write_dependency_packages,
+        )
+        return store
+
+    def get_addons_state_store(self):
+        """State store where addons metadata are stored.
+
+        Content of legacy json metadata file is imported on first access.
+
+        Returns:
+            StateStore: State store object.
+        """
+
+        store = get_distribution_state_store(self._addons_dirpath)
+        store.migrate_json_file(
+            "addons",
+            self.get_addons_metadata_filepath(),
+            store.write_addon_versions,
+        )
+        return store
 
     def get_dependency_metadata(self):
-        filepath = self.get_dependency_metadata_filepath()
-        return self.read_metadata_file(filepath, {})
+        return self.get_dependency_state_store().get_dependency_packages()
 
     def update_dependency_metadata(self, package_name, data):
-        dependency_metadata = self.get_dependency_metadata()
-        dependency_metadata[package_name] = data
-        filepath = self.get_dependency_metadata_filepath()
-        self.save_metadata_file(filepath, dependency_metadata)
+        store = self.get_dependency_state_store()
+        store.set_dependency_package(package_name, data)
+        self._export_dependency_metadata(store)
 
     def get_addons_metadata(self):
-        filepath = self.get_addons_metadata_filepath()
-        return self.read_metadata_file(filepath, {})
+        return self.get_addons_state_store().get_addons()
 
     def update_addons_metadata(self, addons_information):
         if not addons_information:
             return
-        addons_metadata = self.get_addons_metadata()
-        for addon_name, version_value in addons_information.items():
-            if addon_name not in addons_metadata:
-                addons_metadata[addon_name] = {}
-            for addon_version, version_data in version_value.items():
-                addons_metadata[addon_name][addon_version] = version_data
+        store = self.get_addons_state_store()
+        store.set_addon_versions(addons_information)
+        self._export_addons_metadata(store)
 
-        filepath = self.get_addons_metadata_filepath()
-        self.save_metadata_file(filepath, addons_metadata)
+    def _get_dist_item_metadata(self, dist_item, stored_time):
+        if (
+            not dist_item.need_distribution
+            or dist_item.state != UpdateState.UPDATED
+        ):
+            return None
 
-    def finish_distribution(self):
-        """Store metadata about distributed items."""
+        source_data = dist_item.used_source
+        if not source_data:
+            return None
+
+        return {
+            "source": source_data,
+            "checksum": dist_item.checksum,
+            "checksum_algorithm": dist_item.checksum_algorithm,
+            "distributed_dt": stored_time
+        }
+
+    def commit_distribution_item(self, dist_item):
+        """Store metadata of distributed item right after it finished.
+
+        Metadata of each item are stored immediately, so items distributed
+        before a crash don't have to be distributed again. Journal entry
+        of the item is removed in the same transaction.
+
+        Args:
+            dist_item (DistributionItem): Item of which distribution
+                finished.
+        """
 
-        self._dist_finished = True
-        stored_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        dependency_dist_item = self.get_dependency_dist_item()
         if (
-            dependency_dist_item is not None
-            and dependency_dist_item.need_distribution
-            and dependency_dist_item.state == UpdateState.UPDATED
+            not dist_item.need_distribution
+            or id(dist_item) in self._committed_item_ids
         ):
-            package = self.dependency_package_item
-            source = dependency_dist_item.used_source
-            if source is not None:
-                data = {
-                    "source": source,
-                    "checksum": dependency_dist_item.checksum,
-                    "checksum_algorithm": (
-                        dependency_dist_item.checksum_algorithm),
-                    "distributed_dt": stored_time
-                }
-                self.update_dependency_metadata(package.filename, data)
+            return
+        self._committed_item_ids.add(id(dist_item))
+
+        stored_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        data = self._get_dist_item_metadata(dist_item, stored_time)
+        dirpaths = [dist_item.unzip_dirpath]
+        if dist_item is self.get_dependency_dist_item():
+            store = self.get_dependency_state_store()
+            if data is None:
+                store.finish_journal_entries(dirpaths)
+            else:
+                store.set_dependency_package(
+                    self.dependency_package_item.filename,
+                    data,
+                    finished_dirpaths=dirpaths,
+                )
+                self._export_dependency_metadata(store)
+            return
 
-        addons_info = {}
+        store = self.get_addons_state_store()
+        addon_info = None
         for item in self.get_addon_dist_items():
-            dist_item = item["dist_item"]
-            if (
-                not dist_item.need_distribution
-                or dist_item.state != UpdateState.UPDATED
-            ):
+            if item["dist_item"] is dist_item:
+                addon_info = item
+                break
+
+        if data is None or addon_info is None:
+            store.finish_journal_entries(dirpaths)
+            return
+
+        store.set_addon_versions(
+            {addon_info["addon_name"]: {addon_info["addon_version"]: data}},
+            finished_dirpaths=dirpaths,
+        )
+        self._export_addons_metadata(store)
+
+    def _start_journal(self, items):
+        """Record items that will be distributed to journal.
+
+        Args:
+            items (list[DistributionItem]): Items that will be distributed.
+        """
+
+        started = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        dependency_dist_item = self.get_dependency_dist_item()
+        addon_dirpaths = []
+        for item in items:
+            if item.state != UpdateState.OUTDATED:
                 continue
+            if item is dependency_dist_item:
+                self.get_dependency_state_store().add_journal_entries(
+                    [item.unzip_dirpath], started
+                )
+            else:
+                addon_dirpaths.append(item.unzip_dirpath)
+
+        if addon_dirpaths:
+            self.get_addons_state_store().add_journal_entries(
+                addon_dirpaths, started
+            )
+
+    def recover_unfinished_distributions(self):
+        """Cleanup after distributions that did not finish.
+
+        Journal contains directories of which distribution started but
+        did not finish (e.g. process was killed). Their staging
+        directories are moved to trash. Distributions that are still
+        running in other processes are skipped.
+        """
+
+        for store in (
+            self.get_addons_state_store(),
+            self.get_dependency_state_store(),
+        ):
+            finished = []
+            for dirpath in store.get_journal_entries():
+                lock = get_distribution_lock(dirpath)
+                if not lock.try_acquire():
+                    continue
+                try:
+                    staging_dirpath = get_staging_dirpath(dirpath)
+                    if os.path.isdir(staging_dirpath):
+                        self.log.info(
+                            "Removing unfinished distribution"
+                            f" of {dirpath}"
+                        )
+                        move_to_trash(
+                            staging_dirpath, get_trash_dirpath(dirpath)
+                        )
+                    finished.append(dirpath)
+                finally:
+                    lock.release()
+
+            if finished:
+                store.finish_journal_entries(finished)
+
+    def get_lease_time(self):
+        """Time when directories of bundle were leased by distribution.
+
+        Lease of already distributed bundle is taken by background garbage
+        collection.
+
+        Returns:
+            Union[float, None]: Lease time or None if distribution did
+                not start.
+        """
 
-            source_data = dist_item.used_source
-            if not source_data:
+        return self._lease_time
+
+    def get_bundle_dirpaths(self):
+        """Directories to which are distributed items of bundle.
+
+        Paths are based only on bundle information, directories don't have
+        to exist.
+
+        Returns:
+            list[str]: Paths to directories of addons and dependency package.
+        """
+
+        bundle = self.bundle_to_use
+        if bundle is None:
+            return []
+
+        dev_addons = {}
+        if self.use_dev:
+            dev_addons = bundle.addons_dev_info
+
+        output = []
+        for addon_name, addon_version in bundle.addon_versions.items():
+            dev_addon_info = dev_addons.get(addon_name) or {}
+            if addon_version is None or dev_addon_info.get("enabled") is True:
                 continue
+            output.append(os.path.join(
+                self._addons_dirpath, f"{addon_name}_{addon_version}"
+            ))
 
-            addon_name = item["addon_name"]
-            addon_version = item["addon_version"]
-            addons_info.setdefault(addon_name, {})
-            addons_info[addon_name][addon_version] = {
-                "source": source_data,
-                "checksum": dist_item.checksum,
-                "checksum_algorithm": dist_item.checksum_algorithm,
-                "distributed_dt": stored_time
-            }
+        package_name = bundle.dependency_packages.get(
+            platform.system().lower()
+        )
+        if package_name:
+            output.append(
+                os.path.join(self._dependency_dirpath, package_name)
+            )
+        return output
+
+    def get_bundle_fingerprint(self):
+        """Fingerprint of what bundle requires on this machine.
+
+        Returns:
+            Union[str, None]: Fingerprint or None if bundle is not
+                available.
+        """
+
+        bundle = self.bundle_to_use
+        if bundle is None:
+            return None
+        return create_bundle_fingerprint(
+            bundle,
+            platform.system().lower(),
+            self.use_dev,
+            (self._addons_dirpath, self._dependency_dirpath),
+        )
+
+    def load_distributed_bundle(self):
+        """Use stored paths if bundle was already fully distributed.
+
+        Distribution items are not prepared when stored paths are used.
+
+        Returns:
+            bool: Bundle was fully distributed and its paths are used.
+        """
+
+        if self._fingerprint_data is not None:
+            return True
+
+        if not is_fingerprint_enabled():
+            return False
+
+        fingerprint = self.get_bundle_fingerprint()
+        if fingerprint is None:
+            return False
+
+        data = get_fingerprint_data(self._addons_dirpath, fingerprint)
+        if data is None:
+            return False
+        self.log.debug(f"Bundle '{self.bundle_name_to_use}' is distributed")
+        self._fingerprint_data = data
+        return True
+
+    def _store_bundle_fingerprint(self):
+        if not is_fingerprint_enabled():
+            return
+
+        items = self.get_all_distribution_items()
+        if any(item.state != UpdateState.UPDATED for item in items):
+            return
+
+        fingerprint = self.get_bundle_fingerprint()
+        if fingerprint is None:
+            return
 
-        self.update_addons_metadata(addons_info)
+        try:
+            store_fingerprint_data(self._addons_dirpath, fingerprint, {
+                "bundle_name": self.bundle_name_to_use,
+                "python_paths": self.get_python_paths(),
+                "sys_paths": self.get_sys_paths(),
+                "dirpaths": [item.unzip_dirpath for item in items],
+                "checksums": {
+                    item.item_label: item.checksum
+                    for item in items
+                },
+            })
+        except OSError:
+            self.log.warning(
+                "Failed to store bundle fingerprint", exc_info=True
+            )
+
+    def finish_distribution(self):
+        """Store metadata about distributed items."""
+
+        self._dist_finished = True
+        for dist_item in self.get_all_distribution_items():
+            self.commit_distribution_item(dist_item)
+        self._store_bundle_fingerprint()
 
     def get_all_distribution_items(self):
         """Distribution items required by server.
@@ -1848,6 +3031,9 @@ class AyonDistribution:
                 return True
             return False
 
+        if self.load_distributed_bundle():
+            return False
+
         for item in self.get_all_distribution_items():
             if item.need_distribution:
                 return True
@@ -1862,7 +3048,9 @@ class AyonDistribution:
         'validate_distribution' when this method finishes.
 
         Args:
-            threaded (bool): Distribute items in threads.
+            threaded (bool): Distribute items in bounded pools of threads
+                where download of an item can run while other item
+                is extracted.
         """
 
         if self._dist_started:
@@ -1874,19 +3062,32 @@ class AyonDistribution:
                 self.distribute_installer()
             return
 
-        threads = collections.deque()
-        for item in self.get_all_distribution_items():
-            if threaded:
-                threads.append(threading.Thread(target=item.distribute))
-            else:
-                item.distribute()
+        if self.load_distributed_bundle():
+            # Stored fingerprints are removed with distributed directories,
+            #   lease and existence of directories are checked in background
+            self._lease_time = defer_lease(self.get_bundle_dirpaths())
+            self._dist_finished = True
+            return
 
-        while threads:
-            thread = threads.popleft()
-            if thread.is_alive():
-                threads.append(thread)
-            else:
-                thread.join()
+        # Directories of bundle must not be removed by garbage collection
+        #   before they're checked
+        self._lease_time = lease_directories(self.get_bundle_dirpaths())
+
+        # Empty trash that was not removed by previous distribution
+        for dirpath in (self._addons_dirpath, self._dependency_dirpath):
+            schedule_trash_cleanup(os.path.join(dirpath, TRASH_DIRNAME))
+
+        self.recover_unfinished_distributions()
+        items = self.get_all_distribution_items()
+        self._start_journal(items)
+        if threaded:
+            DistributionScheduler(logger=self.log).distribute(
+                items, self.commit_distribution_item
+            )
+        else:
+            for item in items:
+                item.distribute()
+                self.commit_distribution_item(item)
 
         self.finish_distribution()
 
@@ -1897,6 +3098,9 @@ class AyonDistribution:
             RuntimeError: Any of items is not available.
         """
 
+        if self._fingerprint_data is not None:
+            return
+
         invalid = []
         dependency_package = self.get_dependency_dist_item()
         if (
@@ -1917,6 +3121,68 @@ class AyonDistribution:
             ", ".join([f'"{item}"' for item in invalid])
         ))
 
+    def verify_distribution(self, repair=True):
+        """Verify distributed content using manifests of items.
+
+        Files of all distributed items are verified in parallel. Damaged
+        items are distributed again, only damaged files are extracted
+        if the item is distributed from the same zip archive.
+
+        Items distributed without manifest are not verified.
+
+        Args:
+            repair (Optional[bool]): Distribute damaged items again.
+
+        Returns:
+            list[DistributionItem]: Items with damaged content.
+        """
+
+        damaged_items = []
+        to_verify = []
+        for item in self.get_all_distribution_items():
+            if item.state != UpdateState.UPDATED:
+                continue
+            if not os.path.isdir(item.unzip_dirpath):
+                self.log.warning(f"{item.item_label}: Content is missing")
+                item.set_damaged()
+                damaged_items.append(item)
+                continue
+
+            manifest = read_manifest(item.unzip_dirpath)
+            if manifest is None:
+                self.log.debug(
+                    f"{item.item_label}: Manifest is not available"
+                )
+                continue
+            to_verify.append((item, manifest))
+
+        results = get_damaged_files([
+            (item.unzip_dirpath, manifest)
+            for item, manifest in to_verify
+        ])
+        for (item, _), damaged_files in zip(to_verify, results):
+            if not damaged_files:
+                continue
+            self.log.warning(
+                f"{item.item_label}: {len(damaged_files)} files"
+                " are missing or changed"
+            )
+            item.set_damaged(damaged_files)
+            damaged_items.append(item)
+
+        if not damaged_items or not repair:
+            return damaged_items
+
+        # Stored paths are not used to validate repaired distribution
+        self._fingerprint_data = None
+        for item in damaged_items:
+            self._committed_item_ids.discard(id(item))
+        self._start_journal(damaged_items)
+        DistributionScheduler(logger=self.log).distribute(
+            damaged_items, self.commit_distribution_item
+        )
+        return damaged_items
+
     def get_sys_paths(self):
         """Get all paths to python packages that should be added to path.
 
@@ -1932,6 +3198,9 @@ class AyonDistribution:
             List[str]: Paths that should be added to 'sys.path'.
         """
 
+        if self._fingerprint_data is not None:
+            return list(self._fingerprint_data["sys_paths"])
+
         output = []
         dependency_dist_item = self.get_dependency_dist_item()
         if dependency_dist_item is not None:
@@ -1955,6 +3224,9 @@ class AyonDistribution:
                 'PYTHONPATH'.
         """
 
+        if self._fingerprint_data is not None:
+            return list(self._fingerprint_data["python_paths"])
+
         output = []
         for item in self.get_addon_dist_items():
             dist_item = item["dist_item"]
@@ -1,5 +1,9 @@
 import sys
+import json
+import hashlib
 import traceback
+import threading
+from collections.abc import Mapping
 
 import attr
 from enum import Enum
@@ -10,38 +14,47 @@ class UrlType(Enum):
     GIT = "git"
     FILESYSTEM = "filesystem"
     SERVER = "server"
+    CHUNKED = "chunked"
 
 
-@attr.s
+@attr.s(slots=True)
 class MultiPlatformValue(object):
     windows = attr.ib(default=None)
     linux = attr.ib(default=None)
     darwin = attr.ib(default=None)
 
 
-@attr.s
+@attr.s(slots=True)
 class SourceInfo(object):
     type = attr.ib()
 
 
-@attr.s
+@attr.s(slots=True)
 class LocalSourceInfo(SourceInfo):
     path = attr.ib(default=attr.Factory(MultiPlatformValue))
 
 
-@attr.s
+@attr.s(slots=True)
 class WebSourceInfo(SourceInfo):
     url = attr.ib(default=None)
     headers = attr.ib(default=None)
     filename = attr.ib(default=None)
 
 
-@attr.s
+@attr.s(slots=True)
 class ServerSourceInfo(SourceInfo):
     filename = attr.ib(default=None)
     path = attr.ib(default=None)
 
 
+@attr.s(slots=True)
+class ChunkedSourceInfo(SourceInfo):
+    url = attr.ib(default=None)
+    chunks_url = attr.ib(default=None)
+    headers = attr.ib(default=None)
+    filename = attr.ib(default=None)
+
+
 def convert_source(source):
     """Create source object from data information.
 
@@ -78,6 +91,15 @@ def convert_source(source):
             path=source.get("path")
         )
 
+    if source_type == UrlType.CHUNKED.value:
+        return ChunkedSourceInfo(
+            type=source_type,
+            url=source["url"],
+            chunks_url=source.get("chunksUrl"),
+            headers=source.get("headers"),
+            filename=source.get("filename")
+        )
+
 
 def prepare_sources(src_sources, title):
     sources = []
@@ -99,12 +121,61 @@ def prepare_sources(src_sources, title):
     return sources, unknown_sources
 
 
-@attr.s
+class LazyItems(Mapping):
+    """Mapping converting raw server data to items on first access.
+
+    Raw data of an item is released once the item is created. Items can
+    be accessed from multiple threads, each item is created only once.
+
+    Args:
+        raw_items (dict[str, Any]): Raw data by key.
+        factory (Callable[[str, Any], Any]): Function creating item from
+            key and raw data.
+    """
+
+    __slots__ = ("_keys", "_raw_items", "_items", "_factory", "_lock")
+
+    def __init__(self, raw_items, factory):
+        self._keys = tuple(raw_items)
+        self._raw_items = dict(raw_items)
+        self._items = {}
+        self._factory = factory
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        try:
+            return self._items[key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            # Item could be created by other thread meanwhile
+            if key in self._items:
+                return self._items[key]
+            item = self._factory(key, self._raw_items[key])
+            self._items[key] = item
+            del self._raw_items[key]
+        return item
+
+    def __contains__(self, key):
+        return key in self._items or key in self._raw_items
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._keys)})"
+
+
+@attr.s(slots=True)
 class VersionData(object):
     version_data = attr.ib(default=None)
 
 
-@attr.s
+@attr.s(slots=True)
 class AddonVersionInfo(object):
     version = attr.ib()
     full_name = attr.ib()
@@ -155,7 +226,7 @@ class AddonVersionInfo(object):
         )
 
 
-@attr.s
+@attr.s(slots=True)
 class AddonInfo(object):
     """Object matching json payload from Server"""
     name = attr.ib()
@@ -166,12 +237,14 @@ class AddonInfo(object):
     authors = attr.ib(default=None)
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, addon_versions=None):
         """Addon info by available versions.
 
         Args:
             data (dict[str, Any]): Addon information from server. Should
                 contain information about every version under 'versions'.
+            addon_versions (Optional[Iterable[str]]): Convert only these
+                versions. All versions are converted if not passed.
 
         Returns:
             AddonInfo: Addon info with available versions.
@@ -182,12 +255,19 @@ class AddonInfo(object):
         title = data.get("title") or addon_name
 
         src_versions = data.get("versions") or {}
-        dst_versions = {
-            addon_version: AddonVersionInfo.from_dict(
+        if addon_versions is not None:
+            src_versions = {
+                addon_version: src_versions[addon_version]
+                for addon_version in addon_versions
+                if addon_version in src_versions
+            }
+        # Versions are converted on first access
+        dst_versions = LazyItems(
+            src_versions,
+            lambda addon_version, version_data: AddonVersionInfo.from_dict(
                 addon_name, title, addon_version, version_data
             )
-            for addon_version, version_data in src_versions.items()
-        }
+        )
         return cls(
             name=addon_name,
             versions=dst_versions,
@@ -198,7 +278,7 @@ class AddonInfo(object):
         )
 
 
-@attr.s
+@attr.s(slots=True)
 class DependencyItem(object):
     """Object matching payload from Server about single dependency package"""
     filename = attr.ib()
@@ -209,6 +289,7 @@ class DependencyItem(object):
     unknown_sources = attr.ib(default=attr.Factory(list))
     source_addons = attr.ib(default=attr.Factory(dict))
     python_modules = attr.ib(default=attr.Factory(dict))
+    size = attr.ib(default=None)
 
     @classmethod
     def from_dict(cls, package):
@@ -230,11 +311,12 @@ class DependencyItem(object):
             # Backwards compatibility
             checksum_algorithm=package.get("checksumAlgorithm", "sha256"),
             source_addons=package["sourceAddons"],
-            python_modules=package["pythonModules"]
+            python_modules=package["pythonModules"],
+            size=package.get("size"),
         )
 
 
-@attr.s
+@attr.s(slots=True)
 class Installer:
     version = attr.ib()
     filename = attr.ib()
@@ -272,7 +354,7 @@ class Installer:
         )
 
 
-@attr.s
+@attr.s(slots=True)
 class Bundle:
     """Class representing bundle information."""
 
@@ -285,6 +367,30 @@ class Bundle:
     is_dev = attr.ib(default=False)
     active_dev_user = attr.ib(default=None)
     addons_dev_info = attr.ib(default=attr.Factory(dict))
+    checksum = attr.ib(default=None)
+
+    @classmethod
+    def get_checksum(cls, data):
+        """Checksum of bundle content from server information.
+
+        Status of bundle (production, staging, archived) is not part
+        of the content.
+
+        Args:
+            data (dict[str, Any]): Bundle information from server.
+
+        Returns:
+            str: Checksum of bundle.
+        """
+
+        content = {
+            key: value
+            for key, value in data.items()
+            if key not in ("isProduction", "isStaging", "isArchived")
+        }
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
 
     @classmethod
     def from_dict(cls, data):
@@ -298,4 +404,5 @@ class Bundle:
             is_dev=data.get("isDev", False),
             active_dev_user=data.get("activeUser"),
             addons_dev_info=data.get("addonDevelopment", {}),
+            checksum=cls.get_checksum(data),
         )
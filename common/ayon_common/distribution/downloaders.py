@@ -1,13 +1,38 @@
 import os
+import json
+import time
+import hashlib
 import logging
+import tempfile
 import platform
+import threading
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 import ayon_api
-
-from ayon_common import extract_archive_file, validate_file_checksum
-
-from .file_handler import RemoteFileHandler
+import requests
+
+from ayon_common import (
+    extract_archive_file,
+    validate_file_checksum,
+    get_archive_ext_and_type,
+    get_tar_open_mode,
+)
+
+from .file_handler import (
+    USER_AGENT,
+    DOWNLOAD_RETRIES,
+    DOWNLOAD_TIMEOUT,
+    RETRY_SLEEP,
+    RemoteFileHandler,
+    TransferChecksum,
+    is_stream_extract_enabled,
+)
+from .chunk_store import (
+    ChunkStore,
+    get_chunk_relpath,
+    validate_chunk_index,
+)
 from .data_structures import UrlType
 
 
@@ -39,6 +64,104 @@ class SourceDownloader(metaclass=ABCMeta):
 
         pass
 
+    @classmethod
+    def download_with_checksum(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm="sha256",
+    ):
+        """Download source and calculate checksum during the transfer.
+
+        Downloaders that can't calculate checksum while transferring
+        return None as checksum and file must be validated with
+        'check_hash'.
+
+        Args:
+            source (dict): {type:"http", "url":"https://} ...}
+            destination_dir (str): local folder to unzip
+            data (dict): More information about download content. Always have
+                'type' key in.
+            transfer_progress (ayon_api.TransferProgress): Progress of
+                transferred (copy/download) content.
+            checksum_algorithm (str): Type of hash.
+
+        Returns:
+            tuple[str, Union[str, None]]: Local path to downloaded file and
+                checksum calculated during transfer.
+        """
+
+        filepath = cls.download(
+            source, destination_dir, data, transfer_progress
+        )
+        return filepath, None
+
+    @classmethod
+    def can_extract_stream(cls, source, data):
+        """Source can be extracted while it is transferred.
+
+        Args:
+            source (dict): {type:"http", "url":"https://} ...}
+            data (dict): More information about download content.
+
+        Returns:
+            bool: Downloader supports 'extract_stream' for the source.
+        """
+
+        return False
+
+    @classmethod
+    def extract_stream(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm=None,
+    ):
+        """Extract archive to destination while it is transferred.
+
+        Only available if 'can_extract_stream' returns True.
+
+        Args:
+            source (dict): {type:"http", "url":"https://} ...}
+            destination_dir (str): Folder where content is extracted.
+            data (dict): More information about download content.
+            transfer_progress (ayon_api.TransferProgress): Progress of
+                transferred content.
+            checksum_algorithm (Optional[str]): Type of hash calculated
+                during transfer.
+
+        Returns:
+            Union[str, None]: Checksum of transferred archive or None
+                if algorithm was not passed.
+        """
+
+        raise NotImplementedError(
+            f"{cls.__name__} does not support stream extraction"
+        )
+
+    @staticmethod
+    def _get_stream_tar_mode(filename):
+        """Stream mode for 'tarfile.open' if file is a tar archive.
+
+        Args:
+            filename (str): Name of archive file.
+
+        Returns:
+            Union[str, None]: Mode for 'tarfile.open' or None if file
+                can't be extracted as a stream.
+        """
+
+        if not filename or not is_stream_extract_enabled():
+            return None
+        archive_ext, archive_type = get_archive_ext_and_type(filename)
+        if archive_type != "tar":
+            return None
+        return get_tar_open_mode(archive_ext, stream=True)
+
     @classmethod
     @abstractmethod
     def cleanup(cls, source, destination_dir, data):
@@ -70,13 +193,14 @@ class SourceDownloader(metaclass=ABCMeta):
     def unzip(cls, filepath, destination_dir):
         """Unzips local 'addon_zip_path' to 'destination'.
 
+        Archive is not removed, downloaded files are removed in 'cleanup'.
+
         Args:
             filepath (str): local path to addon zip file
             destination_dir (str): local folder to unzip
         """
 
         extract_archive_file(filepath, destination_dir)
-        os.remove(filepath)
 
 
 class OSDownloader(SourceDownloader):
@@ -86,8 +210,17 @@ class OSDownloader(SourceDownloader):
     def download(cls, source, destination_dir, data, transfer_progress):
         # OS doesn't need to download, unzip directly
         addon_url = source["path"].get(platform.system().lower())
-        if not os.path.exists(addon_url):
-            raise ValueError(f"{addon_url} is not accessible")
+        transfer_progress.set_source_url(addon_url)
+        transfer_progress.set_destination_url(addon_url)
+        transfer_progress.set_started()
+        try:
+            if not addon_url or not os.path.exists(addon_url):
+                raise ValueError(f"{addon_url} is not accessible")
+        except Exception as exc:
+            transfer_progress.set_failed(str(exc))
+            raise
+        finally:
+            transfer_progress.set_transfer_done()
         return addon_url
 
     @classmethod
@@ -99,7 +232,7 @@ class OSDownloader(SourceDownloader):
 class HTTPDownloader(SourceDownloader):
     """Downloader using http or https protocol."""
 
-    CHUNK_SIZE = 100000
+    CHUNK_SIZE = 1024 * 1024
 
     @staticmethod
     def get_filename(source):
@@ -111,20 +244,98 @@ class HTTPDownloader(SourceDownloader):
 
     @classmethod
     def download(cls, source, destination_dir, data, transfer_progress):
+        return cls._download(source, destination_dir, data, transfer_progress)
+
+    @classmethod
+    def download_with_checksum(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm="sha256",
+    ):
+        checksum = TransferChecksum(checksum_algorithm)
+        filepath = cls._download(
+            source, destination_dir, data, transfer_progress, checksum
+        )
+        return filepath, checksum.hexdigest()
+
+    @classmethod
+    def _download(
+        cls, source, destination_dir, data, transfer_progress, checksum=None
+    ):
         source_url = source["url"]
         cls.log.debug(f"Downloading {source_url} to {destination_dir}")
         headers = source.get("headers")
         filename = cls.get_filename(source)
+        filepath = os.path.join(destination_dir, filename)
 
-        # TODO use transfer progress
-        RemoteFileHandler.download_url(
-            source_url,
-            destination_dir,
-            filename,
-            headers=headers
-        )
+        transfer_progress.set_source_url(source_url)
+        transfer_progress.set_destination_url(filepath)
+        transfer_progress.set_started()
+        try:
+            RemoteFileHandler.download_url(
+                source_url,
+                destination_dir,
+                filename,
+                headers=headers,
+                progress=transfer_progress,
+                size=data.get("size"),
+                chunk_size=cls.CHUNK_SIZE,
+                checksum=checksum,
+            )
+        except Exception as exc:
+            transfer_progress.set_failed(str(exc))
+            raise
+        finally:
+            transfer_progress.set_transfer_done()
+
+        return filepath
 
-        return os.path.join(destination_dir, filename)
+    @classmethod
+    def can_extract_stream(cls, source, data):
+        tar_mode = cls._get_stream_tar_mode(cls.get_filename(source))
+        return tar_mode is not None
+
+    @classmethod
+    def extract_stream(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm=None,
+    ):
+        source_url = source["url"]
+        cls.log.debug(f"Extracting {source_url} to {destination_dir}")
+        tar_mode = cls._get_stream_tar_mode(cls.get_filename(source))
+        checksum = None
+        if checksum_algorithm:
+            checksum = TransferChecksum(checksum_algorithm)
+
+        transfer_progress.set_source_url(source_url)
+        transfer_progress.set_destination_url(destination_dir)
+        transfer_progress.set_started()
+        try:
+            RemoteFileHandler.extract_tar_stream(
+                source_url,
+                destination_dir,
+                tar_mode,
+                headers=source.get("headers"),
+                chunk_size=cls.CHUNK_SIZE,
+                progress=transfer_progress,
+                checksum=checksum,
+            )
+        except Exception as exc:
+            transfer_progress.set_failed(str(exc))
+            raise
+        finally:
+            transfer_progress.set_transfer_done()
+
+        if checksum is not None:
+            return checksum.hexdigest()
+        return None
 
     @classmethod
     def cleanup(cls, source, destination_dir, data):
@@ -132,6 +343,7 @@ class HTTPDownloader(SourceDownloader):
         filepath = os.path.join(destination_dir, filename)
         if os.path.exists(filepath) and os.path.isfile(filepath):
             os.remove(filepath)
+        RemoteFileHandler.remove_partial_download(filepath)
 
 
 class AyonServerDownloader(SourceDownloader):
@@ -140,64 +352,444 @@ class AyonServerDownloader(SourceDownloader):
     Expects filled env var AYON_SERVER_URL.
     """
 
-    CHUNK_SIZE = 8192
+    CHUNK_SIZE = 1024 * 1024
 
-    @classmethod
-    def download(cls, source, destination_dir, data, transfer_progress):
+    @staticmethod
+    def get_filename(source):
         path = source["path"]
         filename = source["filename"]
         if path and not filename:
             filename = path.split("/")[-1]
+        return filename
 
-        cls.log.debug(f"Downloading {filename} to {destination_dir}")
+    @staticmethod
+    def get_endpoint(source, data, filename):
+        """Endpoint on server from which is the file downloaded.
 
+        Args:
+            source (dict[str, Any]): Source information.
+            data (dict[str, Any]): More information about download content.
+            filename (str): Name of file to download.
+
+        Returns:
+            str: Endpoint relative to server url.
+        """
+
+        path = source["path"]
         if path:
-            filepath = os.path.join(destination_dir, filename)
-            return ayon_api.download_file(
-                path,
-                filepath,
-                chunk_size=cls.CHUNK_SIZE,
-                progress=transfer_progress
-            )
+            return path.lstrip("/")
 
-        # dst_filepath = os.path.join(destination_dir, filename)
+        # Routes match download functions of 'ayon_api'
         if data["type"] == "dependency_package":
-            return ayon_api.download_dependency_package(
-                data["name"],
-                destination_dir,
-                filename,
-                chunk_size=cls.CHUNK_SIZE,
-                progress=transfer_progress
-            )
+            return f"api/desktop/dependencyPackages/{filename}"
 
         if data["type"] == "addon":
-            return ayon_api.download_addon_private_file(
-                data["name"],
-                data["version"],
-                filename,
-                destination_dir,
-                chunk_size=cls.CHUNK_SIZE,
-                progress=transfer_progress
+            return (
+                f"api/addons/{data['name']}/{data['version']}"
+                f"/private/{filename}"
             )
 
         if data["type"] == "installer":
-            filepath = os.path.join(destination_dir, filename)
-            ayon_api.download_installer(
-                filename,
+            return f"api/desktop/installers/{filename}"
+
+        raise ValueError(f"Unknown type to download \"{data['type']}\"")
+
+    @staticmethod
+    def get_request_kwargs():
+        """Headers and connection options of global server connection.
+
+        Returns:
+            tuple[dict[str, str], dict[str, Any]]: Request headers and
+                additional kwargs for 'requests'.
+        """
+
+        con = ayon_api.get_server_api_connection()
+        headers = con.get_headers()
+        headers.pop("Content-Type", None)
+        request_kwargs = {}
+        if hasattr(con, "get_ssl_verify"):
+            request_kwargs["verify"] = con.get_ssl_verify()
+        if hasattr(con, "get_cert") and con.get_cert():
+            request_kwargs["cert"] = con.get_cert()
+        if hasattr(con, "get_timeout"):
+            request_kwargs["timeout"] = con.get_timeout()
+        return headers, request_kwargs
+
+    @staticmethod
+    def get_max_retries():
+        """Retries of interrupted download set on global server connection.
+
+        Returns:
+            int: Maximum number of retries.
+        """
+
+        con = ayon_api.get_server_api_connection()
+        if hasattr(con, "get_max_retries"):
+            return con.get_max_retries()
+        return DOWNLOAD_RETRIES
+
+    @classmethod
+    def download(cls, source, destination_dir, data, transfer_progress):
+        return cls._download(source, destination_dir, data, transfer_progress)
+
+    @classmethod
+    def download_with_checksum(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm="sha256",
+    ):
+        checksum = TransferChecksum(checksum_algorithm)
+        filepath = cls._download(
+            source, destination_dir, data, transfer_progress, checksum
+        )
+        return filepath, checksum.hexdigest()
+
+    @classmethod
+    def get_urls(cls, source, data, filename):
+        """Urls from which the file can be downloaded, in order.
+
+        Args:
+            source (dict[str, Any]): Source information.
+            data (dict[str, Any]): More information about download content.
+            filename (str): Name of file to download.
+
+        Returns:
+            list[str]: Urls to try.
+        """
+
+        con = ayon_api.get_server_api_connection()
+        base_url = con.get_base_url().rstrip("/")
+        endpoint = cls.get_endpoint(source, data, filename)
+        if endpoint.startswith(base_url):
+            return [endpoint]
+
+        urls = [f"{base_url}/{endpoint}"]
+        # Auto-fix missing 'api/' the same way as 'ayon_api' does
+        if source["path"] and not endpoint.startswith("api/"):
+            urls.append(f"{base_url}/api/{endpoint}")
+        return urls
+
+    @staticmethod
+    def _transfer_from_urls(urls, transfer_progress, func):
+        """Call transfer function with urls until one is found on server.
+
+        Args:
+            urls (list[str]): Urls to try.
+            transfer_progress (ayon_api.TransferProgress): Progress of
+                transferred content.
+            func (Callable[[str], None]): Transfer function expecting url.
+        """
+
+        transfer_progress.set_started()
+        try:
+            for url in urls:
+                transfer_progress.set_source_url(url)
+                try:
+                    func(url)
+                    break
+                except requests.exceptions.HTTPError as exc:
+                    if (
+                        url == urls[-1]
+                        or exc.response is None
+                        or exc.response.status_code not in (404, 405)
+                    ):
+                        raise
+        except Exception as exc:
+            transfer_progress.set_failed(str(exc))
+            raise
+        finally:
+            transfer_progress.set_transfer_done()
+
+    @classmethod
+    def _download(
+        cls, source, destination_dir, data, transfer_progress, checksum=None
+    ):
+        filename = cls.get_filename(source)
+        cls.log.debug(f"Downloading {filename} to {destination_dir}")
+
+        filepath = os.path.join(destination_dir, filename)
+        headers, request_kwargs = cls.get_request_kwargs()
+        transfer_progress.set_destination_url(filepath)
+        cls._transfer_from_urls(
+            cls.get_urls(source, data, filename),
+            transfer_progress,
+            lambda url: RemoteFileHandler.download_file(
+                url,
                 filepath,
+                headers=headers,
                 chunk_size=cls.CHUNK_SIZE,
-                progress=transfer_progress
+                progress=transfer_progress,
+                request_kwargs=request_kwargs,
+                size=data.get("size"),
+                checksum=checksum,
+                max_retries=cls.get_max_retries(),
             )
-            return filepath
+        )
+        return filepath
 
-        raise ValueError(f"Unknown type to download \"{data['type']}\"")
+    @classmethod
+    def can_extract_stream(cls, source, data):
+        tar_mode = cls._get_stream_tar_mode(cls.get_filename(source))
+        return tar_mode is not None
+
+    @classmethod
+    def extract_stream(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm=None,
+    ):
+        filename = cls.get_filename(source)
+        cls.log.debug(f"Extracting {filename} to {destination_dir}")
+        tar_mode = cls._get_stream_tar_mode(filename)
+        checksum = None
+        if checksum_algorithm:
+            checksum = TransferChecksum(checksum_algorithm)
+
+        headers, request_kwargs = cls.get_request_kwargs()
+        transfer_progress.set_destination_url(destination_dir)
+        cls._transfer_from_urls(
+            cls.get_urls(source, data, filename),
+            transfer_progress,
+            lambda url: RemoteFileHandler.extract_tar_stream(
+                url,
+                destination_dir,
+                tar_mode,
+                headers=headers,
+                chunk_size=cls.CHUNK_SIZE,
+                progress=transfer_progress,
+                request_kwargs=request_kwargs,
+                checksum=checksum,
+            )
+        )
+        if checksum is not None:
+            return checksum.hexdigest()
+        return None
 
     @classmethod
     def cleanup(cls, source, destination_dir, data):
-        filename = source["filename"]
+        filename = cls.get_filename(source)
         filepath = os.path.join(destination_dir, filename)
         if os.path.exists(filepath) and os.path.isfile(filepath):
             os.remove(filepath)
+        RemoteFileHandler.remove_partial_download(filepath)
+
+
+class ChunkedDownloader(SourceDownloader):
+    """Downloader rebuilding archive from content-defined chunks.
+
+    Source url leads to chunk index of the archive. Only chunks that are
+    not available in local chunk store are downloaded, so small change of
+    big archive (e.g. dependency package) does not require to download
+    whole archive again.
+    """
+
+    CHUNK_WORKERS = 4
+    _chunk_store = None
+
+    @classmethod
+    def get_chunk_store(cls):
+        if ChunkedDownloader._chunk_store is None:
+            ChunkedDownloader._chunk_store = ChunkStore()
+        return ChunkedDownloader._chunk_store
+
+    @staticmethod
+    def get_chunks_url(source):
+        """Base url of chunks.
+
+        Chunks are expected in 'chunks' folder next to the index if
+        source does not define 'chunks_url'.
+
+        Args:
+            source (dict[str, Any]): Source information.
+
+        Returns:
+            str: Base url of chunks.
+        """
+
+        chunks_url = source.get("chunks_url")
+        if chunks_url:
+            return chunks_url.rstrip("/")
+        return source["url"].rsplit("/", 1)[0] + "/chunks"
+
+    @classmethod
+    def get_index_path(cls, destination_dir):
+        """Path where is stored chunk index of downloaded file.
+
+        Index is stored to temp directory, not to the destination
+        directory which can be shared with other machines.
+
+        Args:
+            destination_dir (str): Download directory.
+
+        Returns:
+            str: Path to chunk index file.
+        """
+
+        key = hashlib.sha256(
+            os.path.normpath(destination_dir).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(
+            tempfile.gettempdir(), "ayon_chunk_indexes", f"{key}.json"
+        )
+
+    @staticmethod
+    def _get_headers(source):
+        headers = {"User-Agent": USER_AGENT}
+        if source.get("headers"):
+            headers.update(source["headers"])
+        return headers
+
+    @classmethod
+    def download(cls, source, destination_dir, data, transfer_progress):
+        return cls._download(source, destination_dir, data, transfer_progress)
+
+    @classmethod
+    def download_with_checksum(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm="sha256",
+    ):
+        checksum = TransferChecksum(checksum_algorithm)
+        filepath = cls._download(
+            source, destination_dir, data, transfer_progress, checksum
+        )
+        return filepath, checksum.hexdigest()
+
+    @classmethod
+    def _download(
+        cls, source, destination_dir, data, transfer_progress, checksum=None
+    ):
+        index_url = source["url"]
+        cls.log.debug(f"Downloading chunks of {index_url}")
+        headers = cls._get_headers(source)
+        transfer_progress.set_source_url(index_url)
+        transfer_progress.set_destination_url(destination_dir)
+        transfer_progress.set_started()
+        try:
+            response = requests.get(
+                index_url, headers=headers, timeout=DOWNLOAD_TIMEOUT
+            )
+            response.raise_for_status()
+            index = response.json()
+            validate_chunk_index(index)
+
+            chunk_store = cls.get_chunk_store()
+            missing_chunks = chunk_store.get_missing_chunks(index)
+            transfer_progress.set_content_size(
+                sum(chunk["size"] for chunk in missing_chunks)
+            )
+            cls.log.debug(
+                f"Downloading {len(missing_chunks)} missing chunks"
+                f" out of {len(index['chunks'])}"
+            )
+            cls._download_chunks(
+                chunk_store,
+                index["algorithm"],
+                cls.get_chunks_url(source),
+                missing_chunks,
+                headers,
+                transfer_progress,
+            )
+
+            filename = source.get("filename") or index["filename"]
+            filepath = os.path.join(destination_dir, filename)
+            os.makedirs(destination_dir, exist_ok=True)
+            # Store index so cleanup knows which file was created
+            index_path = cls.get_index_path(destination_dir)
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            with open(index_path, "w") as stream:
+                json.dump(index, stream)
+            chunk_store.rebuild_file(index, filepath, checksum)
+
+        except Exception as exc:
+            transfer_progress.set_failed(str(exc))
+            raise
+
+        finally:
+            transfer_progress.set_transfer_done()
+        return filepath
+
+    @classmethod
+    def _download_chunks(
+        cls, chunk_store, algorithm, chunks_url, chunks, headers, progress
+    ):
+        if not chunks:
+            return
+
+        lock = threading.Lock()
+        with ThreadPoolExecutor(
+            min(cls.CHUNK_WORKERS, len(chunks)),
+            thread_name_prefix="ayon_chunk_download"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    cls._download_chunk,
+                    chunk_store,
+                    algorithm,
+                    chunks_url,
+                    chunk,
+                    headers,
+                    progress,
+                    lock,
+                )
+                for chunk in chunks
+            ]
+            for future in futures:
+                future.result()
+
+    @staticmethod
+    def _download_chunk(
+        chunk_store, algorithm, chunks_url, chunk, headers, progress, lock
+    ):
+        checksum = chunk["checksum"]
+        url = f"{chunks_url}/{get_chunk_relpath(checksum)}"
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = requests.get(
+                    url, headers=headers, timeout=DOWNLOAD_TIMEOUT
+                )
+                response.raise_for_status()
+                break
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ):
+                if attempt >= DOWNLOAD_RETRIES:
+                    raise
+                time.sleep(RETRY_SLEEP * attempt)
+
+        chunk_store.add_chunk(algorithm, checksum, response.content)
+        with lock:
+            progress.add_transferred_chunk(chunk["size"])
+
+    @classmethod
+    def cleanup(cls, source, destination_dir, data):
+        index_path = cls.get_index_path(destination_dir)
+        filename = source.get("filename")
+        if not filename and os.path.exists(index_path):
+            try:
+                with open(index_path, "r") as stream:
+                    filename = json.load(stream).get("filename")
+            except ValueError:
+                pass
+
+        paths = [index_path]
+        if filename:
+            paths.append(os.path.join(destination_dir, filename))
+        for path in paths:
+            if os.path.isfile(path):
+                os.remove(path)
 
 
 class DownloadFactory:
@@ -241,4 +833,5 @@ def get_default_download_factory():
     download_factory.register_format(UrlType.FILESYSTEM, OSDownloader)
     download_factory.register_format(UrlType.HTTP, HTTPDownloader)
     download_factory.register_format(UrlType.SERVER, AyonServerDownloader)
+    download_factory.register_format(UrlType.CHUNKED, ChunkedDownloader)
     return download_factory
@@ -1,14 +1,314 @@
 import os
 import re
+import json
+import time
 import urllib
 from urllib.parse import urlparse
 import urllib.request
 import urllib.error
+import tarfile
 import itertools
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+from ayon_common.utils import create_hash_object
+
 USER_AGENT = "AYON-launcher"
+# Extension of partially downloaded file and of its metadata
+PART_EXT = ".part"
+PART_METADATA_EXT = ".part.json"
+DOWNLOAD_RETRIES = 3
+RETRY_SLEEP = 2
+# Timeout in seconds of connection and of waiting for data
+DOWNLOAD_TIMEOUT = 30
+# Segmented download defaults
+DEFAULT_DOWNLOAD_SEGMENTS = 4
+DEFAULT_SEGMENT_THRESHOLD = 64 * 1024 * 1024
+SEGMENT_CHUNK_SIZE = 256 * 1024
+
+
+class TransferChecksum:
+    """Checksum calculated from content while it is transferred.
+
+    Downloads feed every received chunk into the checksum, so downloaded
+        file does not have to be read again for validation. Segmented
+        download feeds each segment once all previous segments are
+        finished. Checksum is marked as invalid when a download can't feed
+        content in order, in that case 'hexdigest' returns None and file
+        must be validated by reading it.
+
+    Args:
+        checksum_algorithm (str): Algorithm to use. ('md5', 'sha1', 'sha256')
+
+    Raises:
+        ValueError: Unknown checksum algorithm.
+    """
+
+    def __init__(self, checksum_algorithm):
+        self._checksum_algorithm = checksum_algorithm
+        self._hash_obj = create_hash_object(checksum_algorithm)
+        self._valid = True
+
+    def update(self, chunk):
+        if self._valid:
+            self._hash_obj.update(chunk)
+
+    def update_from_file(
+        self, filepath, size, chunk_size=1024 * 1024, offset=0
+    ):
+        """Feed bytes of a file into checksum.
+
+        Used when partially downloaded file is resumed and for finished
+            segments of segmented download.
+
+        Args:
+            filepath (str): Path to a file.
+            size (int): Number of bytes to read.
+            chunk_size (Optional[int]): Read chunk size.
+            offset (Optional[int]): Position in file where to start.
+        """
+
+        if not self._valid:
+            return
+        with open(filepath, "rb") as stream:
+            stream.seek(offset)
+            while size > 0:
+                chunk = stream.read(min(chunk_size, size))
+                if not chunk:
+                    break
+                self._hash_obj.update(chunk)
+                size -= len(chunk)
+
+    def reset(self):
+        """Reset checksum to initial state."""
+
+        self._hash_obj = create_hash_object(self._checksum_algorithm)
+        self._valid = True
+
+    def invalidate(self):
+        """Mark checksum as not usable for validation."""
+
+        self._valid = False
+
+    @property
+    def is_valid(self):
+        return self._valid
+
+    def hexdigest(self):
+        """Calculated checksum.
+
+        Returns:
+            Union[str, None]: Checksum or None if is not valid.
+        """
+
+        if self._valid:
+            return self._hash_obj.hexdigest()
+        return None
+
+
+class RangeNotSupported(Exception):
+    """Server does not support range requests for the content."""
+
+
+def get_download_segments_count():
+    """Number of concurrent connections used to download large files.
+
+    Value can be changed using 'AYON_DOWNLOAD_SEGMENTS' environment
+        variable. Value '1' disables segmented downloads.
+
+    Returns:
+        int: Number of segments.
+    """
+
+    value = os.getenv("AYON_DOWNLOAD_SEGMENTS")
+    if value and value.isdigit():
+        return max(int(value), 1)
+    return DEFAULT_DOWNLOAD_SEGMENTS
+
+
+def get_download_segment_threshold():
+    """Minimum file size in bytes for segmented download.
+
+    Value can be changed using 'AYON_DOWNLOAD_SEGMENT_THRESHOLD'
+        environment variable.
+
+    Returns:
+        int: Size threshold in bytes.
+    """
+
+    value = os.getenv("AYON_DOWNLOAD_SEGMENT_THRESHOLD")
+    if value and value.isdigit():
+        return int(value)
+    return DEFAULT_SEGMENT_THRESHOLD
+
+
+_connection_budget = threading.local()
+
+
+@contextlib.contextmanager
+def connection_budget(semaphore):
+    """Limit connections of downloads started from current thread.
+
+    Caller must hold one slot of the semaphore for the whole block, that
+        slot is used by the download. Segmented download uses additional
+        slots only when they're free, so downloads sharing the semaphore
+        never wait for each other.
+
+    Args:
+        semaphore (threading.Semaphore): Semaphore limiting connections
+            to a host.
+    """
+
+    previous = getattr(_connection_budget, "semaphore", None)
+    _connection_budget.semaphore = semaphore
+    try:
+        yield
+    finally:
+        _connection_budget.semaphore = previous
+
+
+def get_connection_budget():
+    """Semaphore limiting connections of downloads in current thread.
+
+    Returns:
+        Union[threading.Semaphore, None]: Semaphore set with
+            'connection_budget' or None if connections are not limited.
+    """
+
+    return getattr(_connection_budget, "semaphore", None)
+
+
+def is_stream_extract_enabled():
+    """Tar archives can be extracted while they are downloaded.
+
+    Can be disabled with 'AYON_DOWNLOAD_STREAM_EXTRACT' environment variable
+        set to '0'.
+
+    Returns:
+        bool: Stream extraction is enabled.
+    """
+
+    return os.getenv("AYON_DOWNLOAD_STREAM_EXTRACT") != "0"
+
+
+class _ResponseReader:
+    """Read-only file-like object over content of a streamed response.
+
+    Every chunk read from the response is added to progress and checksum.
+
+    Args:
+        response (requests.Response): Response opened with 'stream=True'.
+        chunk_size (int): Size of chunks read from response.
+        progress (Optional[ayon_api.TransferProgress]): Transfer progress.
+        checksum (Optional[TransferChecksum]): Checksum fed with content.
+    """
+
+    def __init__(self, response, chunk_size, progress=None, checksum=None):
+        self._iter = response.iter_content(chunk_size)
+        self._buffer = b""
+        self._progress = progress
+        self._checksum = checksum
+        self.transferred = 0
+
+    def _next_chunk(self):
+        for chunk in self._iter:
+            if not chunk:
+                continue
+            self.transferred += len(chunk)
+            if self._checksum is not None:
+                self._checksum.update(chunk)
+            if self._progress is not None:
+                self._progress.add_transferred_chunk(len(chunk))
+            return chunk
+        return b""
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            chunks = [self._buffer]
+            self._buffer = b""
+            while chunk := self._next_chunk():
+                chunks.append(chunk)
+            return b"".join(chunks)
+
+        while len(self._buffer) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+        output = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return output
+
+    def drain(self):
+        """Read rest of the content, e.g. padding after end of archive."""
+
+        self._buffer = b""
+        while self._next_chunk():
+            pass
+
+
+def _get_request_kwargs(request_kwargs, headers, identity=False):
+    """Prepare kwargs for 'requests.get' of a download.
+
+    Args:
+        request_kwargs (Union[dict[str, Any], None]): Kwargs passed by
+            caller.
+        headers (Union[dict[str, str], None]): Request headers.
+        identity (Optional[bool]): Ask server to not compress content, so
+            received bytes match 'Content-Length' and byte ranges.
+
+    Returns:
+        dict[str, Any]: Kwargs with headers and timeout.
+    """
+
+    kwargs = dict(request_kwargs or {})
+    if kwargs.get("timeout") is None:
+        kwargs["timeout"] = DOWNLOAD_TIMEOUT
+    final_headers = dict(headers or {})
+    if identity:
+        final_headers["Accept-Encoding"] = "identity"
+    kwargs["headers"] = final_headers
+    return kwargs
+
+
+def _set_progress_transferred(progress, transferred):
+    if progress is None:
+        return
+    if hasattr(progress, "set_transferred_size"):
+        progress.set_transferred_size(transferred)
+    elif transferred:
+        progress.add_transferred_chunk(transferred)
+
+
+def _get_response_validator(response):
+    """Validator that can be used in 'If-Range' header.
+
+    Weak entity tags can't be used for range requests.
+
+    Returns:
+        Union[str, None]: Strong ETag or Last-Modified value.
+    """
+
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+def _get_response_total_size(response, offset):
+    content_range = response.headers.get("Content-Range")
+    if content_range and "/" in content_range:
+        total = content_range.rsplit("/", 1)[-1]
+        if total.isdigit():
+            return int(total)
+
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit():
+        return int(content_length) + offset
+    return None
 
 
 class RemoteFileHandler:
@@ -20,10 +320,18 @@ class RemoteFileHandler:
         root,
         filename=None,
         max_redirect_hops=3,
-        headers=None
+        headers=None,
+        progress=None,
+        size=None,
+        chunk_size=None,
+        checksum=None,
     ):
         """Download a file from url and place it in root.
 
+        Download is resumable, see 'download_resumable'. Large files
+            with known size are downloaded in segments, see
+            'download_segmented'.
+
         Args:
             url (str): URL to download file from
             root (str): Directory to place downloaded file in
@@ -33,6 +341,12 @@ class RemoteFileHandler:
                 hops allowed
             headers (Optional[dict[str, str]]): Additional required headers
                 - Authentication etc..
+            progress (Optional[ayon_api.TransferProgress]): Object to track
+                download progress.
+            size (Optional[int]): Expected size of file in bytes.
+            chunk_size (Optional[int]): Size of chunks to read.
+            checksum (Optional[TransferChecksum]): Checksum fed with
+                downloaded content.
         """
 
         root = os.path.expanduser(root)
@@ -49,13 +363,23 @@ class RemoteFileHandler:
         # check if file is located on Google Drive
         file_id = RemoteFileHandler._get_google_drive_file_id(url)
         if file_id is not None:
+            if checksum is not None:
+                checksum.invalidate()
             return RemoteFileHandler.download_file_from_google_drive(
                 file_id, root, filename)
 
         # download the file
         try:
             print(f"Downloading {url} to {fpath}")
-            RemoteFileHandler._urlretrieve(url, fpath, headers=headers)
+            RemoteFileHandler._urlretrieve(
+                url,
+                fpath,
+                chunk_size=chunk_size,
+                headers=headers,
+                progress=progress,
+                size=size,
+                checksum=checksum,
+            )
         except (urllib.error.URLError, IOError) as exc:
             if url[:5] != "https":
                 raise exc
@@ -65,7 +389,15 @@ class RemoteFileHandler:
                 "Failed download. Trying https -> http instead."
                 f" Downloading {url} to {fpath}"
             ))
-            RemoteFileHandler._urlretrieve(url, fpath, headers=headers)
+            RemoteFileHandler._urlretrieve(
+                url,
+                fpath,
+                chunk_size=chunk_size,
+                headers=headers,
+                progress=progress,
+                size=size,
+                checksum=checksum,
+            )
 
     @staticmethod
     def download_file_from_google_drive(file_id, root, filename=None):
@@ -94,12 +426,19 @@ class RemoteFileHandler:
 
         session = requests.Session()
 
-        response = session.get(url, params={"id": file_id}, stream=True)
+        response = session.get(
+            url,
+            params={"id": file_id},
+            stream=True,
+            timeout=DOWNLOAD_TIMEOUT,
+        )
         token = RemoteFileHandler._get_confirm_token(response)
 
         if token:
             params = {"id": file_id, "confirm": token}
-            response = session.get(url, params=params, stream=True)
+            response = session.get(
+                url, params=params, stream=True, timeout=DOWNLOAD_TIMEOUT
+            )
 
         response_content_generator = response.iter_content(32768)
         first_chunk = None
@@ -121,20 +460,594 @@ class RemoteFileHandler:
         response.close()
 
     @staticmethod
-    def _urlretrieve(url, filename, chunk_size=None, headers=None):
+    def _urlretrieve(
+        url,
+        filename,
+        chunk_size=None,
+        headers=None,
+        progress=None,
+        size=None,
+        checksum=None,
+    ):
         final_headers = {"User-Agent": USER_AGENT}
         if headers:
             final_headers.update(headers)
 
-        chunk_size = chunk_size or 8192
-        with open(filename, "wb") as fh:
-            with urllib.request.urlopen(
-                urllib.request.Request(url, headers=final_headers)
-            ) as response:
-                for chunk in iter(lambda: response.read(chunk_size), ""):
+        RemoteFileHandler.download_file(
+            url,
+            filename,
+            headers=final_headers,
+            chunk_size=chunk_size or 8192,
+            progress=progress,
+            size=size,
+            checksum=checksum,
+        )
+
+    @staticmethod
+    def extract_tar_stream(
+        url,
+        dst_dirpath,
+        tar_mode="r|*",
+        headers=None,
+        chunk_size=None,
+        progress=None,
+        request_kwargs=None,
+        checksum=None,
+    ):
+        """Extract tar archive from url while it is downloaded.
+
+        Archive is never stored to disk, members are extracted in order
+            as bytes arrive. Download can't be resumed, so whole archive
+            is received again when it fails.
+
+        Args:
+            url (str): Url of tar archive.
+            dst_dirpath (str): Directory where content is extracted.
+            tar_mode (Optional[str]): Stream mode for 'tarfile.open'.
+            headers (Optional[dict[str, str]]): Request headers.
+            chunk_size (Optional[int]): Size of chunks to read.
+            progress (Optional[ayon_api.TransferProgress]): Progress
+                of download.
+            request_kwargs (Optional[dict[str, Any]]): Additional kwargs
+                for 'requests.get' (e.g. 'verify' or 'cert').
+            checksum (Optional[TransferChecksum]): Checksum fed with
+                downloaded content.
+        """
+
+        final_headers = {"User-Agent": USER_AGENT}
+        if headers:
+            final_headers.update(headers)
+
+        os.makedirs(dst_dirpath, exist_ok=True)
+        kwargs = _get_request_kwargs(
+            request_kwargs, final_headers, identity=True
+        )
+        with requests.get(url, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            total_size = _get_response_total_size(response, 0)
+            if progress is not None and total_size is not None:
+                progress.set_content_size(total_size)
+
+            reader = _ResponseReader(
+                response, chunk_size or 8192, progress, checksum
+            )
+            with tarfile.open(fileobj=reader, mode=tar_mode) as tar_file:
+                tar_file.extractall(dst_dirpath)
+            # Read the rest of content so checksum covers whole file
+            reader.drain()
+
+        if total_size is not None and reader.transferred != total_size:
+            raise requests.exceptions.ConnectionError(
+                f"Downloaded {reader.transferred} out of {total_size}"
+                f" bytes from '{url}'."
+            )
+
+    @staticmethod
+    def download_file(
+        url,
+        filepath,
+        headers=None,
+        chunk_size=None,
+        progress=None,
+        request_kwargs=None,
+        size=None,
+        checksum=None,
+        max_retries=DOWNLOAD_RETRIES,
+    ):
+        """Download file using the best available download mode.
+
+        Segmented download is used when size of file is known and is bigger
+            than threshold, resumable single stream download is used
+            otherwise or when server does not support ranges.
+
+        Args:
+            url (str): URL of file to download.
+            filepath (str): Path where file should be downloaded.
+            headers (Optional[dict[str, str]]): Request headers.
+            chunk_size (Optional[int]): Size of chunks to read.
+            progress (Optional[ayon_api.TransferProgress]): Object to track
+                download progress.
+            request_kwargs (Optional[dict[str, Any]]): Additional kwargs
+                for 'requests.get' (e.g. 'verify' or 'cert').
+            size (Optional[int]): Expected size of file in bytes.
+            checksum (Optional[TransferChecksum]): Checksum fed with
+                downloaded content.
+            max_retries (Optional[int]): How many times is download retried
+                on connection issues.
+
+        Returns:
+            str: Path to downloaded file.
+        """
+
+        segments = get_download_segments_count()
+        if (
+            size
+            and segments > 1
+            and size >= get_download_segment_threshold()
+        ):
+            try:
+                return RemoteFileHandler.download_segmented(
+                    url,
+                    filepath,
+                    size,
+                    segments,
+                    headers=headers,
+                    progress=progress,
+                    request_kwargs=request_kwargs,
+                    max_retries=max_retries,
+                    checksum=checksum,
+                )
+            except RangeNotSupported:
+                print(
+                    f"Server does not support segmented download of {url}."
+                    " Using single connection."
+                )
+                RemoteFileHandler.remove_partial_download(filepath)
+
+        return RemoteFileHandler.download_resumable(
+            url,
+            filepath,
+            headers=headers,
+            chunk_size=chunk_size,
+            progress=progress,
+            request_kwargs=request_kwargs,
+            max_retries=max_retries,
+            checksum=checksum,
+        )
+
+    @staticmethod
+    def download_segmented(
+        url,
+        filepath,
+        size,
+        segments,
+        headers=None,
+        progress=None,
+        request_kwargs=None,
+        max_retries=DOWNLOAD_RETRIES,
+        checksum=None,
+        semaphore=None,
+    ):
+        """Download file using multiple concurrent range requests.
+
+        File is split into byte ranges which are downloaded concurrently
+            into single preallocated '{filepath}.part' file. Finished
+            segments are stored to part metadata, so only unfinished segments
+            are downloaded again on retry or on next call.
+
+        Concurrent connections are limited by semaphore. Caller holds one
+            slot of it, other segments are downloaded in parallel only
+            using slots that are free. Semaphore from 'connection_budget'
+            is used if it is not passed.
+
+        Args:
+            url (str): URL of file to download.
+            filepath (str): Path where file should be downloaded.
+            size (int): Size of file in bytes.
+            segments (int): Number of segments.
+            headers (Optional[dict[str, str]]): Request headers.
+            progress (Optional[ayon_api.TransferProgress]): Object to track
+                download progress.
+            request_kwargs (Optional[dict[str, Any]]): Additional kwargs
+                for 'requests.get' (e.g. 'verify' or 'cert').
+            max_retries (Optional[int]): How many times is download retried
+                on connection issues.
+            checksum (Optional[TransferChecksum]): Checksum fed with
+                finished segments in order.
+            semaphore (Optional[threading.Semaphore]): Semaphore limiting
+                concurrent connections to the host.
+
+        Returns:
+            str: Path to downloaded file.
+
+        Raises:
+            RangeNotSupported: Server does not support range requests.
+        """
+
+        dirpath = os.path.dirname(filepath)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+
+        segment_size = -(-size // segments)
+        ranges = [
+            [start, min(start + segment_size, size) - 1]
+            for start in range(0, size, segment_size)
+        ]
+        part_path = filepath + PART_EXT
+        metadata = RemoteFileHandler._read_part_metadata(filepath)
+        finished = set()
+        if (
+            metadata.get("url") == url
+            and metadata.get("size") == size
+            and metadata.get("segments") == ranges
+            and os.path.isfile(part_path)
+            and os.path.getsize(part_path) == size
+        ):
+            finished = set(metadata.get("finished") or [])
+            validator = metadata.get("validator")
+        else:
+            validator = None
+            with open(part_path, "wb") as stream:
+                stream.truncate(size)
+
+        if progress is not None:
+            progress.set_content_size(size)
+            _set_progress_transferred(progress, sum(
+                ranges[idx][1] - ranges[idx][0] + 1
+                for idx in finished
+            ))
+
+        state = {
+            "url": url,
+            "size": size,
+            "validator": validator,
+            "segments": ranges,
+            "finished": sorted(finished),
+        }
+        lock = threading.Lock()
+        RemoteFileHandler._write_part_metadata(filepath, state)
+
+        # Segments are fed to checksum in order, each segment once all
+        #   previous segments are finished
+        checksum_lock = threading.Lock()
+        checksum_state = {"next": 0}
+        if checksum is not None:
+            checksum.reset()
+
+        def _update_checksum():
+            if checksum is None:
+                return
+            with checksum_lock:
+                while True:
+                    idx = checksum_state["next"]
+                    with lock:
+                        if idx not in state["finished"]:
+                            return
+                    start, end = ranges[idx]
+                    checksum.update_from_file(
+                        part_path, end + 1 - start, offset=start
+                    )
+                    checksum_state["next"] += 1
+
+        def _download_segment(idx):
+            attempt = 0
+            while True:
+                try:
+                    RemoteFileHandler._download_segment(
+                        url,
+                        part_path,
+                        ranges[idx],
+                        headers,
+                        progress,
+                        request_kwargs,
+                        state,
+                        lock,
+                    )
+                    break
+                except (
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError,
+                ):
+                    attempt += 1
+                    if attempt > max_retries:
+                        raise
+                    time.sleep(RETRY_SLEEP)
+
+            with lock:
+                state["finished"].append(idx)
+                RemoteFileHandler._write_part_metadata(filepath, state)
+            _update_checksum()
+
+        _update_checksum()
+        pending = [
+            idx
+            for idx in range(len(ranges))
+            if idx not in finished
+        ]
+        if semaphore is None:
+            semaphore = get_connection_budget()
+        if pending:
+            # Caller's connection is always available
+            acquired = 0
+            if semaphore is None:
+                workers = len(pending)
+            else:
+                while (
+                    acquired < len(pending) - 1
+                    and semaphore.acquire(blocking=False)
+                ):
+                    acquired += 1
+                workers = acquired + 1
+            try:
+                with ThreadPoolExecutor(
+                    workers, thread_name_prefix="ayon_segment"
+                ) as executor:
+                    # Consume results to propagate exceptions
+                    for _ in executor.map(_download_segment, pending):
+                        pass
+            finally:
+                for _ in range(acquired):
+                    semaphore.release()
+
+        if checksum is not None and checksum_state["next"] != len(ranges):
+            checksum.invalidate()
+
+        os.replace(part_path, filepath)
+        RemoteFileHandler._remove_part_metadata(filepath)
+        return filepath
+
+    @staticmethod
+    def _download_segment(
+        url,
+        part_path,
+        byte_range,
+        headers,
+        progress,
+        request_kwargs,
+        state,
+        lock,
+    ):
+        start, end = byte_range
+        final_headers = dict(headers or {})
+        final_headers["Range"] = f"bytes={start}-{end}"
+        with lock:
+            validator = state["validator"]
+        if validator:
+            final_headers["If-Range"] = validator
+
+        kwargs = _get_request_kwargs(
+            request_kwargs, final_headers, identity=True
+        )
+        transferred = 0
+        with requests.get(url, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise RangeNotSupported(url)
+
+            response_validator = _get_response_validator(response)
+            with lock:
+                if state["validator"] is None:
+                    state["validator"] = response_validator
+                elif state["validator"] != response_validator:
+                    raise RangeNotSupported(url)
+
+            with open(part_path, "r+b") as stream:
+                stream.seek(start)
+                for chunk in response.iter_content(SEGMENT_CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    # Protect against servers ignoring end of range
+                    chunk = chunk[:end + 1 - start - transferred]
+                    stream.write(chunk)
+                    transferred += len(chunk)
+                    if progress is not None:
+                        with lock:
+                            progress.add_transferred_chunk(len(chunk))
+
+        expected = end + 1 - start
+        if transferred != expected:
+            if progress is not None:
+                with lock:
+                    progress.add_transferred_chunk(-transferred)
+            raise requests.exceptions.ConnectionError(
+                f"Downloaded {transferred} out of {expected}"
+                f" bytes of segment from '{url}'."
+            )
+
+    @staticmethod
+    def download_resumable(
+        url,
+        filepath,
+        headers=None,
+        chunk_size=None,
+        progress=None,
+        request_kwargs=None,
+        max_retries=DOWNLOAD_RETRIES,
+        checksum=None,
+    ):
+        """Download file from url with ability to resume the download.
+
+        Content is downloaded to '{filepath}.part' file and validator
+            of the content (ETag or Last-Modified) is stored next to it
+            to '{filepath}.part.json'. Download continues from the end of
+            the part file using 'Range' request on retry or on next call of
+            the function. Whole file is downloaded again if server does
+            not support range requests or the content has changed.
+
+        The part file is renamed to 'filepath' once download is finished.
+
+        Args:
+            url (str): URL of file to download.
+            filepath (str): Path where file should be downloaded.
+            headers (Optional[dict[str, str]]): Request headers.
+            chunk_size (Optional[int]): Size of chunks to read.
+            progress (Optional[ayon_api.TransferProgress]): Object to track
+                download progress.
+            request_kwargs (Optional[dict[str, Any]]): Additional kwargs
+                for 'requests.get' (e.g. 'verify' or 'cert').
+            max_retries (Optional[int]): How many times is download retried
+                on connection issues.
+            checksum (Optional[TransferChecksum]): Checksum fed with
+                downloaded content.
+
+        Returns:
+            str: Path to downloaded file.
+        """
+
+        dirpath = os.path.dirname(filepath)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+
+        attempt = 0
+        while True:
+            try:
+                RemoteFileHandler._download_part(
+                    url,
+                    filepath,
+                    headers,
+                    chunk_size or 8192,
+                    progress,
+                    request_kwargs,
+                    checksum,
+                )
+                break
+
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ):
+                attempt += 1
+                if attempt > max_retries:
+                    raise
+                print(
+                    f"Download of {url} was interrupted."
+                    f" Resuming (attempt {attempt}/{max_retries})."
+                )
+                if progress is not None and hasattr(progress, "next_attempt"):
+                    progress.next_attempt()
+                time.sleep(RETRY_SLEEP)
+
+        os.replace(filepath + PART_EXT, filepath)
+        RemoteFileHandler._remove_part_metadata(filepath)
+        return filepath
+
+    @staticmethod
+    def remove_partial_download(filepath):
+        """Remove partially downloaded content of a file.
+
+        Args:
+            filepath (str): Path to a file which was downloaded.
+        """
+
+        part_path = filepath + PART_EXT
+        if os.path.isfile(part_path):
+            os.remove(part_path)
+        RemoteFileHandler._remove_part_metadata(filepath)
+
+    @staticmethod
+    def _read_part_metadata(filepath):
+        metadata_path = filepath + PART_METADATA_EXT
+        if not os.path.exists(metadata_path):
+            return {}
+        try:
+            with open(metadata_path, "r") as stream:
+                return json.load(stream)
+        except ValueError:
+            return {}
+
+    @staticmethod
+    def _write_part_metadata(filepath, data):
+        with open(filepath + PART_METADATA_EXT, "w") as stream:
+            json.dump(data, stream)
+
+    @staticmethod
+    def _remove_part_metadata(filepath):
+        metadata_path = filepath + PART_METADATA_EXT
+        if os.path.exists(metadata_path):
+            os.remove(metadata_path)
+
+    @staticmethod
+    def _download_part(
+        url, filepath, headers, chunk_size, progress, request_kwargs, checksum
+    ):
+        part_path = filepath + PART_EXT
+        metadata = RemoteFileHandler._read_part_metadata(filepath)
+        validator = metadata.get("validator")
+        offset = 0
+        # Part file of segmented download can't be resumed as single stream
+        if (
+            validator
+            and "segments" not in metadata
+            and metadata.get("url") == url
+            and os.path.isfile(part_path)
+        ):
+            offset = os.path.getsize(part_path)
+
+        if checksum is not None:
+            checksum.reset()
+
+        total_size = metadata.get("size")
+        if offset and offset == total_size:
+            # Previous download finished but file was not renamed
+            _set_progress_transferred(progress, offset)
+            if checksum is not None:
+                checksum.update_from_file(part_path, offset)
+            return
+
+        final_headers = dict(headers or {})
+        if offset:
+            final_headers["Range"] = f"bytes={offset}-"
+            final_headers["If-Range"] = validator
+
+        kwargs = _get_request_kwargs(
+            request_kwargs, final_headers, identity=True
+        )
+        with requests.get(url, stream=True, **kwargs) as response:
+            if offset and response.status_code == 416:
+                # Range not satisfiable - start over
+                RemoteFileHandler.remove_partial_download(filepath)
+                raise requests.exceptions.ConnectionError(
+                    f"Invalid range of partial download '{url}'."
+                )
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # Server does not support ranges or content has changed
+                offset = 0
+
+            if offset and checksum is not None:
+                checksum.update_from_file(part_path, offset)
+
+            total_size = _get_response_total_size(response, offset)
+            RemoteFileHandler._write_part_metadata(filepath, {
+                "url": url,
+                "validator": _get_response_validator(response),
+                "size": total_size,
+            })
+            if progress is not None:
+                if total_size is not None:
+                    progress.set_content_size(total_size)
+                _set_progress_transferred(progress, offset)
+
+            mode = "ab" if offset else "wb"
+            with open(part_path, mode) as stream:
+                for chunk in response.iter_content(chunk_size):
                     if not chunk:
-                        break
-                    fh.write(chunk)
+                        continue
+                    stream.write(chunk)
+                    if checksum is not None:
+                        checksum.update(chunk)
+                    if progress is not None:
+                        progress.add_transferred_chunk(len(chunk))
+
+        if total_size is not None:
+            downloaded = os.path.getsize(part_path)
+            if downloaded != total_size:
+                raise requests.exceptions.ConnectionError(
+                    f"Downloaded {downloaded} out of {total_size}"
+                    f" bytes from '{url}'."
+                )
 
     @staticmethod
     def _get_redirect_url(url, max_hops, headers=None):
@@ -144,7 +1057,8 @@ class RemoteFileHandler:
             final_headers.update(headers)
         for _ in range(max_hops + 1):
             with urllib.request.urlopen(
-                urllib.request.Request(url, headers=final_headers)
+                urllib.request.Request(url, headers=final_headers),
+                timeout=DOWNLOAD_TIMEOUT,
             ) as response:
                 if response.url == url or response.url is None:
                     return url
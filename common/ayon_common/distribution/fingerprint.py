@@ -0,0 +1,148 @@
+"""Fingerprints of fully distributed bundles.
+
+Fingerprint identifies what bundle requires on this machine (bundle name,
+checksum of bundle information from server, development addons, target
+directories), so it is created only from response of bundles request.
+When all items of a bundle are distributed the fingerprint is stored with
+resolved python and sys paths. Next launch with the same bundle can use
+the stored paths without preparing distribution items, so warm start does
+not depend on number of addons.
+
+Stored fingerprints are removed when garbage collection removes
+a distributed directory. Existence of directories used by stored paths
+is checked in background, see 'defer_lease' in garbage collector.
+
+Fast path can be disabled with 'AYON_DISTRIBUTION_FINGERPRINT'
+environment variable set to '0'.
+"""
+
+import os
+import json
+import uuid
+import hashlib
+
+FINGERPRINTS_FILENAME = ".bundle_fingerprints.json"
+FINGERPRINTS_VERSION = 3
+# Multiple bundles can be used on a machine (e.g. production and staging)
+MAX_FINGERPRINTS = 10
+
+
+def is_fingerprint_enabled():
+    """Fast path using fingerprint of distributed bundle is enabled.
+
+    Returns:
+        bool: Fast path is enabled.
+    """
+
+    return os.getenv("AYON_DISTRIBUTION_FINGERPRINT") != "0"
+
+
+def get_fingerprints_filepath(dirpath):
+    return os.path.join(dirpath, FINGERPRINTS_FILENAME)
+
+
+def create_bundle_fingerprint(bundle, platform_name, use_dev, dirpaths):
+    """Create fingerprint of bundle requirements.
+
+    Args:
+        bundle (Bundle): Bundle that is used.
+        platform_name (str): Platform name.
+        use_dev (bool): Development addons are used.
+        dirpaths (Iterable[str]): Directories where are items distributed.
+
+    Returns:
+        str: Fingerprint.
+    """
+
+    data = {
+        "name": bundle.name,
+        "checksum": bundle.checksum,
+        "platform": platform_name,
+        "addons_dev": bundle.addons_dev_info if use_dev else None,
+        "dirpaths": [os.path.normpath(dirpath) for dirpath in dirpaths],
+    }
+    content = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _read_fingerprints(dirpath):
+    try:
+        with open(get_fingerprints_filepath(dirpath), "r") as stream:
+            data = json.load(stream)
+    except (ValueError, OSError):
+        return {}
+
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != FINGERPRINTS_VERSION
+        or not isinstance(data.get("fingerprints"), dict)
+    ):
+        return {}
+    return data["fingerprints"]
+
+
+def get_fingerprint_data(dirpath, fingerprint):
+    """Stored data of distributed bundle fingerprint.
+
+    Args:
+        dirpath (str): Directory where fingerprints are stored.
+        fingerprint (str): Bundle fingerprint.
+
+    Returns:
+        Union[dict[str, Any], None]: Data with 'python_paths' and
+            'sys_paths' or None if bundle was not fully distributed.
+    """
+
+    data = _read_fingerprints(dirpath).get(fingerprint)
+    if (
+        not isinstance(data, dict)
+        or not isinstance(data.get("python_paths"), list)
+        or not isinstance(data.get("sys_paths"), list)
+        or not isinstance(data.get("dirpaths"), list)
+    ):
+        return None
+
+    return data
+
+
+def store_fingerprint_data(dirpath, fingerprint, data):
+    """Store data of fully distributed bundle.
+
+    Only last used fingerprints are kept.
+
+    Args:
+        dirpath (str): Directory where fingerprints are stored.
+        fingerprint (str): Bundle fingerprint.
+        data (dict[str, Any]): Data with 'python_paths', 'sys_paths' and
+            'dirpaths' of distributed items.
+    """
+
+    fingerprints = _read_fingerprints(dirpath)
+    fingerprints.pop(fingerprint, None)
+    # Dictionary keeps order of insertion, last item is the newest
+    fingerprints[fingerprint] = data
+    while len(fingerprints) > MAX_FINGERPRINTS:
+        fingerprints.pop(next(iter(fingerprints)))
+
+    filepath = get_fingerprints_filepath(dirpath)
+    os.makedirs(dirpath, exist_ok=True)
+    tmp_filepath = f"{filepath}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_filepath, "w") as stream:
+        json.dump({
+            "version": FINGERPRINTS_VERSION,
+            "fingerprints": fingerprints,
+        }, stream)
+    os.replace(tmp_filepath, filepath)
+
+
+def clear_fingerprints(dirpath):
+    """Remove all stored fingerprints.
+
+    Args:
+        dirpath (str): Directory where fingerprints are stored.
+    """
+
+    try:
+        os.remove(get_fingerprints_filepath(dirpath))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,549 @@
+"""Garbage collection of distributed addons and dependency packages.
+
+Distributed addon versions and dependency packages are kept until size of
+their directories exceeds a quota. Least recently used directories are
+then removed until the size fits into the quota. The quota can be changed
+with 'AYON_DISTRIBUTION_QUOTA' environment variable (in bytes), value '0'
+disables garbage collection.
+
+Process using distributed directories takes a lease for them. Lease is
+a json file with names of used directories and a lock file held by the
+process, so lease of a process that died is released by operating system.
+Leased directories are never removed. Leases are created and checked
+under garbage collection lock, so directory can't be removed between
+a process checked that the directory exists and took the lease.
+
+Directories used in last 'USAGE_GRACE_PERIOD' seconds are not removed
+either. Process using content leased recently by other process (e.g.
+child process using bootstrap of its parent) can take its lease in
+background thread, see 'lease_directories_in_background'. Directories of
+already distributed bundle are leased by background garbage collection
+of the process, see 'defer_lease'.
+
+Leases of processes running on other machines can't be checked when
+launcher storage is shared ('AYON_SHARED_STORAGE' set to '1'). They are
+considered as active until they're older than 'FOREIGN_LEASE_MAX_AGE'.
+State store of each machine is then local, so usage of directories is
+also recorded with modification time of usage marker files, which are
+visible to all machines.
+
+Background garbage collection also removes least recently used chunks of
+chunked distribution over size of chunk store. Chunks used within
+'USAGE_GRACE_PERIOD' are kept, so chunks of running distribution are not
+removed.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import logging
+import threading
+
+from .utils import (
+    get_addons_dir,
+    get_dependencies_dir,
+    get_distribution_state_store,
+)
+from .locks import (
+    FileLock,
+    get_lock_timeout,
+    get_distribution_lock,
+    is_shared_storage_enabled,
+)
+from .fingerprint import clear_fingerprints
+from .chunk_store import ChunkStore
+from .trash import move_to_trash, get_trash_dirpath
+
+DEFAULT_QUOTA = 20 * 1024 * 1024 * 1024
+# Minimum time between background garbage collections
+GC_INTERVAL = 60 * 60
+FOREIGN_LEASE_MAX_AGE = 30 * 24 * 60 * 60
+# Recently used directories are not removed
+USAGE_GRACE_PERIOD = 30 * 60
+LEASES_DIRNAME = ".leases"
+USAGE_DIRNAME = ".usage"
+# Name used for garbage collection lock of a folder
+GC_LOCK_NAME = ".garbage_collection"
+LAST_GC_KEY = "last_garbage_collection"
+
+log = logging.getLogger("GarbageCollector")
+
+# Leases held by current process
+_process_leases = []
+# Leases taken by background garbage collection
+_deferred_leases = []
+_process_leases_lock = threading.Lock()
+
+
+def get_distribution_quota():
+    """Maximum size of distributed addons and dependency packages.
+
+    Returns:
+        int: Maximum size in bytes, 0 if garbage collection is disabled.
+    """
+
+    value = os.getenv("AYON_DISTRIBUTION_QUOTA")
+    if not value:
+        return DEFAULT_QUOTA
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return DEFAULT_QUOTA
+
+
+def _get_state_store(root):
+    return get_distribution_state_store(root)
+
+
+def _set_shared_last_used(root, dirnames, last_used):
+    """Record usage of directories for other machines.
+
+    Args:
+        root (str): Folder with distributed directories.
+        dirnames (Iterable[str]): Names of used directories.
+        last_used (float): Time of usage.
+    """
+
+    usage_dirpath = os.path.join(root, USAGE_DIRNAME)
+    os.makedirs(usage_dirpath, exist_ok=True)
+    for dirname in dirnames:
+        filepath = os.path.join(usage_dirpath, dirname)
+        try:
+            os.close(os.open(
+                filepath, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666
+            ))
+        except FileExistsError:
+            pass
+        try:
+            os.utime(filepath, (last_used, last_used))
+        except OSError:
+            pass
+
+
+def _get_shared_last_used(root):
+    """Usage of directories recorded by all machines.
+
+    Args:
+        root (str): Folder with distributed directories.
+
+    Returns:
+        dict[str, float]: Last usage time by directory name.
+    """
+
+    usage_dirpath = os.path.join(root, USAGE_DIRNAME)
+    if not os.path.isdir(usage_dirpath):
+        return {}
+    output = {}
+    for dirname in os.listdir(usage_dirpath):
+        try:
+            output[dirname] = os.path.getmtime(
+                os.path.join(usage_dirpath, dirname)
+            )
+        except OSError:
+            pass
+    return output
+
+
+def _get_gc_lock(root):
+    return get_distribution_lock(os.path.join(root, GC_LOCK_NAME))
+
+
+def _get_hostname():
+    return "".join(
+        char if char.isalnum() else "-"
+        for char in socket.gethostname()
+    )
+
+
+def lease_directories(dirpaths):
+    """Protect directories from garbage collection until process ends.
+
+    Usage time of the directories is recorded for garbage collection.
+
+    Args:
+        dirpaths (Iterable[str]): Paths to distributed directories.
+
+    Returns:
+        float: Time when the lease was taken.
+    """
+
+    dirnames_by_root = {}
+    for dirpath in dirpaths:
+        dirpath = os.path.normpath(dirpath)
+        dirnames_by_root.setdefault(os.path.dirname(dirpath), []).append(
+            os.path.basename(dirpath)
+        )
+
+    now = time.time()
+    for root, dirnames in dirnames_by_root.items():
+        leases_dirpath = os.path.join(root, LEASES_DIRNAME)
+        os.makedirs(leases_dirpath, exist_ok=True)
+        basename = f"{_get_hostname()}_{os.getpid()}_{uuid.uuid4().hex}"
+        lease_lock = FileLock(
+            os.path.join(leases_dirpath, f"{basename}.lock")
+        )
+        with _get_gc_lock(root):
+            with open(
+                os.path.join(leases_dirpath, f"{basename}.json"), "w"
+            ) as stream:
+                json.dump(dirnames, stream)
+            lease_lock.acquire()
+
+        with _process_leases_lock:
+            _process_leases.append(lease_lock)
+        _get_state_store(root).set_last_used(dirnames, now)
+        if is_shared_storage_enabled():
+            _set_shared_last_used(root, dirnames, now)
+    return now
+
+
+def is_lease_recent(leased_time):
+    """Lease was taken recently enough to be renewed in background.
+
+    Lease is recent in first half of 'USAGE_GRACE_PERIOD', so the lease
+    is renewed before garbage collection could remove the directories.
+
+    Args:
+        leased_time (Union[float, None]): Time when the lease was taken.
+
+    Returns:
+        bool: Lease is recent.
+    """
+
+    if not leased_time:
+        return False
+    return 0 <= time.time() - leased_time < USAGE_GRACE_PERIOD / 2
+
+
+def lease_directories_in_background(dirpaths):
+    """Take lease of directories in background thread.
+
+    Should be used only for directories leased recently by other process,
+    see 'is_lease_recent'.
+
+    Args:
+        dirpaths (Iterable[str]): Paths to distributed directories.
+
+    Returns:
+        threading.Thread: Thread taking the lease.
+    """
+
+    def _lease():
+        try:
+            lease_directories(dirpaths)
+        except Exception:
+            log.warning("Failed to lease directories", exc_info=True)
+
+    thread = threading.Thread(
+        target=_lease,
+        name="ayon_lease_directories",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def defer_lease(dirpaths):
+    """Lease directories in background garbage collection.
+
+    Directories are leased before garbage collection of current process
+    runs, see 'schedule_garbage_collection'. Stored fingerprints of
+    distributed bundles are removed if any of the directories does not
+    exist, so next launch checks distributed items.
+
+    Args:
+        dirpaths (Iterable[str]): Paths to distributed directories.
+
+    Returns:
+        float: Time when the lease was deferred.
+    """
+
+    with _process_leases_lock:
+        _deferred_leases.append(list(dirpaths))
+    return time.time()
+
+
+def _take_deferred_leases():
+    with _process_leases_lock:
+        deferred_leases = list(_deferred_leases)
+        _deferred_leases.clear()
+
+    for dirpaths in deferred_leases:
+        try:
+            lease_directories(dirpaths)
+        except Exception:
+            log.warning("Failed to lease directories", exc_info=True)
+            continue
+
+        missing = [
+            dirpath
+            for dirpath in dirpaths
+            if not os.path.isdir(dirpath)
+        ]
+        if not missing:
+            continue
+        log.warning(
+            f"Distributed directories are missing: {', '.join(missing)}"
+        )
+        roots = {
+            os.path.dirname(os.path.normpath(dirpath))
+            for dirpath in dirpaths
+        }
+        for root in roots:
+            clear_fingerprints(root)
+
+
+def release_leases():
+    """Release all leases held by current process."""
+
+    with _process_leases_lock:
+        leases = list(_process_leases)
+        _process_leases.clear()
+
+    for lease_lock in leases:
+        lease_lock.release()
+        json_path = f"{os.path.splitext(lease_lock.filepath)[0]}.json"
+        for path in (json_path, lease_lock.filepath):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _get_leased_dirnames(root):
+    """Names of leased directories in a folder.
+
+    Leases of dead processes are removed. Must be called while garbage
+    collection lock of the folder is held.
+
+    Args:
+        root (str): Folder with distributed directories.
+
+    Returns:
+        set[str]: Names of leased directories.
+    """
+
+    leases_dirpath = os.path.join(root, LEASES_DIRNAME)
+    if not os.path.isdir(leases_dirpath):
+        return set()
+
+    hostname = _get_hostname()
+    output = set()
+    for filename in os.listdir(leases_dirpath):
+        basename, ext = os.path.splitext(filename)
+        if ext != ".json":
+            continue
+        json_path = os.path.join(leases_dirpath, filename)
+        lock_path = os.path.join(leases_dirpath, f"{basename}.lock")
+        is_foreign = (
+            is_shared_storage_enabled()
+            and basename.split("_", 1)[0] != hostname
+        )
+        if is_foreign:
+            try:
+                is_active = (
+                    time.time() - os.path.getmtime(json_path)
+                    < FOREIGN_LEASE_MAX_AGE
+                )
+            except OSError:
+                continue
+        else:
+            lease_lock = FileLock(lock_path)
+            is_active = not lease_lock.try_acquire()
+            lease_lock.release()
+
+        if not is_active:
+            for path in (json_path, lock_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            continue
+
+        try:
+            with open(json_path, "r") as stream:
+                output.update(json.load(stream))
+        except (ValueError, OSError, TypeError):
+            # Nothing can be removed safely without knowing the lease
+            raise RuntimeError(f"Failed to read lease {json_path}")
+    return output
+
+
+def _get_directory_size(dirpath):
+    size = 0
+    for root, _, filenames in os.walk(dirpath):
+        for filename in filenames:
+            try:
+                size += os.lstat(os.path.join(root, filename)).st_size
+            except OSError:
+                pass
+    return size
+
+
+def _remove_directory(root, dirname, fingerprint_dirpaths):
+    """Remove distributed directory if it is not used.
+
+    Args:
+        root (str): Folder with distributed directories.
+        dirname (str): Name of directory to remove.
+        fingerprint_dirpaths (Iterable[str]): Folders where fingerprints
+            of distributed bundles are stored.
+
+    Returns:
+        bool: Directory was removed.
+    """
+
+    dirpath = os.path.join(root, dirname)
+    dist_lock = get_distribution_lock(dirpath)
+    if not dist_lock.try_acquire():
+        return False
+
+    try:
+        gc_lock = _get_gc_lock(root)
+        gc_lock.acquire(get_lock_timeout())
+        try:
+            if dirname in _get_leased_dirnames(root):
+                return False
+            log.info(f"Removing unused distributed directory {dirpath}")
+            move_to_trash(dirpath, get_trash_dirpath(dirpath))
+            # Fingerprints could point to removed directory
+            for fingerprint_dirpath in fingerprint_dirpaths:
+                clear_fingerprints(fingerprint_dirpath)
+        finally:
+            gc_lock.release()
+    finally:
+        dist_lock.release()
+
+    _get_state_store(root).remove_distributed_directory(dirname)
+    try:
+        os.remove(os.path.join(root, USAGE_DIRNAME, dirname))
+    except OSError:
+        pass
+    return True
+
+
+def collect_garbage(roots=None, quota=None, grace_period=None):
+    """Remove least recently used distributed directories over quota.
+
+    Args:
+        roots (Optional[Iterable[str]]): Folders with distributed
+            directories. Addons and dependency packages directories are
+            used if not passed.
+        quota (Optional[int]): Maximum size in bytes. Output of
+            'get_distribution_quota' is used if not passed.
+        grace_period (Optional[float]): Directories used in last seconds
+            are not removed. 'USAGE_GRACE_PERIOD' is used if not passed.
+
+    Returns:
+        list[str]: Paths to removed directories.
+    """
+
+    if roots is None:
+        roots = (get_addons_dir(), get_dependencies_dir())
+    roots = [root for root in roots if os.path.isdir(root)]
+    if quota is None:
+        quota = get_distribution_quota()
+    if grace_period is None:
+        grace_period = USAGE_GRACE_PERIOD
+    used_after = time.time() - grace_period
+
+    candidates = []
+    total_size = 0
+    for root in roots:
+        store = _get_state_store(root)
+        usage = store.get_directory_usage()
+        shared_last_used = {}
+        if is_shared_storage_enabled():
+            shared_last_used = _get_shared_last_used(root)
+        for dirname in os.listdir(root):
+            dirpath = os.path.join(root, dirname)
+            if (
+                dirname.startswith(".")
+                or not os.path.isdir(dirpath)
+                or os.path.islink(dirpath)
+            ):
+                continue
+
+            dir_usage = usage.get(dirname) or {}
+            size = dir_usage.get("size")
+            if size is None:
+                size = _get_directory_size(dirpath)
+                store.set_directory_size(dirname, size)
+
+            last_used = max(
+                dir_usage.get("last_used") or 0,
+                shared_last_used.get(dirname) or 0,
+            )
+            if not last_used:
+                last_used = os.path.getmtime(dirpath)
+            candidates.append((last_used, root, dirname, size))
+            total_size += size
+
+    removed = []
+    candidates.sort()
+    for last_used, root, dirname, size in candidates:
+        if total_size <= quota or last_used > used_after:
+            break
+        if _remove_directory(root, dirname, roots):
+            removed.append(os.path.join(root, dirname))
+            total_size -= size
+    return removed
+
+
+def _run_garbage_collection(roots, quota):
+    _take_deferred_leases()
+    if not quota:
+        return
+
+    store = _get_state_store(roots[0])
+    with store.transaction() as conn:
+        last_gc = store.read_value(conn, LAST_GC_KEY)
+        if last_gc is not None and time.time() - last_gc < GC_INTERVAL:
+            return
+        store.write_value(conn, LAST_GC_KEY, time.time())
+
+    try:
+        collect_garbage(roots, quota)
+    except Exception:
+        log.warning("Garbage collection failed", exc_info=True)
+
+    try:
+        ChunkStore().prune(USAGE_GRACE_PERIOD)
+    except Exception:
+        log.warning("Pruning of chunk store failed", exc_info=True)
+
+
+def schedule_garbage_collection(roots=None):
+    """Run garbage collection in background thread.
+
+    Garbage collection is skipped if it did run recently or if it
+    is disabled. Deferred leases are taken before garbage collection,
+    see 'defer_lease'.
+
+    Args:
+        roots (Optional[Iterable[str]]): Folders with distributed
+            directories. Addons and dependency packages directories are
+            used if not passed.
+
+    Returns:
+        Union[threading.Thread, None]: Thread running garbage collection.
+    """
+
+    quota = get_distribution_quota()
+    with _process_leases_lock:
+        has_deferred_leases = bool(_deferred_leases)
+    if not quota and not has_deferred_leases:
+        return None
+
+    if roots is None:
+        roots = (get_addons_dir(), get_dependencies_dir())
+    thread = threading.Thread(
+        target=_run_garbage_collection,
+        args=(list(roots), quota),
+        name="ayon_garbage_collection",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,481 @@
+"""Cross-process locks of distribution items.
+
+Multiple launcher processes can be started at the same moment with the
+same bundle (e.g. on render nodes). Distribution of an item is guarded by
+advisory lock file, so only one process distributes the item. Other
+processes wait for the lock and use the result.
+
+Locks are kept in '.locks' folder next to distributed directories. Lock is
+held by an open file handle, so operating system releases it when process
+dies and lock can't become stale.
+
+Distributed directory contains completion marker with checksum of source
+archive. The marker is written before the directory is published, so
+directory with marker is complete.
+
+Timeout of waiting for a lock can be changed with
+'AYON_DISTRIBUTION_LOCK_TIMEOUT' environment variable (in seconds).
+
+Advisory locks are not reliable across machines on network filesystems.
+When launcher storage is shared by multiple machines
+('AYON_SHARED_STORAGE' set to '1') owner of an item is elected by
+exclusive creation of owner file. Owner keeps modification time of
+the file up to date, owner file that was not updated for
+'AYON_SHARED_LOCK_STALE_TIMEOUT' seconds is considered as abandoned and
+is removed by other process. Modification time is compared only with its
+previous value, so clocks of machines don't have to be synchronized.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import logging
+import threading
+
+if os.name == "nt":
+    import msvcrt
+
+    fcntl = None
+else:
+    import fcntl
+
+    msvcrt = None
+
+LOCKS_DIRNAME = ".locks"
+COMPLETION_MARKER_FILENAME = ".ayon_distributed.json"
+DEFAULT_LOCK_TIMEOUT = 60 * 60
+DEFAULT_STALE_TIMEOUT = 120
+LOCK_POLL_INTERVAL = 0.2
+
+
+class LockTimeoutError(Exception):
+    """Lock was not acquired in time."""
+    pass
+
+
+def get_lock_timeout():
+    """Timeout of waiting for distribution lock.
+
+    Returns:
+        float: Timeout in seconds.
+    """
+
+    value = os.getenv("AYON_DISTRIBUTION_LOCK_TIMEOUT")
+    if not value:
+        return DEFAULT_LOCK_TIMEOUT
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        return DEFAULT_LOCK_TIMEOUT
+
+
+def is_shared_storage_enabled():
+    """Launcher storage is shared by multiple machines.
+
+    Returns:
+        bool: Shared storage mode is enabled.
+    """
+
+    return os.getenv("AYON_SHARED_STORAGE") == "1"
+
+
+def get_stale_timeout():
+    """Time after which is owner file without heartbeat abandoned.
+
+    Returns:
+        float: Timeout in seconds.
+    """
+
+    value = os.getenv("AYON_SHARED_LOCK_STALE_TIMEOUT")
+    if not value:
+        return DEFAULT_STALE_TIMEOUT
+    try:
+        return max(float(value), 1)
+    except ValueError:
+        return DEFAULT_STALE_TIMEOUT
+
+
+def get_lock_filepath(dirpath, ext=".lock"):
+    """Path to lock file guarding a directory.
+
+    Args:
+        dirpath (str): Path to guarded directory.
+        ext (Optional[str]): Extension of lock file.
+
+    Returns:
+        str: Path to lock file.
+    """
+
+    dirpath = os.path.normpath(dirpath)
+    return os.path.join(
+        os.path.dirname(dirpath),
+        LOCKS_DIRNAME,
+        f"{os.path.basename(dirpath)}{ext}"
+    )
+
+
+def get_distribution_lock(dirpath):
+    """Lock guarding distribution to a directory.
+
+    Args:
+        dirpath (str): Path to guarded directory.
+
+    Returns:
+        Union[FileLock, OwnerLock]: Owner lock if shared storage mode
+            is enabled, file lock otherwise.
+    """
+
+    if is_shared_storage_enabled():
+        return OwnerLock(get_lock_filepath(dirpath, ".owner"))
+    return FileLock(get_lock_filepath(dirpath))
+
+
+def _try_lock_fd(fd):
+    try:
+        if msvcrt is not None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock_fd(fd):
+    if msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class FileLock:
+    """Exclusive advisory lock of a lock file.
+
+    Lock is exclusive between processes and between objects in the same
+    process. Lock is not reentrant.
+
+    Args:
+        filepath (str): Path to lock file.
+    """
+
+    def __init__(self, filepath):
+        self._filepath = filepath
+        self._fd = None
+        self._lock = threading.Lock()
+
+    @property
+    def filepath(self):
+        return self._filepath
+
+    @property
+    def locked(self):
+        return self._fd is not None
+
+    def try_acquire(self):
+        """Try to acquire the lock without waiting.
+
+        Returns:
+            bool: Lock was acquired.
+        """
+
+        with self._lock:
+            if self._fd is not None:
+                raise RuntimeError(f"Lock '{self._filepath}' is already held")
+            os.makedirs(os.path.dirname(self._filepath), exist_ok=True)
+            fd = os.open(self._filepath, os.O_RDWR | os.O_CREAT, 0o666)
+            if not _try_lock_fd(fd):
+                os.close(fd)
+                return False
+            self._fd = fd
+            return True
+
+    def acquire(self, timeout=None):
+        """Acquire the lock.
+
+        Args:
+            timeout (Optional[float]): Timeout in seconds. Wait without
+                timeout if not passed.
+
+        Raises:
+            LockTimeoutError: Lock was not acquired in time.
+        """
+
+        start = time.time()
+        while not self.try_acquire():
+            if timeout is not None and time.time() - start > timeout:
+                raise LockTimeoutError(
+                    f"Lock '{self._filepath}' was not acquired"
+                    f" in {timeout} seconds"
+                )
+            time.sleep(LOCK_POLL_INTERVAL)
+
+    def release(self):
+        """Release the lock.
+
+        Lock file is kept, removing it could break lock of a process
+        which already opened the file.
+        """
+
+        with self._lock:
+            fd = self._fd
+            if fd is None:
+                return
+            self._fd = None
+            try:
+                _unlock_fd(fd)
+            finally:
+                os.close(fd)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.release()
+
+
+class _HeartbeatThread(threading.Thread):
+    def __init__(self, owner_lock, interval):
+        super().__init__(name="ayon_lock_heartbeat", daemon=True)
+        self._owner_lock = owner_lock
+        self._interval = interval
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.wait(self._interval):
+            self._owner_lock.heartbeat()
+
+
+class OwnerLock:
+    """Lock of a directory on storage shared by multiple machines.
+
+    Lock is held by existence of owner file created with exclusive flag.
+    Modification time of the file is updated by heartbeat thread while
+    the lock is held.
+
+    Args:
+        filepath (str): Path to owner file.
+        stale_timeout (Optional[float]): Time in seconds after which is
+            owner file without heartbeat removed. Output of
+            'get_stale_timeout' is used if not passed.
+    """
+
+    log = logging.getLogger("OwnerLock")
+
+    def __init__(self, filepath, stale_timeout=None):
+        if stale_timeout is None:
+            stale_timeout = get_stale_timeout()
+        self._filepath = filepath
+        self._stale_timeout = stale_timeout
+        self._owner_id = None
+        self._heartbeat_thread = None
+        self._lock = threading.Lock()
+        # Last seen modification time of owner file of other process
+        self._observed = None
+
+    @property
+    def filepath(self):
+        return self._filepath
+
+    @property
+    def locked(self):
+        return self._owner_id is not None
+
+    def _create_owner_file(self, owner_id):
+        try:
+            fd = os.open(
+                self._filepath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666
+            )
+        except FileExistsError:
+            return False
+
+        with os.fdopen(fd, "w") as stream:
+            json.dump({
+                "id": owner_id,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+                "created": time.time(),
+            }, stream)
+        return True
+
+    def _read_owner_id(self):
+        try:
+            with open(self._filepath, "r") as stream:
+                return json.load(stream).get("id")
+        except (ValueError, OSError, AttributeError):
+            return None
+
+    def _remove_if_stale(self):
+        """Remove owner file of other process if it is abandoned.
+
+        Returns:
+            bool: Owner file was removed or does not exist anymore.
+        """
+
+        try:
+            mtime = os.stat(self._filepath).st_mtime
+        except FileNotFoundError:
+            return True
+
+        now = time.monotonic()
+        if self._observed is None or self._observed[0] != mtime:
+            self._observed = (mtime, now)
+            return False
+
+        if now - self._observed[1] < self._stale_timeout:
+            return False
+
+        self._observed = None
+        # Rename is atomic, only one process can remove the owner file
+        stale_path = f"{self._filepath}.{uuid.uuid4().hex}.stale"
+        try:
+            os.rename(self._filepath, stale_path)
+        except OSError:
+            return False
+        self.log.warning(f"Removing abandoned owner file {self._filepath}")
+        try:
+            os.remove(stale_path)
+        except OSError:
+            pass
+        return True
+
+    def try_acquire(self):
+        """Try to acquire the lock without waiting.
+
+        Returns:
+            bool: Lock was acquired.
+        """
+
+        with self._lock:
+            if self._owner_id is not None:
+                raise RuntimeError(f"Lock '{self._filepath}' is already held")
+            os.makedirs(os.path.dirname(self._filepath), exist_ok=True)
+            owner_id = uuid.uuid4().hex
+            if not self._create_owner_file(owner_id):
+                if not self._remove_if_stale():
+                    return False
+                if not self._create_owner_file(owner_id):
+                    return False
+
+            self._owner_id = owner_id
+            self._observed = None
+            thread = _HeartbeatThread(
+                self, max(self._stale_timeout / 4, LOCK_POLL_INTERVAL)
+            )
+            self._heartbeat_thread = thread
+            thread.start()
+            return True
+
+    def acquire(self, timeout=None):
+        """Acquire the lock.
+
+        Args:
+            timeout (Optional[float]): Timeout in seconds. Wait without
+                timeout if not passed.
+
+        Raises:
+            LockTimeoutError: Lock was not acquired in time.
+        """
+
+        start = time.time()
+        while not self.try_acquire():
+            if timeout is not None and time.time() - start > timeout:
+                raise LockTimeoutError(
+                    f"Lock '{self._filepath}' was not acquired"
+                    f" in {timeout} seconds"
+                )
+            time.sleep(LOCK_POLL_INTERVAL)
+
+    def heartbeat(self):
+        """Update modification time of owned owner file."""
+
+        if self._owner_id is None:
+            return
+        try:
+            os.utime(self._filepath, None)
+        except OSError:
+            self.log.warning(
+                f"Failed to update owner file {self._filepath}",
+                exc_info=True
+            )
+
+    def release(self):
+        """Release the lock.
+
+        Owner file is removed only if it is still owned by this object.
+        """
+
+        with self._lock:
+            owner_id = self._owner_id
+            if owner_id is None:
+                return
+            self._owner_id = None
+            thread = self._heartbeat_thread
+            self._heartbeat_thread = None
+
+        thread.stop()
+        thread.join()
+        if self._read_owner_id() != owner_id:
+            self.log.warning(
+                f"Owner file {self._filepath} was taken by other process"
+            )
+            return
+        try:
+            os.remove(self._filepath)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.release()
+
+
+def get_completion_marker_filepath(dirpath):
+    return os.path.join(dirpath, COMPLETION_MARKER_FILENAME)
+
+
+def write_completion_marker(dirpath, data):
+    """Mark directory as completely distributed.
+
+    Args:
+        dirpath (str): Path to distributed directory.
+        data (dict[str, Any]): Information about distribution.
+    """
+
+    filepath = get_completion_marker_filepath(dirpath)
+    tmp_filepath = f"{filepath}.tmp"
+    with open(tmp_filepath, "w") as stream:
+        json.dump(data, stream)
+    os.replace(tmp_filepath, filepath)
+
+
+def read_completion_marker(dirpath):
+    """Read completion marker of distributed directory.
+
+    Args:
+        dirpath (str): Path to distributed directory.
+
+    Returns:
+        Union[dict[str, Any], None]: Marker data or None if directory
+            does not have valid marker.
+    """
+
+    filepath = get_completion_marker_filepath(dirpath)
+    try:
+        with open(filepath, "r") as stream:
+            data = json.load(stream)
+    except (ValueError, OSError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return data
@@ -0,0 +1,341 @@
+"""Per-file manifest of extracted archives.
+
+Manifest is stored in extracted directory and contains size and CRC32
+of each file in the archive. Both values are available in central
+directory of zip archive, so manifest of a new archive can be created
+without extracting it.
+
+When an addon is updated, files which did not change since previously
+installed version are copied from the previous directory and only
+changed files are extracted from the new archive. Copy-on-write clones
+are used where filesystem supports them, so unchanged content is not
+duplicated on disk.
+
+Incremental extraction can be disabled with 'AYON_INCREMENTAL_UPDATES'
+environment variable set to '0'.
+
+Manifest is used to verify that distributed content was not damaged
+(e.g. partially removed or changed by antivirus), addons don't have
+checksum of their archive available so manifest is the only way how to
+validate them. Content which was not extracted from zip archive (e.g.
+tar archives or streamed extraction) does not have manifest, because
+tar archives don't contain checksums of files and extracted content
+would have to be read again.
+"""
+
+import os
+import json
+import zlib
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+if os.name == "nt":
+    fcntl = None
+else:
+    import fcntl
+
+from ayon_common.utils import ZipFileLongPaths
+
+MANIFEST_FILENAME = ".ayon_manifest.json"
+MANIFEST_VERSION = 1
+# Linux ioctl creating copy-on-write clone of a file
+FICLONE = 0x40049409
+
+
+def is_incremental_update_enabled():
+    """Incremental extraction of archives is enabled.
+
+    Returns:
+        bool: Incremental extraction is enabled.
+    """
+
+    return os.getenv("AYON_INCREMENTAL_UPDATES") != "0"
+
+
+def get_manifest_filepath(dirpath):
+    return os.path.join(dirpath, MANIFEST_FILENAME)
+
+
+def create_zip_manifest(zip_filepath):
+    """Create manifest of zip archive.
+
+    Args:
+        zip_filepath (str): Path to zip archive.
+
+    Returns:
+        dict[str, Any]: Manifest data.
+    """
+
+    files = {}
+    with zipfile.ZipFile(zip_filepath) as zip_file:
+        for member in zip_file.infolist():
+            if member.is_dir():
+                continue
+            files[member.filename] = {
+                "size": member.file_size,
+                "crc32": member.CRC,
+            }
+    return {"version": MANIFEST_VERSION, "files": files}
+
+
+def get_file_crc32(filepath, chunk_size=1024 * 1024):
+    """Calculate CRC32 of file content.
+
+    Args:
+        filepath (str): Path to file.
+        chunk_size (Optional[int]): Size of chunks read from file.
+
+    Returns:
+        int: CRC32 of file content.
+    """
+
+    crc = 0
+    with open(filepath, "rb") as stream:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def read_manifest(dirpath):
+    """Read manifest of extracted directory.
+
+    Args:
+        dirpath (str): Path to extracted directory.
+
+    Returns:
+        Union[dict[str, Any], None]: Manifest data or None if directory
+            does not have valid manifest.
+    """
+
+    filepath = get_manifest_filepath(dirpath)
+    if not os.path.isfile(filepath):
+        return None
+    try:
+        with open(filepath, "r") as stream:
+            data = json.load(stream)
+    except (ValueError, OSError):
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != MANIFEST_VERSION
+        or not isinstance(data.get("files"), dict)
+    ):
+        return None
+    return data
+
+
+def write_manifest(dirpath, manifest):
+    """Store manifest to extracted directory.
+
+    Args:
+        dirpath (str): Path to extracted directory.
+        manifest (dict[str, Any]): Manifest data.
+    """
+
+    with open(get_manifest_filepath(dirpath), "w") as stream:
+        json.dump(manifest, stream)
+
+
+def _get_member_relpath(member_name):
+    """Relative path of zip member if it is safe to link.
+
+    Args:
+        member_name (str): Name of zip member.
+
+    Returns:
+        Union[str, None]: Relative path or None if name contains parts
+            that zipfile would sanitize.
+    """
+
+    parts = member_name.split("/")
+    for part in parts:
+        if part in ("", os.path.curdir, os.path.pardir) or ":" in part:
+            return None
+        if "\\" in part:
+            return None
+    return os.path.join(*parts)
+
+
+def _clone_file(src_stream, dst_stream):
+    """Create copy-on-write clone of file content.
+
+    Args:
+        src_stream (io.BufferedReader): Opened source file.
+        dst_stream (io.BufferedWriter): Opened destination file.
+
+    Returns:
+        bool: Content was cloned.
+    """
+
+    if fcntl is None or not hasattr(fcntl, "ioctl"):
+        return False
+    try:
+        fcntl.ioctl(dst_stream.fileno(), FICLONE, src_stream.fileno())
+    except OSError:
+        # Filesystem does not support clones (or different volume)
+        return False
+    return True
+
+
+def _reuse_file(src_path, dst_path, size, crc32, chunk_size=1024 * 1024):
+    """Copy unchanged file of previous version.
+
+    Content of source file is validated against size and CRC32 from
+    the archive. Files are never hardlinked, so a change of one version
+    can't change the other.
+
+    Args:
+        src_path (str): Path to file of previous version.
+        dst_path (str): Destination path.
+        size (int): Expected size of file.
+        crc32 (int): Expected CRC32 of file.
+        chunk_size (Optional[int]): Size of chunks read from file.
+
+    Returns:
+        bool: File was reused, destination file does not exist otherwise.
+    """
+
+    dirpath = os.path.dirname(dst_path)
+    if not os.path.isdir(dirpath):
+        os.makedirs(dirpath, exist_ok=True)
+
+    crc = 0
+    copied = 0
+    try:
+        with open(src_path, "rb") as src_stream:
+            if os.fstat(src_stream.fileno()).st_size != size:
+                return False
+            with open(dst_path, "wb") as dst_stream:
+                cloned = _clone_file(src_stream, dst_stream)
+                while True:
+                    chunk = src_stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    crc = zlib.crc32(chunk, crc)
+                    copied += len(chunk)
+                    if not cloned:
+                        dst_stream.write(chunk)
+
+        if copied == size and crc == crc32:
+            shutil.copystat(src_path, dst_path)
+            return True
+    except OSError:
+        pass
+
+    if os.path.exists(dst_path):
+        os.remove(dst_path)
+    return False
+
+
+def extract_zip_incremental(
+    zip_filepath, dst_dirpath, previous_dirpath, previous_manifest
+):
+    """Extract zip archive and reuse unchanged files of previous version.
+
+    File is reused if it has same path, size and CRC32 in previous
+    manifest and file in previous directory still has the same size
+    and CRC32. Reused files are cloned where filesystem supports
+    copy-on-write, copied otherwise.
+
+    Args:
+        zip_filepath (str): Path to zip archive.
+        dst_dirpath (str): Directory where content is extracted.
+        previous_dirpath (str): Directory with previous version.
+        previous_manifest (dict[str, Any]): Manifest of previous version.
+
+    Returns:
+        dict[str, int]: Number of 'reused' and 'extracted' files.
+    """
+
+    previous_files = previous_manifest["files"]
+    reused = 0
+    extracted = 0
+    with ZipFileLongPaths(zip_filepath) as zip_file:
+        for member in zip_file.infolist():
+            if member.is_dir():
+                zip_file.extract(member, dst_dirpath)
+                continue
+
+            relpath = _get_member_relpath(member.filename)
+            previous = previous_files.get(member.filename)
+            if (
+                relpath is not None
+                and previous
+                and previous.get("size") == member.file_size
+                and previous.get("crc32") == member.CRC
+                and _reuse_file(
+                    os.path.join(previous_dirpath, relpath),
+                    os.path.join(dst_dirpath, relpath),
+                    member.file_size,
+                    member.CRC,
+                )
+            ):
+                reused += 1
+                continue
+
+            zip_file.extract(member, dst_dirpath)
+            extracted += 1
+
+    return {"reused": reused, "extracted": extracted}
+
+
+def _is_file_valid(filepath, size, crc32):
+    try:
+        if os.path.getsize(filepath) != size:
+            return False
+        return get_file_crc32(filepath) == crc32
+    except OSError:
+        return False
+
+
+def get_damaged_files(dirpaths_with_manifests, max_workers=None):
+    """Find files that don't match manifest of their directory.
+
+    Files of all directories are checked in parallel. Files with names
+    that can't be safely mapped to a path are skipped.
+
+    Args:
+        dirpaths_with_manifests (list[tuple[str, dict[str, Any]]]): Paths
+            to directories with their manifests.
+        max_workers (Optional[int]): Maximum number of threads. Number of
+            CPUs is used if not passed.
+
+    Returns:
+        list[list[str]]: Names of missing or changed files for each
+            directory.
+    """
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    output = []
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="ayon_verify"
+    ) as executor:
+        futures_by_dirpath = []
+        for dirpath, manifest in dirpaths_with_manifests:
+            futures = []
+            for member_name, file_info in manifest["files"].items():
+                relpath = _get_member_relpath(member_name)
+                if relpath is None:
+                    continue
+                futures.append((member_name, executor.submit(
+                    _is_file_valid,
+                    os.path.join(dirpath, relpath),
+                    file_info.get("size"),
+                    file_info.get("crc32"),
+                )))
+            futures_by_dirpath.append(futures)
+
+        for futures in futures_by_dirpath:
+            output.append([
+                member_name
+                for member_name, future in futures
+                if not future.result()
+            ])
+    return output
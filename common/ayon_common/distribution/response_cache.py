@@ -0,0 +1,233 @@
+"""Persistent cache of server responses used on bootstrap.
+
+Responses of bootstrap endpoints (bundles, addons, dependency packages,
+installers) are stored with their validators ('ETag' and
+'Last-Modified' headers) to launcher local directory. Next request sends
+the validators in 'If-None-Match' and 'If-Modified-Since' headers and
+server can answer with '304 Not Modified' without sending the payload,
+which is then loaded from disk.
+
+Cached responses are stored by server url and name of user, so responses
+are never shared between users or servers and are still used after access
+token of the user changed. Responses without validators are not cached.
+Responses which were not used for 'RESPONSE_CACHE_MAX_AGE' seconds are
+removed.
+
+Cache can be disabled with 'AYON_RESPONSE_CACHE' environment variable
+set to '0'.
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+
+import ayon_api
+
+from ayon_common.utils import get_launcher_local_dir
+
+RESPONSE_CACHE_DIRNAME = "response_cache"
+RESPONSE_CACHE_VERSION = 2
+RESPONSE_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def is_response_cache_enabled():
+    """Cache of server responses is enabled.
+
+    Returns:
+        bool: Cache is enabled.
+    """
+
+    return os.getenv("AYON_RESPONSE_CACHE") != "0"
+
+
+class ResponseCache:
+    """Cache of server responses revalidated with conditional requests.
+
+    Args:
+        root (Optional[str]): Cache root directory. Directory in launcher
+            local directory is used if not passed.
+        logger (Optional[logging.Logger]): Logger object.
+    """
+
+    def __init__(self, root=None, logger=None):
+        if logger is None:
+            logger = logging.getLogger(self.__class__.__name__)
+        self.log = logger
+        self._root = root
+        # User names by server url and access token, kept only in memory
+        self._usernames = {}
+        self._usernames_lock = threading.Lock()
+        self._pruned = False
+
+    @property
+    def root(self):
+        if self._root is None:
+            self._root = get_launcher_local_dir(RESPONSE_CACHE_DIRNAME)
+        return self._root
+
+    def get_filepath(self, server_url, username, endpoint):
+        """Path to cached response.
+
+        Args:
+            server_url (str): Server url.
+            username (str): Name of user.
+            endpoint (str): Requested endpoint.
+
+        Returns:
+            str: Path to cached response file.
+        """
+
+        content = json.dumps([server_url.rstrip("/"), username, endpoint])
+        key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, f"{key}.json")
+
+    def _get_username(self, con):
+        """Name of user of the connection.
+
+        Args:
+            con (ayon_api.ServerAPI): Server connection.
+
+        Returns:
+            Union[str, None]: Name of user or None if user is not known.
+        """
+
+        key = (con.get_base_url(), con.access_token)
+        with self._usernames_lock:
+            if key not in self._usernames:
+                username = None
+                response = con.get("users/me")
+                if response.status_code == 200:
+                    username = response.data.get("name")
+                self._usernames[key] = username
+            return self._usernames[key]
+
+    def prune(self, max_age=RESPONSE_CACHE_MAX_AGE):
+        """Remove responses that were not used for a long time.
+
+        Args:
+            max_age (Optional[float]): Maximum age in seconds.
+        """
+
+        try:
+            filenames = os.listdir(self.root)
+        except OSError:
+            return
+
+        now = time.time()
+        for filename in filenames:
+            filepath = os.path.join(self.root, filename)
+            try:
+                if now - os.path.getmtime(filepath) > max_age:
+                    os.remove(filepath)
+            except OSError:
+                pass
+
+    def _remove(self, filepath):
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
+
+    def _read(self, filepath, endpoint):
+        try:
+            with open(filepath, "r") as stream:
+                cached = json.load(stream)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            not isinstance(cached, dict)
+            or cached.get("version") != RESPONSE_CACHE_VERSION
+            or cached.get("endpoint") != endpoint
+            or "data" not in cached
+        ):
+            return None
+        return cached
+
+    def _write(self, filepath, endpoint, etag, last_modified, data):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_filepath = f"{filepath}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_filepath, "w") as stream:
+                json.dump({
+                    "version": RESPONSE_CACHE_VERSION,
+                    "endpoint": endpoint,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "data": data,
+                }, stream)
+            os.replace(tmp_filepath, filepath)
+        except OSError:
+            self.log.warning(
+                f"Failed to store cached response of '{endpoint}'",
+                exc_info=True
+            )
+            self._remove(tmp_filepath)
+
+    def get(self, endpoint, con=None):
+        """Data of GET request to server.
+
+        Cached data are used if server responds that they were not
+        modified.
+
+        Args:
+            endpoint (str): Endpoint to request.
+            con (Optional[ayon_api.ServerAPI]): Server connection. Global
+                connection is used if not passed.
+
+        Returns:
+            Any: Response data.
+
+        Raises:
+            ayon_api.exceptions.HTTPRequestError: When request failed.
+        """
+
+        if con is None:
+            con = ayon_api.get_server_api_connection()
+
+        username = self._get_username(con)
+        if not username:
+            response = con.raw_get(endpoint, headers=con.get_headers())
+            response.raise_for_status()
+            return response.data
+
+        if not self._pruned:
+            self._pruned = True
+            self.prune()
+
+        filepath = self.get_filepath(con.get_base_url(), username, endpoint)
+        cached = self._read(filepath, endpoint)
+        headers = con.get_headers()
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = con.raw_get(endpoint, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            self.log.debug(f"Using cached response of '{endpoint}'")
+            # Mark as recently used
+            try:
+                os.utime(filepath, None)
+            except OSError:
+                pass
+            return cached["data"]
+
+        if response.status_code == 304:
+            # Cached response was removed meanwhile
+            response = con.raw_get(endpoint, headers=con.get_headers())
+        response.raise_for_status()
+
+        data = response.data
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._write(filepath, endpoint, etag, last_modified, data)
+        elif cached is not None:
+            self._remove(filepath)
+        return data
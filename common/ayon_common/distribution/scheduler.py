@@ -0,0 +1,280 @@
+"""Scheduler distributing multiple distribution items at once.
+
+Distribution of an item is split into two stages. Download stage receives
+source file (download, copy, hash check) and process stage handles
+the received file (e.g. extraction). Each stage has own bounded pool of
+workers, so next item can be downloaded while previous item is extracted.
+
+Number of workers can be changed with environment variables:
+    - AYON_DISTRIBUTION_DOWNLOAD_WORKERS - workers of download stage
+    - AYON_DISTRIBUTION_PROCESS_WORKERS - workers of process stage
+    - AYON_DISTRIBUTION_HOST_CONCURRENCY - maximum of concurrent
+        connections to single host, segments of segmented downloads
+        are included
+"""
+
+import os
+import logging
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+from .data_structures import UrlType
+from .file_handler import connection_budget
+
+DEFAULT_HOST_CONCURRENCY = 4
+MAX_DOWNLOAD_WORKERS = 16
+
+
+def get_available_cpu_count():
+    """Number of CPUs available for current process.
+
+    CPU affinity is respected where platform supports it.
+
+    Returns:
+        int: Number of available CPUs.
+    """
+
+    if hasattr(os, "sched_getaffinity"):
+        try:
+            return max(len(os.sched_getaffinity(0)), 1)
+        except OSError:
+            pass
+    return os.cpu_count() or 1
+
+
+def _get_env_int(env_key, default):
+    value = os.getenv(env_key)
+    if not value:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        return default
+    return max(value, 1)
+
+
+def get_source_host(source):
+    """Host from which is source received.
+
+    Args:
+        source (SourceInfo): Source information.
+
+    Returns:
+        Union[str, None]: Host identifier or None if source is not received
+            from a remote host.
+    """
+
+    if source.type in (UrlType.HTTP.value, UrlType.CHUNKED.value):
+        return urlparse(source.url).netloc or None
+
+    if source.type == UrlType.SERVER.value:
+        return os.getenv("AYON_SERVER_URL") or UrlType.SERVER.value
+    return None
+
+
+class _ItemState:
+    def __init__(self, item):
+        self.item = item
+        self.source_index = 0
+        self.sources_started = False
+
+
+class DistributionScheduler:
+    """Distribute multiple distribution items in bounded pipelined pools.
+
+    Items are started from the largest to the smallest, so the biggest
+    item (usually dependency package) does not become the tail of
+    the distribution.
+
+    Args:
+        download_workers (Optional[int]): Number of workers downloading
+            sources.
+        process_workers (Optional[int]): Number of workers processing
+            received sources.
+        host_concurrency (Optional[int]): Maximum of concurrent
+            connections to single host.
+        logger (Optional[logging.Logger]): Logger object.
+    """
+
+    def __init__(
+        self,
+        download_workers=None,
+        process_workers=None,
+        host_concurrency=None,
+        logger=None,
+    ):
+        cpu_count = get_available_cpu_count()
+        if download_workers is None:
+            download_workers = _get_env_int(
+                "AYON_DISTRIBUTION_DOWNLOAD_WORKERS",
+                min(cpu_count * 2, MAX_DOWNLOAD_WORKERS)
+            )
+        if process_workers is None:
+            process_workers = _get_env_int(
+                "AYON_DISTRIBUTION_PROCESS_WORKERS", cpu_count
+            )
+        if host_concurrency is None:
+            host_concurrency = _get_env_int(
+                "AYON_DISTRIBUTION_HOST_CONCURRENCY",
+                DEFAULT_HOST_CONCURRENCY
+            )
+        if logger is None:
+            logger = logging.getLogger(self.__class__.__name__)
+
+        self.log = logger
+        self._download_workers = download_workers
+        self._process_workers = process_workers
+        self._host_concurrency = host_concurrency
+
+        self._host_semaphores = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._done_event = threading.Event()
+        self._download_pool = None
+        self._process_pool = None
+        self._item_finished_callback = None
+
+    @staticmethod
+    def sort_items(items):
+        """Sort items from the largest to the smallest.
+
+        Items without known size keep their order after sized items.
+
+        Args:
+            items (Iterable[BaseDistributionItem]): Items to sort.
+
+        Returns:
+            list[BaseDistributionItem]: Sorted items.
+        """
+
+        return sorted(
+            items,
+            key=lambda item: item.size or 0,
+            reverse=True
+        )
+
+    def distribute(self, items, item_finished_callback=None):
+        """Distribute items and wait until all of them are finished.
+
+        Args:
+            items (Iterable[BaseDistributionItem]): Items to distribute.
+            item_finished_callback (Optional[Callable[
+                [BaseDistributionItem], None]]): Called from worker thread
+                when distribution of an item finished.
+        """
+
+        states = [
+            _ItemState(item)
+            for item in self.sort_items(items)
+            if item.start_distribution()
+        ]
+        if not states:
+            return
+
+        self._item_finished_callback = item_finished_callback
+        self._pending = len(states)
+        self._done_event.clear()
+        with ThreadPoolExecutor(
+            self._download_workers,
+            thread_name_prefix="ayon_dist_download"
+        ) as download_pool, ThreadPoolExecutor(
+            self._process_workers,
+            thread_name_prefix="ayon_dist_process"
+        ) as process_pool:
+            self._download_pool = download_pool
+            self._process_pool = process_pool
+            for state in states:
+                download_pool.submit(self._start_item, state)
+            self._done_event.wait()
+
+        self._download_pool = None
+        self._process_pool = None
+        self._item_finished_callback = None
+
+    def _get_host_semaphore(self, host):
+        if host is None:
+            return None
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(
+                    self._host_concurrency
+                )
+                self._host_semaphores[host] = semaphore
+        return semaphore
+
+    def _start_item(self, state):
+        item = state.item
+        try:
+            if not item.can_process_sources():
+                self._finish_item(state)
+                return
+        except Exception as exc:
+            item.set_distribution_failed(exc)
+            self._finish_item(state)
+            return
+        state.sources_started = True
+        self._download_item(state)
+
+    def _download_item(self, state):
+        item = state.item
+        try:
+            while state.source_index < len(item.sources):
+                source, source_progress = item.sources[state.source_index]
+                semaphore = self._get_host_semaphore(
+                    get_source_host(source)
+                )
+                if semaphore is None:
+                    received = item.receive_source(source, source_progress)
+                else:
+                    with semaphore, connection_budget(semaphore):
+                        received = item.receive_source(
+                            source, source_progress
+                        )
+
+                if received is not None:
+                    self._process_pool.submit(
+                        self._process_item, state, received
+                    )
+                    return
+                state.source_index += 1
+
+        except Exception as exc:
+            state.sources_started = False
+            item.set_distribution_failed(exc)
+        self._finish_item(state)
+
+    def _process_item(self, state, received):
+        item = state.item
+        try:
+            _, source_progress = item.sources[state.source_index]
+            if not item.process_received_source(received, source_progress):
+                state.source_index += 1
+                if state.source_index < len(item.sources):
+                    self._download_pool.submit(self._download_item, state)
+                    return
+
+        except Exception as exc:
+            state.sources_started = False
+            item.set_distribution_failed(exc)
+        self._finish_item(state)
+
+    def _finish_item(self, state):
+        item = state.item
+        try:
+            if state.sources_started:
+                item.finish_sources()
+            item.end_distribution()
+            if self._item_finished_callback is not None:
+                self._item_finished_callback(item)
+        except Exception:
+            self.log.warning(
+                f"{item.item_label}: Failed to finish distribution",
+                exc_info=True
+            )
+
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._done_event.set()
@@ -1,8 +1,12 @@
+import os
 import copy
+import time
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import attr
 import pytest
+from ayon_api.exceptions import HTTPRequestError
 
 from common.ayon_common.distribution.downloaders import (
     DownloadFactory,
@@ -15,6 +19,7 @@ from common.ayon_common.distribution.control import (
 )
 from common.ayon_common.distribution.data_structures import (
     AddonInfo,
+    LazyItems,
     UrlType,
 )
 
@@ -159,6 +164,150 @@ def test_addon_info(printer, sample_addon_info):
     assert addon_as_dict["name"], "Dict approach should work"
 
 
+def test_lazy_items(printer):
+    created = []
+
+    def _factory(key, value):
+        created.append(key)
+        return value * 2
+
+    items = LazyItems({"a": 1, "b": 2}, _factory)
+    assert list(items) == ["a", "b"]
+    assert "b" in items and "c" not in items
+    assert not created, "Items must not be created before access"
+
+    assert items["b"] == 4
+    assert items.get("b") == 4
+    assert items.get("c") is None
+    assert created == ["b"], "Item must be created only once"
+    assert dict(items) == {"a": 2, "b": 4}
+
+    # Concurrent access creates item only once
+    created.clear()
+
+    def _slow_factory(key, value):
+        created.append(key)
+        time.sleep(0.05)
+        return value
+
+    items = LazyItems({"a": 1}, _slow_factory)
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: items["a"], range(8)))
+    assert results == [1] * 8
+    assert created == ["a"], "Item must be created only once"
+
+
+def _create_bundles_info(addon_versions):
+    return {
+        "bundles": [
+            {
+                "name": "TestBundle",
+                "installerVersion": None,
+                "addons": addon_versions,
+                "dependencyPackages": {},
+                "isProduction": True,
+                "isStaging": False
+            }
+        ]
+    }
+
+
+def _create_addons_info(sample_addon_info, addon_names):
+    output = []
+    for addon_name in addon_names:
+        addon_info = copy.deepcopy(sample_addon_info)
+        addon_info["name"] = addon_name
+        addon_info["versions"]["2.0.0"] = {"clientSourceInfo": None}
+        output.append(addon_info)
+    return output
+
+
+def test_addon_items_scoped_to_bundle(
+    printer, temp_folder, download_factory, sample_addon_info
+):
+    addon_names = ["addon_0", "addon_1", "addon_2"]
+    distribution = AyonDistribution(
+        addon_dirpath=os.path.join(temp_folder, "addons"),
+        dependency_dirpath=os.path.join(temp_folder, "dependencies"),
+        dist_factory=download_factory,
+        addons_info=_create_addons_info(sample_addon_info, addon_names),
+        dependency_packages_info=[],
+        bundles_info=_create_bundles_info(
+            {addon_names[0]: "1.0.0", addon_names[1]: "1.0.0"}
+        ),
+        skip_installer_dist=True,
+    )
+    addon_items = distribution.addon_items
+    assert set(addon_items) == set(addon_names[:2])
+    for addon_item in addon_items.values():
+        assert list(addon_item.versions) == ["1.0.0"]
+
+
+class _Response:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise HTTPRequestError(
+                f"Status code {self.status_code}", self
+            )
+
+
+@pytest.mark.parametrize("has_version_endpoint", [True, False])
+def test_addon_versions_requested_by_bundle(
+    printer,
+    temp_folder,
+    download_factory,
+    sample_addon_info,
+    monkeypatch,
+    has_version_endpoint,
+):
+    from common.ayon_common.distribution import control
+
+    addon_names = ["addon_0", "addon_1", "addon_2"]
+    addon_versions = {addon_names[0]: "1.0.0", addon_names[1]: "1.0.0"}
+    requested = []
+
+    def _get(endpoint, *args, **kwargs):
+        requested.append(endpoint)
+        if not has_version_endpoint:
+            return _Response({"detail": "Not found"}, 404)
+        return _Response(sample_addon_info["versions"]["1.0.0"])
+
+    def _get_addons_info(*args, **kwargs):
+        requested.append("addons")
+        return {
+            "addons": _create_addons_info(sample_addon_info, addon_names)
+        }
+
+    monkeypatch.setattr(control.ayon_api, "get", _get)
+    monkeypatch.setattr(control.ayon_api, "get_addons_info", _get_addons_info)
+    distribution = AyonDistribution(
+        addon_dirpath=os.path.join(temp_folder, "addons"),
+        dependency_dirpath=os.path.join(temp_folder, "dependencies"),
+        dist_factory=download_factory,
+        dependency_packages_info=[],
+        bundles_info=_create_bundles_info(addon_versions),
+        skip_installer_dist=True,
+        response_cache=None,
+    )
+    addon_items = distribution.addon_items
+    assert set(addon_items) == set(addon_versions)
+    for addon_item in addon_items.values():
+        assert list(addon_item.versions) == ["1.0.0"]
+
+    if has_version_endpoint:
+        assert sorted(requested) == [
+            f"addons/{addon_name}/{addon_version}"
+            for addon_name, addon_version in addon_versions.items()
+        ], "Only addon versions used by bundle should be requested"
+    else:
+        # Single failed request, then all addons
+        assert requested == ["addons/addon_0/1.0.0", "addons"]
+
+
 def _get_dist_item(dist_items, name, version):
     final_dist_info = next(
         (
@@ -0,0 +1,153 @@
+import os
+import time
+import json
+import hashlib
+import tempfile
+import functools
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import ayon_api
+import pytest
+
+from common.ayon_common.distribution.downloaders import ChunkedDownloader
+from common.ayon_common.distribution.chunk_store import (
+    ChunkStore,
+    create_chunk_index,
+)
+
+CHUNK_KWARGS = {
+    "min_size": 4 * 1024,
+    "avg_size": 16 * 1024,
+    "max_size": 64 * 1024,
+}
+
+
+class _ChunkRequestHandler(SimpleHTTPRequestHandler):
+    requested_paths = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requested_paths.append(self.path)
+        super().do_GET()
+
+
+@pytest.fixture
+def temp_folder():
+    yield tempfile.mkdtemp(prefix="ayon_test_")
+
+
+@pytest.fixture
+def http_server(temp_folder):
+    server_root = os.path.join(temp_folder, "server")
+    os.makedirs(server_root)
+    handler = functools.partial(_ChunkRequestHandler, directory=server_root)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    _ChunkRequestHandler.requested_paths = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server_root, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _publish(server_root, content):
+    filepath = os.path.join(server_root, "package.zip")
+    with open(filepath, "wb") as stream:
+        stream.write(content)
+    index = create_chunk_index(
+        filepath, os.path.join(server_root, "chunks"), **CHUNK_KWARGS
+    )
+    with open(os.path.join(server_root, "package.json"), "w") as stream:
+        json.dump(index, stream)
+    os.remove(filepath)
+    return index
+
+
+def _download(url, destination_dir):
+    filepath, checksum = ChunkedDownloader.download_with_checksum(
+        {"url": f"{url}/package.json", "filename": None},
+        destination_dir,
+        {"type": "dependency_package"},
+        ayon_api.TransferProgress(),
+    )
+    with open(filepath, "rb") as stream:
+        content = stream.read()
+    return content, checksum
+
+
+def test_chunked_download(printer, temp_folder, http_server, monkeypatch):
+    server_root, url = http_server
+    monkeypatch.setattr(
+        ChunkedDownloader,
+        "_chunk_store",
+        ChunkStore(os.path.join(temp_folder, "store"))
+    )
+    destination_dir = os.path.join(temp_folder, "downloads")
+
+    content = os.urandom(1024 * 1024)
+    index = _publish(server_root, content)
+    received, checksum = _download(url, destination_dir)
+    assert received == content, "Rebuilt content does not match"
+    assert checksum == hashlib.sha256(content).hexdigest()
+    assert os.listdir(destination_dir) == ["package.zip"], (
+        "Chunk index was stored to destination directory")
+
+    # Change small part of the package
+    new_content = content[:500000] + b"changed" + content[500000:]
+    new_index = _publish(server_root, new_content)
+    _ChunkRequestHandler.requested_paths = []
+    received, _ = _download(url, destination_dir)
+    assert received == new_content, "Rebuilt content does not match"
+
+    old_chunks = {chunk["checksum"] for chunk in index["chunks"]}
+    expected_chunks = {
+        chunk["checksum"]
+        for chunk in new_index["chunks"]
+        if chunk["checksum"] not in old_chunks
+    }
+    requested_chunks = {
+        path.rsplit("/", 1)[-1]
+        for path in _ChunkRequestHandler.requested_paths
+        if path.startswith("/chunks/")
+    }
+    assert requested_chunks == expected_chunks, (
+        "Only missing chunks should be downloaded")
+    assert len(requested_chunks) < len(new_index["chunks"]) // 4
+
+
+def test_chunk_store_prune(printer, temp_folder):
+    store_root = os.path.join(temp_folder, "store")
+    filepath = os.path.join(temp_folder, "package.zip")
+    with open(filepath, "wb") as stream:
+        stream.write(os.urandom(512 * 1024))
+    index = create_chunk_index(filepath, **CHUNK_KWARGS)
+    ChunkStore(store_root).add_file(filepath, index)
+    chunks = index["chunks"]
+    half_size = sum(chunk["size"] for chunk in chunks) // 2
+
+    # Oldest chunks are removed first
+    old_time = time.time() - 3600
+    algorithm = index["algorithm"]
+    store = ChunkStore(store_root, max_size=half_size)
+    for idx, chunk in enumerate(chunks):
+        path = store.get_chunk_path(algorithm, chunk["checksum"])
+        os.utime(path, (old_time + idx, old_time + idx))
+
+    # Recently used chunks are kept
+    assert store.prune(grace_period=7200) == 0
+
+    assert store.prune(grace_period=60) > 0
+    remaining = [
+        store.has_chunk(algorithm, chunk["checksum"], chunk["size"])
+        for chunk in chunks
+    ]
+    assert not remaining[0], "Least recently used chunk was kept"
+    assert remaining[-1], "Most recently used chunk was removed"
+    assert sum(
+        chunk["size"]
+        for chunk, exists in zip(chunks, remaining)
+        if exists
+    ) <= half_size
@@ -0,0 +1,315 @@
+import os
+import time
+import zipfile
+import tempfile
+import platform
+import multiprocessing
+
+import pytest
+
+from common.ayon_common import calculate_file_checksum
+from common.ayon_common.distribution.downloaders import (
+    DownloadFactory,
+    OSDownloader,
+)
+from common.ayon_common.distribution.control import (
+    DistributionItem,
+    UpdateState,
+)
+from common.ayon_common.distribution.trash import wait_for_trash_cleanup
+from common.ayon_common.distribution.locks import (
+    OwnerLock,
+    LockTimeoutError,
+)
+from common.ayon_common.distribution.artifact_cache import ArtifactCache
+from common.ayon_common.distribution.manifest import (
+    create_zip_manifest,
+    extract_zip_incremental,
+)
+from common.ayon_common.distribution.data_structures import (
+    UrlType,
+    LocalSourceInfo,
+)
+
+
+@pytest.fixture
+def download_factory():
+    download_factory = DownloadFactory()
+    download_factory.register_format(UrlType.FILESYSTEM, OSDownloader)
+    yield download_factory
+
+
+@pytest.fixture
+def temp_folder():
+    yield tempfile.mkdtemp(prefix="ayon_test_")
+
+
+def _create_dist_item(
+    temp_folder,
+    download_factory,
+    source_path,
+    checksum=None,
+    artifact_cache=None,
+    version="1.0.0",
+    previous_dirpath=None,
+):
+    addons_dir = os.path.join(temp_folder, "addons")
+    full_name = f"addon_{version}"
+    return DistributionItem(
+        os.path.join(addons_dir, full_name),
+        os.path.join(addons_dir, ".downloads", full_name),
+        UpdateState.OUTDATED,
+        checksum,
+        "sha256",
+        download_factory,
+        [
+            LocalSourceInfo(
+                type=UrlType.FILESYSTEM.value,
+                path={platform.system().lower(): source_path},
+            )
+        ],
+        {"type": "addon", "name": "addon", "version": version},
+        full_name,
+        artifact_cache=artifact_cache,
+        previous_dirpath=previous_dirpath,
+    )
+
+
+def _create_zip(filepath, content):
+    with zipfile.ZipFile(filepath, "w") as zip_file:
+        zip_file.writestr("addon/__init__.py", content)
+    return filepath
+
+
+def test_staged_install(printer, temp_folder, download_factory):
+    addons_dir = os.path.join(temp_folder, "addons")
+    unzip_dirpath = os.path.join(addons_dir, "addon_1.0.0")
+    os.makedirs(unzip_dirpath)
+    old_filepath = os.path.join(unzip_dirpath, "old.py")
+    with open(old_filepath, "w") as stream:
+        stream.write("")
+
+    # Failed distribution must keep previous content
+    dist_item = _create_dist_item(
+        temp_folder, download_factory, "/not/existing.zip"
+    )
+    dist_item.distribute()
+    assert dist_item.state == UpdateState.UPDATE_FAILED
+    assert os.path.exists(old_filepath), "Previous content was removed"
+
+    zip_path = _create_zip(os.path.join(temp_folder, "addon.zip"), "")
+
+    dist_item = _create_dist_item(temp_folder, download_factory, zip_path)
+    dist_item.distribute()
+    assert dist_item.state == UpdateState.UPDATED
+    assert os.path.exists(
+        os.path.join(unzip_dirpath, "addon", "__init__.py")
+    ), "New content was not promoted"
+    assert not os.path.exists(old_filepath), "Previous content was kept"
+    assert not os.path.exists(os.path.join(addons_dir, ".staging")), (
+        "Staging directory was not removed")
+
+    assert wait_for_trash_cleanup(10), "Trash was not emptied"
+    assert not os.path.exists(os.path.join(addons_dir, ".trash")), (
+        "Trash directory was not removed")
+
+
+def test_distribute_from_artifact_cache(
+    printer, temp_folder, download_factory
+):
+    zip_path = _create_zip(os.path.join(temp_folder, "addon.zip"), "")
+    checksum = calculate_file_checksum(zip_path, "sha256")
+    artifact_cache = ArtifactCache(os.path.join(temp_folder, "artifacts"))
+    artifact_cache.add(zip_path, checksum, "sha256")
+
+    # Source is not available but archive is in cache
+    dist_item = _create_dist_item(
+        temp_folder,
+        download_factory,
+        "/not/existing.zip",
+        checksum=checksum,
+        artifact_cache=artifact_cache,
+    )
+    dist_item.distribute()
+    assert dist_item.state == UpdateState.UPDATED
+    assert os.path.exists(zip_path), "Source archive was removed"
+
+
+def test_artifact_cache_prune(printer, temp_folder):
+    zip_paths = [
+        _create_zip(os.path.join(temp_folder, f"addon_{idx}.zip"), str(idx))
+        for idx in range(3)
+    ]
+    # Only two archives fit to the cache
+    artifact_cache = ArtifactCache(
+        os.path.join(temp_folder, "artifacts"),
+        max_size=os.path.getsize(zip_paths[0]) * 2 + 1,
+    )
+    cached_paths = []
+    for idx, zip_path in enumerate(zip_paths):
+        checksum = calculate_file_checksum(zip_path, "sha256")
+        cached_path = artifact_cache.add(zip_path, checksum, "sha256")
+        # Make sure modification times differ
+        mtime = time.time() + idx
+        os.utime(cached_path, (mtime, mtime))
+        cached_paths.append(cached_path)
+
+    existing = [os.path.exists(path) for path in cached_paths]
+    assert existing == [False, True, True], (
+        "Least recently used archive was not removed")
+
+
+def test_artifact_cache_verified_hit(printer, temp_folder, monkeypatch):
+    # Distribution modules use top level 'ayon_common' package
+    from ayon_common import utils
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    zip_path = _create_zip(os.path.join(temp_folder, "addon.zip"), "")
+    checksum = calculate_file_checksum(zip_path, "sha256")
+    artifact_cache = ArtifactCache(os.path.join(temp_folder, "artifacts"))
+    cached_path = artifact_cache.add(zip_path, checksum, "sha256")
+
+    calculated = []
+    orig_calculate = utils.calculate_file_checksum
+
+    def _calculate(*args, **kwargs):
+        calculated.append(args)
+        return orig_calculate(*args, **kwargs)
+
+    monkeypatch.setattr(utils, "calculate_file_checksum", _calculate)
+    for _ in range(3):
+        assert artifact_cache.get(checksum, "sha256") == cached_path
+    assert len(calculated) == 1, "Unchanged archive was hashed again"
+
+    # Changed archive is removed
+    with open(cached_path, "ab") as stream:
+        stream.write(b"corrupted")
+    assert artifact_cache.get(checksum, "sha256") is None
+    assert not os.path.exists(cached_path)
+
+
+def test_incremental_update(printer, temp_folder, download_factory):
+    v1_path = os.path.join(temp_folder, "addon_v1.zip")
+    with zipfile.ZipFile(v1_path, "w") as zip_file:
+        zip_file.writestr("addon/same.py", "same")
+        zip_file.writestr("addon/changed.py", "old")
+    v2_path = os.path.join(temp_folder, "addon_v2.zip")
+    with zipfile.ZipFile(v2_path, "w") as zip_file:
+        zip_file.writestr("addon/same.py", "same")
+        zip_file.writestr("addon/changed.py", "new")
+        zip_file.writestr("addon/added.py", "added")
+
+    dist_item = _create_dist_item(temp_folder, download_factory, v1_path)
+    dist_item.distribute()
+    assert dist_item.state == UpdateState.UPDATED
+
+    v1_dir = os.path.join(temp_folder, "addons", "addon_1.0.0", "addon")
+    # Previous file changed in place without size change must not be reused
+    with open(os.path.join(v1_dir, "same.py"), "w") as stream:
+        stream.write("SAME")
+
+    dist_item = _create_dist_item(
+        temp_folder,
+        download_factory,
+        v2_path,
+        version="1.0.1",
+        previous_dirpath=dist_item.unzip_dirpath,
+    )
+    dist_item.distribute()
+    assert dist_item.state == UpdateState.UPDATED
+
+    v2_dir = os.path.join(temp_folder, "addons", "addon_1.0.1", "addon")
+    for filename, content in (
+        ("same.py", "same"),
+        ("changed.py", "new"),
+        ("added.py", "added"),
+    ):
+        with open(os.path.join(v2_dir, filename), "r") as stream:
+            assert stream.read() == content, f"{filename} is not updated"
+
+
+def test_incremental_reuse(printer, temp_folder):
+    zip_path = _create_zip(os.path.join(temp_folder, "addon.zip"), "same")
+    v1_dir = os.path.join(temp_folder, "v1")
+    with zipfile.ZipFile(zip_path) as zip_file:
+        zip_file.extractall(v1_dir)
+
+    v2_dir = os.path.join(temp_folder, "v2")
+    result = extract_zip_incremental(
+        zip_path, v2_dir, v1_dir, create_zip_manifest(zip_path)
+    )
+    assert result == {"reused": 1, "extracted": 0}
+
+    v1_path = os.path.join(v1_dir, "addon", "__init__.py")
+    v2_path = os.path.join(v2_dir, "addon", "__init__.py")
+    assert not os.path.samefile(v1_path, v2_path), "Reused file is shared"
+    # Change of new version must not change previous version
+    with open(v2_path, "w") as stream:
+        stream.write("changed")
+    with open(v1_path, "r") as stream:
+        assert stream.read() == "same", "Previous version was changed"
+
+
+def _distribute_in_process(temp_folder, source_path, checksum):
+    download_factory = DownloadFactory()
+    download_factory.register_format(UrlType.FILESYSTEM, OSDownloader)
+    dist_item = _create_dist_item(
+        temp_folder, download_factory, source_path, checksum=checksum
+    )
+    dist_item.distribute()
+    return (
+        dist_item.state.value,
+        dist_item.used_source_progress is not None
+    )
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires 'fork' start method"
+)
+@pytest.mark.parametrize("shared_storage", ["0", "1"])
+def test_single_flight_distribution(
+    printer, temp_folder, monkeypatch, shared_storage
+):
+    monkeypatch.setenv("AYON_SHARED_STORAGE", shared_storage)
+    zip_path = os.path.join(temp_folder, "addon.zip")
+    with zipfile.ZipFile(zip_path, "w") as zip_file:
+        for idx in range(200):
+            zip_file.writestr(f"addon/file_{idx}.py", os.urandom(10000))
+    checksum = calculate_file_checksum(zip_path, "sha256")
+
+    context = multiprocessing.get_context("fork")
+    with context.Pool(4) as pool:
+        results = pool.starmap(
+            _distribute_in_process,
+            [(temp_folder, zip_path, checksum)] * 4
+        )
+
+    assert all(
+        state == UpdateState.UPDATED.value
+        for state, _ in results
+    ), "All processes should have the item distributed"
+    distributed = [result for _, result in results if result]
+    assert len(distributed) == 1, "Item was distributed more than once"
+
+
+def test_stale_owner_lock(printer, temp_folder):
+    owner_path = os.path.join(temp_folder, ".locks", "addon_1.0.0.owner")
+    os.makedirs(os.path.dirname(owner_path))
+    # Owner file of a process that died
+    with open(owner_path, "w") as stream:
+        stream.write("{}")
+
+    lock = OwnerLock(owner_path, stale_timeout=1)
+    assert not lock.try_acquire(), "Lock of other process was acquired"
+    lock.acquire(timeout=10)
+    assert lock.locked
+
+    # Heartbeat keeps the lock alive
+    other_lock = OwnerLock(owner_path, stale_timeout=1)
+    with pytest.raises(LockTimeoutError):
+        other_lock.acquire(timeout=3)
+    lock.release()
+    assert not os.path.exists(owner_path), "Owner file was not removed"
+    assert other_lock.try_acquire()
+    other_lock.release()
@@ -0,0 +1,373 @@
+import os
+import copy
+import shutil
+import zipfile
+import tempfile
+import platform
+import threading
+
+import pytest
+
+from common.ayon_common.distribution.downloaders import (
+    DownloadFactory,
+    OSDownloader,
+)
+from common.ayon_common.distribution.control import (
+    AyonDistribution,
+    UpdateState,
+)
+from common.ayon_common.distribution.scheduler import DistributionScheduler
+from common.ayon_common.distribution.garbage_collector import (
+    schedule_garbage_collection,
+)
+from common.ayon_common.distribution import control
+from common.ayon_common.distribution.data_structures import UrlType
+
+
+@pytest.fixture
+def download_factory():
+    download_factory = DownloadFactory()
+    download_factory.register_format(UrlType.FILESYSTEM, OSDownloader)
+    yield download_factory
+
+
+@pytest.fixture
+def temp_folder():
+    yield tempfile.mkdtemp(prefix="ayon_test_")
+
+
+def _create_addon_zip(dirpath, addon_name):
+    filepath = os.path.join(dirpath, f"{addon_name}.zip")
+    with zipfile.ZipFile(filepath, "w") as zip_file:
+        zip_file.writestr(f"{addon_name}/__init__.py", "")
+    return filepath
+
+
+def _prepare_addons_info(dirpath, addon_names):
+    output = []
+    for addon_name in addon_names:
+        filepath = _create_addon_zip(dirpath, addon_name)
+        output.append({
+            "name": addon_name,
+            "versions": {
+                "1.0.0": {
+                    "clientSourceInfo": [
+                        {
+                            "type": "filesystem",
+                            "path": {platform.system().lower(): filepath}
+                        }
+                    ]
+                }
+            }
+        })
+    return output
+
+
+def test_threaded_distribution(printer, temp_folder, download_factory):
+    addon_names = [f"addon_{idx}" for idx in range(6)]
+    sources_dir = os.path.join(temp_folder, "sources")
+    os.makedirs(sources_dir)
+    bundles_info = {
+        "bundles": [
+            {
+                "name": "TestBundle",
+                "installerVersion": None,
+                "addons": {name: "1.0.0" for name in addon_names},
+                "dependencyPackages": {},
+                "isProduction": True,
+                "isStaging": False
+            }
+        ]
+    }
+    # Add addon without any valid source
+    addons_info = _prepare_addons_info(sources_dir, addon_names)
+    addons_info[0]["versions"]["1.0.0"]["clientSourceInfo"] = [
+        {
+            "type": "filesystem",
+            "path": {platform.system().lower(): "/not/existing.zip"}
+        }
+    ]
+    distribution = AyonDistribution(
+        addon_dirpath=os.path.join(temp_folder, "addons"),
+        dependency_dirpath=os.path.join(temp_folder, "dependencies"),
+        dist_factory=download_factory,
+        addons_info=addons_info,
+        dependency_packages_info=[],
+        bundles_info=bundles_info,
+        skip_installer_dist=True,
+    )
+    distribution.distribute(threaded=True)
+
+    states = {
+        item["addon_name"]: item["dist_item"].state
+        for item in distribution.get_addon_dist_items()
+    }
+    assert states.pop(addon_names[0]) == UpdateState.UPDATE_FAILED
+    assert all(state == UpdateState.UPDATED for state in states.values())
+    for addon_name in addon_names[1:]:
+        init_path = os.path.join(
+            temp_folder, "addons", f"{addon_name}_1.0.0",
+            addon_name, "__init__.py"
+        )
+        assert os.path.exists(init_path), "Addon was not extracted"
+
+
+def test_sort_items(printer):
+    class _Item:
+        def __init__(self, size):
+            self.size = size
+
+    items = [_Item(None), _Item(10), _Item(300), _Item(None), _Item(20)]
+    sizes = [item.size for item in DistributionScheduler.sort_items(items)]
+    assert sizes == [300, 20, 10, None, None]
+
+
+def test_commit_items_before_finish(
+    printer, temp_folder, download_factory, monkeypatch
+):
+    addon_names = [f"addon_{idx}" for idx in range(3)]
+    sources_dir = os.path.join(temp_folder, "sources")
+    os.makedirs(sources_dir)
+    bundles_info = {
+        "bundles": [
+            {
+                "name": "TestBundle",
+                "installerVersion": None,
+                "addons": {name: "1.0.0" for name in addon_names},
+                "dependencyPackages": {},
+                "isProduction": True,
+                "isStaging": False
+            }
+        ]
+    }
+    addons_info = _prepare_addons_info(sources_dir, addon_names)
+
+    def _create_distribution():
+        return AyonDistribution(
+            addon_dirpath=os.path.join(temp_folder, "addons"),
+            dependency_dirpath=os.path.join(temp_folder, "dependencies"),
+            dist_factory=download_factory,
+            addons_info=addons_info,
+            dependency_packages_info=[],
+            bundles_info=bundles_info,
+            skip_installer_dist=True,
+        )
+
+    # Unfinished distribution of previous process
+    staging_dirpath = os.path.join(
+        temp_folder, "addons", ".staging", "addon_0_1.0.0"
+    )
+    os.makedirs(staging_dirpath)
+    distribution = _create_distribution()
+    distribution.get_addons_state_store().add_journal_entries(
+        [os.path.join(temp_folder, "addons", "addon_0_1.0.0")], ""
+    )
+
+    # Simulate crash before distribution finished
+    def _crash():
+        raise KeyboardInterrupt()
+
+    monkeypatch.setattr(distribution, "finish_distribution", _crash)
+    with pytest.raises(KeyboardInterrupt):
+        distribution.distribute(threaded=True)
+
+    assert not os.path.exists(staging_dirpath), (
+        "Unfinished distribution was not cleaned up")
+    store = distribution.get_addons_state_store()
+    assert not store.get_journal_entries(), "Journal was not finished"
+
+    states = [
+        item["dist_item"].state
+        for item in _create_distribution().get_addon_dist_items()
+    ]
+    assert states == [UpdateState.UPDATED] * len(addon_names), (
+        "Distributed addons were not stored")
+
+    # Legacy metadata file is still written for older launchers
+    legacy_metadata = distribution.read_metadata_file(
+        distribution.get_addons_metadata_filepath()
+    )
+    assert sorted(legacy_metadata) == addon_names, (
+        "Legacy addons metadata file was not written")
+
+
+def test_distributed_bundle_fast_path(
+    printer, temp_folder, download_factory, monkeypatch
+):
+    addon_names = [f"addon_{idx}" for idx in range(3)]
+    sources_dir = os.path.join(temp_folder, "sources")
+    os.makedirs(sources_dir)
+    bundles_info = {
+        "bundles": [
+            {
+                "name": "TestBundle",
+                "installerVersion": None,
+                "addons": {name: "1.0.0" for name in addon_names},
+                "dependencyPackages": {},
+                "isProduction": True,
+                "isStaging": False
+            }
+        ]
+    }
+    addons_info = _prepare_addons_info(sources_dir, addon_names)
+
+    def _create_distribution(addons_info=None):
+        kwargs = {}
+        if addons_info is not None:
+            kwargs["addons_info"] = addons_info
+        return AyonDistribution(
+            addon_dirpath=os.path.join(temp_folder, "addons"),
+            dependency_dirpath=os.path.join(temp_folder, "dependencies"),
+            dist_factory=download_factory,
+            dependency_packages_info=[],
+            bundles_info=copy.deepcopy(bundles_info),
+            skip_installer_dist=True,
+            response_cache=None,
+            **kwargs
+        )
+
+    def _request_addons(*args, **kwargs):
+        raise AssertionError("Addons were requested on fast path")
+
+    distribution = _create_distribution(addons_info)
+    distribution.distribute()
+    distribution.validate_distribution()
+    python_paths = distribution.get_python_paths()
+    assert len(python_paths) == len(addon_names)
+
+    # Distribution items are not needed for distributed bundle
+    monkeypatch.setattr(control.ayon_api, "get", _request_addons)
+    monkeypatch.setattr(
+        control.ayon_api, "get_addons_info", _request_addons
+    )
+    distribution = _create_distribution()
+    assert distribution.load_distributed_bundle()
+    assert not distribution.need_distribution
+    distribution.distribute()
+    distribution.validate_distribution()
+    assert distribution.get_python_paths() == python_paths
+
+    # Status of bundle is not part of fingerprint
+    bundles_info["bundles"][0]["isStaging"] = True
+    assert _create_distribution().load_distributed_bundle()
+
+    # Bundle changed on server
+    bundles_info["bundles"][0]["updatedAt"] = "2024-01-01T00:00:00"
+    assert not _create_distribution().load_distributed_bundle()
+    bundles_info["bundles"][0].pop("updatedAt")
+    monkeypatch.undo()
+
+    # Removed directory is found when directories are leased in background
+    shutil.rmtree(
+        os.path.join(temp_folder, "addons", f"{addon_names[2]}_1.0.0")
+    )
+    distribution = _create_distribution(addons_info)
+    distribution.distribute()
+    # Only deferred leases are taken when garbage collection is disabled
+    monkeypatch.setenv("AYON_DISTRIBUTION_QUOTA", "0")
+    schedule_garbage_collection((
+        os.path.join(temp_folder, "addons"),
+        os.path.join(temp_folder, "dependencies"),
+    )).join()
+    distribution = _create_distribution(addons_info)
+    assert not distribution.load_distributed_bundle()
+    distribution.distribute()
+    distribution.validate_distribution()
+    assert distribution.get_python_paths() == python_paths
+
+    # Changed bundle must not use stored paths
+    bundles_info["bundles"][0]["addons"].pop(addon_names[0])
+    distribution = _create_distribution(addons_info)
+    distribution.distribute()
+    assert len(distribution.get_python_paths()) == len(addon_names) - 1
+
+
+def test_verify_and_repair_distribution(
+    printer, temp_folder, download_factory
+):
+    addon_names = [f"addon_{idx}" for idx in range(2)]
+    sources_dir = os.path.join(temp_folder, "sources")
+    os.makedirs(sources_dir)
+    bundles_info = {
+        "bundles": [
+            {
+                "name": "TestBundle",
+                "installerVersion": None,
+                "addons": {name: "1.0.0" for name in addon_names},
+                "dependencyPackages": {},
+                "isProduction": True,
+                "isStaging": False
+            }
+        ]
+    }
+    addons_info = _prepare_addons_info(sources_dir, addon_names)
+
+    def _create_distribution():
+        return AyonDistribution(
+            addon_dirpath=os.path.join(temp_folder, "addons"),
+            dependency_dirpath=os.path.join(temp_folder, "dependencies"),
+            dist_factory=download_factory,
+            addons_info=addons_info,
+            dependency_packages_info=[],
+            bundles_info=bundles_info,
+            skip_installer_dist=True,
+        )
+
+    distribution = _create_distribution()
+    distribution.distribute()
+    assert distribution.verify_distribution() == []
+
+    # Damage content of first addon
+    init_path = os.path.join(
+        temp_folder, "addons", "addon_0_1.0.0", "addon_0", "__init__.py"
+    )
+    with open(init_path, "w") as stream:
+        stream.write("damaged")
+
+    distribution = _create_distribution()
+    distribution.distribute()
+    damaged_items = distribution.verify_distribution()
+    assert [item.item_label for item in damaged_items] == ["addon_0_1.0.0"]
+    distribution.validate_distribution()
+    with open(init_path, "r") as stream:
+        assert stream.read() == "", "Damaged file was not repaired"
+    assert _create_distribution().verify_distribution(repair=False) == []
+
+
+def test_prefetch_server_info(printer, temp_folder, monkeypatch):
+    from common.ayon_common.distribution import control
+
+    barrier = threading.Barrier(3, timeout=10)
+    calls = []
+
+    def _request(name, response):
+        def _func(*args, **kwargs):
+            calls.append(name)
+            # All requests must be running at the same time
+            barrier.wait()
+            return response
+        return _func
+
+    monkeypatch.setattr(
+        control.ayon_api, "get_user", _request("user", {"name": "user"})
+    )
+    monkeypatch.setattr(
+        control.ayon_api, "get_bundles", _request("bundles", {"bundles": []})
+    )
+    monkeypatch.setattr(
+        control.ayon_api,
+        "get_dependency_packages",
+        _request("packages", {"packages": []})
+    )
+    distribution = AyonDistribution(
+        addon_dirpath=os.path.join(temp_folder, "addons"),
+        dependency_dirpath=os.path.join(temp_folder, "dependencies"),
+        skip_installer_dist=True,
+    )
+    distribution.prefetch_server_info()
+    assert distribution.active_user == "user"
+    assert distribution.bundles_info == {"bundles": []}
+    assert distribution.dependency_packages_info == []
+    # Addons are requested once bundle is known
+    assert sorted(calls) == ["bundles", "packages", "user"]
+    assert distribution.addons_info == []
@@ -0,0 +1,114 @@
+import os
+import io
+import stat
+import tarfile
+import zipfile
+import tempfile
+
+import pytest
+
+from common.ayon_common.utils import (
+    extract_archive_file,
+    get_extract_workers_count,
+    MAX_EXTRACT_WORKERS,
+    PARALLEL_EXTRACT_MIN_MEMBERS,
+)
+
+FILES_COUNT = PARALLEL_EXTRACT_MIN_MEMBERS * 2
+
+
+@pytest.fixture
+def temp_folder():
+    yield tempfile.mkdtemp(prefix="ayon_test_")
+
+
+def _get_file_content(idx):
+    return (f"content {idx}\n" * (idx + 1)).encode("utf-8")
+
+
+def _get_tree(root):
+    """Directories, files with content and mode and links in root."""
+    output = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            relpath = os.path.relpath(path, root).replace("\\", "/")
+            if os.path.islink(path):
+                output[relpath] = ("link", os.readlink(path))
+            elif os.path.isdir(path):
+                output[relpath] = ("dir", None)
+            else:
+                with open(path, "rb") as stream:
+                    content = stream.read()
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+                output[relpath] = ("file", content, mode)
+    return output
+
+
+def _create_zip(filepath):
+    with zipfile.ZipFile(filepath, "w") as zip_file:
+        zip_file.writestr("empty_dir/", b"")
+        for idx in range(FILES_COUNT):
+            zip_file.writestr(
+                f"dir_{idx % 5}/sub_{idx % 3}/file_{idx}.txt",
+                _get_file_content(idx)
+            )
+
+
+def _create_tar(filepath):
+    with tarfile.open(filepath, "w") as tar_file:
+        info = tarfile.TarInfo("empty_dir")
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o750
+        tar_file.addfile(info)
+        for idx in range(FILES_COUNT):
+            content = _get_file_content(idx)
+            info = tarfile.TarInfo(f"dir_{idx % 5}/file_{idx}.txt")
+            info.size = len(content)
+            info.mode = 0o755 if idx % 2 else 0o644
+            tar_file.addfile(info, io.BytesIO(content))
+
+        info = tarfile.TarInfo("dir_0/link.txt")
+        info.type = tarfile.SYMTYPE
+        info.linkname = "file_0.txt"
+        tar_file.addfile(info)
+
+
+@pytest.mark.parametrize("filename", ["archive.zip", "archive.tar"])
+def test_parallel_extraction(printer, temp_folder, filename):
+    archive_path = os.path.join(temp_folder, filename)
+    if filename.endswith(".zip"):
+        _create_zip(archive_path)
+    else:
+        _create_tar(archive_path)
+
+    serial_dir = os.path.join(temp_folder, "serial")
+    parallel_dir = os.path.join(temp_folder, "parallel")
+    extract_archive_file(archive_path, serial_dir, workers=1)
+    extract_archive_file(archive_path, parallel_dir, workers=4)
+
+    serial_tree = _get_tree(serial_dir)
+    assert serial_tree["empty_dir"] == ("dir", None)
+    assert len([
+        item for item in serial_tree.values() if item[0] == "file"
+    ]) == FILES_COUNT
+    if filename.endswith(".tar"):
+        assert serial_tree["dir_0/link.txt"] == ("link", "file_0.txt")
+        assert serial_tree["dir_1/file_1.txt"][2] == 0o755
+    assert _get_tree(parallel_dir) == serial_tree, (
+        "Parallel extraction differs from serial extraction")
+
+
+def test_extract_workers_count(printer, monkeypatch):
+    default = min(os.cpu_count() or 1, MAX_EXTRACT_WORKERS)
+    for value, expected in (
+        ("", default),
+        ("3", min(3, MAX_EXTRACT_WORKERS)),
+        ("0", 1),
+        ("-2", 1),
+        ("100", MAX_EXTRACT_WORKERS),
+        ("invalid", default),
+    ):
+        monkeypatch.setenv("AYON_EXTRACT_WORKERS", value)
+        assert get_extract_workers_count() == expected, (
+            f"Unexpected workers count for '{value}'")
@@ -0,0 +1,329 @@
+import os
+import io
+import json
+import hashlib
+import tarfile
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from common.ayon_common.distribution.file_handler import (
+    RemoteFileHandler,
+    RangeNotSupported,
+    TransferChecksum,
+    PART_EXT,
+    PART_METADATA_EXT,
+    connection_budget,
+)
+
+CONTENT = os.urandom(256 * 1024)
+ETAG = '"{}"'.format(hashlib.md5(CONTENT).hexdigest())
+
+
+class _RangeRequestHandler(BaseHTTPRequestHandler):
+    support_ranges = True
+    requests_headers = []
+    content = CONTENT
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests_headers.append(dict(self.headers))
+        start = 0
+        content = self.content
+        end = len(content) - 1
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        is_range = (
+            self.support_ranges
+            and range_header
+            and (if_range is None or if_range == ETAG)
+        )
+        if is_range:
+            start, _end = range_header.split("=")[1].split("-")
+            start = int(start)
+            if _end:
+                end = int(_end)
+
+        body = content[start:end + 1]
+        if is_range:
+            self.send_response(206)
+            self.send_header(
+                "Content-Range",
+                f"bytes {start}-{end}/{len(content)}"
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeRequestHandler)
+    _RangeRequestHandler.requests_headers = []
+    _RangeRequestHandler.support_ranges = True
+    _RangeRequestHandler.content = CONTENT
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def temp_folder():
+    yield tempfile.mkdtemp(prefix="ayon_test_")
+
+
+def _prepare_partial_download(url, filepath, size):
+    with open(filepath + PART_EXT, "wb") as stream:
+        stream.write(CONTENT[:size])
+    with open(filepath + PART_METADATA_EXT, "w") as stream:
+        json.dump(
+            {"url": url, "validator": ETAG, "size": len(CONTENT)},
+            stream
+        )
+
+
+def test_full_download(printer, http_server, temp_folder):
+    url = f"{http_server}/file.zip"
+    filepath = os.path.join(temp_folder, "file.zip")
+    RemoteFileHandler.download_resumable(url, filepath)
+
+    with open(filepath, "rb") as stream:
+        assert stream.read() == CONTENT, "Content does not match"
+    assert not os.path.exists(filepath + PART_EXT), "Part file was kept"
+    assert not os.path.exists(filepath + PART_METADATA_EXT), (
+        "Part metadata were kept")
+
+
+def test_http_downloader_progress(printer, http_server, temp_folder):
+    from ayon_api import TransferProgress
+    from common.ayon_common.distribution.downloaders import HTTPDownloader
+
+    progress = TransferProgress()
+    filepath = HTTPDownloader.download(
+        {"url": f"{http_server}/file.zip"}, temp_folder, {}, progress
+    )
+    with open(filepath, "rb") as stream:
+        assert stream.read() == CONTENT, "Content does not match"
+    assert progress.started, "Transfer was not started"
+    assert progress.transfer_done, "Transfer was not finished"
+    assert not progress.failed
+
+
+def test_server_downloader_urls(printer, monkeypatch):
+    import ayon_api
+    from common.ayon_common.distribution.downloaders import (
+        AyonServerDownloader,
+    )
+
+    con = ayon_api.ServerAPI("http://server.com/")
+    monkeypatch.setattr(ayon_api, "get_server_api_connection", lambda: con)
+
+    source = {"type": "server", "path": None, "filename": "file.zip"}
+    get_urls = AyonServerDownloader.get_urls
+    assert get_urls(
+        source, {"type": "addon", "name": "core", "version": "1.0.0"},
+        "file.zip"
+    ) == ["http://server.com/api/addons/core/1.0.0/private/file.zip"]
+    assert get_urls(
+        source, {"type": "dependency_package", "name": "file.zip"},
+        "file.zip"
+    ) == ["http://server.com/api/desktop/dependencyPackages/file.zip"]
+    assert get_urls(
+        source, {"type": "installer"}, "file.zip"
+    ) == ["http://server.com/api/desktop/installers/file.zip"]
+
+    # Paths without 'api/' are tried also with it
+    source = {"type": "server", "path": "/static/file.zip", "filename": None}
+    assert get_urls(source, {"type": "addon"}, "file.zip") == [
+        "http://server.com/static/file.zip",
+        "http://server.com/api/static/file.zip",
+    ]
+    source["path"] = "http://server.com/api/file.zip"
+    assert get_urls(source, {"type": "addon"}, "file.zip") == [
+        "http://server.com/api/file.zip"
+    ]
+
+
+def test_resume_download(printer, http_server, temp_folder):
+    url = f"{http_server}/file.zip"
+    filepath = os.path.join(temp_folder, "file.zip")
+    _prepare_partial_download(url, filepath, 1000)
+
+    RemoteFileHandler.download_resumable(url, filepath)
+    with open(filepath, "rb") as stream:
+        assert stream.read() == CONTENT, "Content does not match"
+
+    request_headers = _RangeRequestHandler.requests_headers[-1]
+    assert request_headers.get("Range") == "bytes=1000-", (
+        "Download was not resumed")
+
+
+def test_transfer_checksum(printer, http_server, temp_folder):
+    url = f"{http_server}/file.zip"
+    filepath = os.path.join(temp_folder, "file.zip")
+    _prepare_partial_download(url, filepath, 1000)
+
+    checksum = TransferChecksum("sha256")
+    RemoteFileHandler.download_resumable(url, filepath, checksum=checksum)
+    assert checksum.hexdigest() == hashlib.sha256(CONTENT).hexdigest(), (
+        "Checksum calculated during transfer does not match")
+
+    checksum = TransferChecksum("sha256")
+    RemoteFileHandler.download_segmented(
+        url, filepath, len(CONTENT), 4, checksum=checksum
+    )
+    assert checksum.hexdigest() == hashlib.sha256(CONTENT).hexdigest(), (
+        "Checksum calculated during segmented transfer does not match")
+    assert all(
+        headers.get("Accept-Encoding") == "identity"
+        for headers in _RangeRequestHandler.requests_headers
+    ), "Download requested compressed content"
+
+
+def test_resume_without_range_support(printer, http_server, temp_folder):
+    _RangeRequestHandler.support_ranges = False
+    url = f"{http_server}/file.zip"
+    filepath = os.path.join(temp_folder, "file.zip")
+    _prepare_partial_download(url, filepath, 1000)
+
+    RemoteFileHandler.download_resumable(url, filepath)
+    with open(filepath, "rb") as stream:
+        assert stream.read() == CONTENT, "Content does not match"
+
+
+def test_segmented_download(printer, http_server, temp_folder):
+    url = f"{http_server}/file.zip"
+    filepath = os.path.join(temp_folder, "file.zip")
+    RemoteFileHandler.download_segmented(url, filepath, len(CONTENT), 4)
+
+    with open(filepath, "rb") as stream:
+        assert stream.read() == CONTENT, "Content does not match"
+    ranges = {
+        headers.get("Range")
+        for headers in _RangeRequestHandler.requests_headers
+    }
+    assert len(ranges) == 4, "Content was not downloaded in segments"
+
+
+def test_segmented_download_connection_budget(
+    printer, http_server, temp_folder
+):
+    url = f"{http_server}/file.zip"
+    filepath = os.path.join(temp_folder, "file.zip")
+    semaphore = threading.BoundedSemaphore(2)
+    # Slot of the caller
+    semaphore.acquire()
+    active = []
+    max_active = []
+    orig_download_segment = RemoteFileHandler._download_segment
+
+    def _download_segment(*args, **kwargs):
+        active.append(None)
+        max_active.append(len(active))
+        try:
+            return orig_download_segment(*args, **kwargs)
+        finally:
+            active.pop()
+
+    RemoteFileHandler._download_segment = staticmethod(_download_segment)
+    try:
+        with connection_budget(semaphore):
+            RemoteFileHandler.download_segmented(
+                url, filepath, len(CONTENT), 4
+            )
+    finally:
+        RemoteFileHandler._download_segment = staticmethod(
+            orig_download_segment
+        )
+
+    with open(filepath, "rb") as stream:
+        assert stream.read() == CONTENT, "Content does not match"
+    assert max(max_active) <= 2, "Connections exceeded the budget"
+    # Only slot of the caller is still acquired
+    assert semaphore.acquire(blocking=False)
+    assert not semaphore.acquire(blocking=False)
+
+
+def test_segmented_download_fallback(
+    printer, http_server, temp_folder, monkeypatch
+):
+    _RangeRequestHandler.support_ranges = False
+    monkeypatch.setenv("AYON_DOWNLOAD_SEGMENT_THRESHOLD", "1024")
+    url = f"{http_server}/file.zip"
+    filepath = os.path.join(temp_folder, "file.zip")
+    with pytest.raises(RangeNotSupported):
+        RemoteFileHandler.download_segmented(
+            url, filepath, len(CONTENT), 4
+        )
+
+    RemoteFileHandler.download_file(url, filepath, size=len(CONTENT))
+    with open(filepath, "rb") as stream:
+        assert stream.read() == CONTENT, "Content does not match"
+
+
+def test_extract_tar_stream(printer, http_server, temp_folder):
+    stream = io.BytesIO()
+    with tarfile.open(fileobj=stream, mode="w:gz") as tar_file:
+        for idx in range(3):
+            data = os.urandom(50 * 1024)
+            info = tarfile.TarInfo(f"addon/file_{idx}.bin")
+            info.size = len(data)
+            tar_file.addfile(info, io.BytesIO(data))
+    archive = stream.getvalue()
+    _RangeRequestHandler.content = archive
+
+    checksum = TransferChecksum("sha256")
+    dst_dirpath = os.path.join(temp_folder, "extracted")
+    RemoteFileHandler.extract_tar_stream(
+        f"{http_server}/addon.tar.gz",
+        dst_dirpath,
+        "r|gz",
+        chunk_size=1024,
+        checksum=checksum,
+    )
+    assert checksum.hexdigest() == hashlib.sha256(archive).hexdigest(), (
+        "Checksum calculated during extraction does not match")
+    assert sorted(os.listdir(os.path.join(dst_dirpath, "addon"))) == [
+        f"file_{idx}.bin" for idx in range(3)
+    ], "Archive was not extracted"
+
+
+def test_batch_checksums(printer, temp_folder, monkeypatch):
+    from common.ayon_common.utils import (
+        calculate_files_checksums,
+        validate_files_checksums,
+    )
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    filepaths = []
+    for idx in range(4):
+        filepath = os.path.join(temp_folder, f"file_{idx}.bin")
+        with open(filepath, "wb") as stream:
+            stream.write(CONTENT[idx:])
+        filepaths.append(filepath)
+
+    checksums = calculate_files_checksums(filepaths, "BLAKE2b")
+    assert checksums == {
+        filepath: hashlib.blake2b(CONTENT[idx:]).hexdigest()
+        for idx, filepath in enumerate(filepaths)
+    }
+
+    results = validate_files_checksums([
+        (filepaths[0], checksums[filepaths[0]], "blake2b"),
+        (filepaths[1], checksums[filepaths[0]], "blake2b"),
+        (filepaths[2], hashlib.sha3_256(CONTENT[2:]).hexdigest(), "sha3-256"),
+    ])
+    assert results == {
+        filepaths[0]: True,
+        filepaths[1]: False,
+        filepaths[2]: True,
+    }
@@ -0,0 +1,100 @@
+import os
+import time
+import tempfile
+
+import pytest
+
+from common.ayon_common.distribution.garbage_collector import (
+    lease_directories,
+    release_leases,
+    collect_garbage,
+    is_lease_recent,
+    _get_state_store,
+)
+from common.ayon_common.distribution.trash import wait_for_trash_cleanup
+
+
+@pytest.fixture
+def temp_folder():
+    yield tempfile.mkdtemp(prefix="ayon_test_")
+
+
+def _create_addon_dir(root, dirname, size):
+    dirpath = os.path.join(root, dirname)
+    os.makedirs(dirpath)
+    with open(os.path.join(dirpath, "content.bin"), "wb") as stream:
+        stream.write(b"0" * size)
+    return dirpath
+
+
+def test_collect_garbage(printer, temp_folder):
+    root = os.path.join(temp_folder, "addons")
+    store = _get_state_store(root)
+    store.set_addon_versions({
+        "addon": {
+            version: {"distributed_dt": ""}
+            for version in ("1.0.0", "1.1.0", "1.2.0", "1.3.0")
+        }
+    })
+    dirpaths = [
+        _create_addon_dir(root, f"addon_{version}", 1000)
+        for version in ("1.0.0", "1.1.0", "1.2.0", "1.3.0")
+    ]
+    for idx, dirpath in enumerate(dirpaths):
+        store.set_last_used([os.path.basename(dirpath)], 1000 + idx)
+
+    # Oldest version is used by running process
+    lease_directories([dirpaths[0]])
+    try:
+        removed = collect_garbage([root], quota=2500)
+    finally:
+        release_leases()
+
+    assert removed == dirpaths[1:3]
+    assert os.path.exists(dirpaths[0]), "Leased directory was removed"
+    assert os.path.exists(dirpaths[3]), "Recently used directory was removed"
+    assert set(store.get_addon_versions("addon")) == {"1.0.0", "1.3.0"}
+    assert wait_for_trash_cleanup(10), "Trash was not emptied"
+
+    # Lease was released, but directory was used recently
+    assert collect_garbage([root], quota=0) == [dirpaths[3]]
+    # Leased directory was used most recently
+    assert collect_garbage([root], quota=0, grace_period=0) == [dirpaths[0]]
+
+
+def test_collect_garbage_shared_storage(printer, temp_folder, monkeypatch):
+    monkeypatch.setenv("AYON_SHARED_STORAGE", "1")
+    monkeypatch.setenv(
+        "AYON_LAUNCHER_LOCAL_DIR", os.path.join(temp_folder, "local")
+    )
+    root = os.path.join(temp_folder, "addons")
+    dirpaths = [
+        _create_addon_dir(root, f"addon_{version}", 1000)
+        for version in ("1.0.0", "1.1.0")
+    ]
+    lease_directories([dirpaths[0]])
+    release_leases()
+
+    # Database must not be located on shared storage
+    assert not os.path.exists(os.path.join(root, "launcher_state.db"))
+    store_path = _get_state_store(root).filepath
+    assert store_path.startswith(os.path.join(temp_folder, "local"))
+
+    # Usage recorded by other machine is visible through usage markers
+    usage_path = os.path.join(root, ".usage", "addon_1.1.0")
+    with open(usage_path, "w"):
+        pass
+    os.utime(usage_path, (2 ** 31, 2 ** 31))
+    assert collect_garbage(
+        [root], quota=1500, grace_period=0
+    ) == [dirpaths[0]]
+    assert not os.path.exists(
+        os.path.join(root, ".usage", "addon_1.0.0")
+    ), "Usage marker of removed directory was kept"
+    assert wait_for_trash_cleanup(10), "Trash was not emptied"
+
+
+def test_is_lease_recent(printer):
+    assert is_lease_recent(time.time())
+    assert not is_lease_recent(None)
+    assert not is_lease_recent(time.time() - 24 * 60 * 60)
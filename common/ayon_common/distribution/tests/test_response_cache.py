@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import ayon_api
+import pytest
+
+from common.ayon_common.distribution.response_cache import ResponseCache
+
+
+@pytest.fixture
+def temp_folder():
+    yield tempfile.mkdtemp(prefix="ayon_test_")
+
+
+class _ServerState:
+    def __init__(self):
+        self.etag = '"1"'
+        self.bundles = {"bundles": [{"name": "Bundle"}]}
+        # Status codes of bundles requests
+        self.statuses = []
+        # User names by access token
+        self.users = {"token": "user", "new_token": "user", "other": "other"}
+
+
+@pytest.fixture
+def server():
+    state = _ServerState()
+
+    class _Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, data, headers=None):
+            content = json.dumps(data).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self):
+            if self.path in ("/", "/api/info"):
+                self._send_json({"version": "1.0.0"})
+            elif self.path == "/api/users/me":
+                authorization = self.headers.get("Authorization") or ""
+                token = authorization.split(" ")[-1]
+                self._send_json(
+                    {"name": state.users.get(token), "isService": False}
+                )
+            elif self.path == "/api/bundles":
+                if self.headers.get("If-None-Match") == state.etag:
+                    state.statuses.append(304)
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                state.statuses.append(200)
+                self._send_json(state.bundles, {"ETag": state.etag})
+            else:
+                self.send_response(404)
+                self.end_headers()
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        yield state
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_response_cache(printer, temp_folder, server):
+    cache = ResponseCache(temp_folder)
+    con = ayon_api.ServerAPI(server.url, token="token")
+
+    assert cache.get("bundles", con) == server.bundles
+    assert cache.get("bundles", con) == server.bundles
+    assert server.statuses == [200, 304]
+
+    # Changed data on server
+    server.etag = '"2"'
+    server.bundles = {"bundles": []}
+    assert cache.get("bundles", con) == {"bundles": []}
+    assert server.statuses == [200, 304, 200]
+
+    # Same user with new access token uses cached response
+    new_con = ayon_api.ServerAPI(server.url, token="new_token")
+    assert cache.get("bundles", new_con) == {"bundles": []}
+    assert server.statuses == [200, 304, 200, 304]
+
+    # Other user must not use cached response
+    other_con = ayon_api.ServerAPI(server.url, token="other")
+    assert cache.get("bundles", other_con) == {"bundles": []}
+    assert server.statuses == [200, 304, 200, 304, 200]
+
+
+def test_response_cache_prune(printer, temp_folder, server):
+    cache = ResponseCache(temp_folder)
+    con = ayon_api.ServerAPI(server.url, token="token")
+    assert cache.get("bundles", con) == server.bundles
+
+    filepath = cache.get_filepath(server.url, "user", "bundles")
+    assert os.path.exists(filepath)
+
+    cache.prune()
+    assert os.path.exists(filepath)
+
+    old_time = time.time() - 31 * 24 * 60 * 60
+    os.utime(filepath, (old_time, old_time))
+    cache.prune()
+    assert not os.path.exists(filepath)
@@ -0,0 +1,71 @@
+import os
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from common.ayon_common.state_store import StateStore
+
+
+@pytest.fixture
+def temp_folder():
+    yield tempfile.mkdtemp(prefix="ayon_test_")
+
+
+def test_state_store(printer, temp_folder):
+    legacy_path = os.path.join(temp_folder, "addons.json")
+    with open(legacy_path, "w") as stream:
+        json.dump({"addon": {"1.0.0": {"checksum": "abc"}}}, stream)
+
+    store = StateStore(os.path.join(temp_folder, "launcher_state.db"))
+    store.migrate_json_file(
+        "addons", legacy_path, store.write_addon_versions
+    )
+    assert store.get_addon_version("addon", "1.0.0") == {"checksum": "abc"}
+
+    # Migration is done only once
+    store.set_addon_versions({"addon": {"1.0.0": {"checksum": "def"}}})
+    store.migrate_json_file(
+        "addons", legacy_path, store.write_addon_versions
+    )
+    assert store.get_addon_version("addon", "1.0.0") == {"checksum": "def"}
+
+    # Concurrent writers must not lose changes of each other
+    def _add_version(idx):
+        other_store = StateStore(store.filepath)
+        other_store.set_addon_versions({"addon": {f"2.0.{idx}": {}}})
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(_add_version, range(32)))
+
+    assert len(store.get_addon_versions("addon")) == 33
+    assert store.get_addon_version("addon", "3.0.0") is None
+
+
+def test_verified_files_cache(printer, temp_folder, monkeypatch):
+    from common.ayon_common import utils
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    filepath = os.path.join(temp_folder, "package.zip")
+    with open(filepath, "wb") as stream:
+        stream.write(b"content")
+    checksum = utils.calculate_file_checksum(filepath, "sha256")
+
+    calculated = []
+    calculate_file_checksum = utils.calculate_file_checksum
+
+    def _calculate(*args, **kwargs):
+        calculated.append(args)
+        return calculate_file_checksum(*args, **kwargs)
+
+    monkeypatch.setattr(utils, "calculate_file_checksum", _calculate)
+    assert utils.validate_file_checksum(filepath, checksum, "sha256")
+    assert utils.validate_file_checksum(filepath, checksum, "sha256")
+    assert not utils.validate_file_checksum(filepath, "invalid", "sha256")
+    assert len(calculated) == 1, "Unchanged file was hashed again"
+
+    with open(filepath, "wb") as stream:
+        stream.write(b"changed content")
+    assert not utils.validate_file_checksum(filepath, checksum, "sha256")
+    assert len(calculated) == 2, "Changed file was not hashed"
@@ -0,0 +1,147 @@
+"""Deferred removal of replaced directories.
+
+Removing a big directory tree (e.g. dependency package) can take a long
+time. Directories are instead renamed into a trash folder next to them,
+which is fast on the same volume, and removed by a background thread.
+
+Trash folders that were not emptied (e.g. process was closed during
+removal) are emptied next time a directory is moved to the same trash
+folder or when 'schedule_trash_cleanup' is called.
+"""
+
+import os
+import uuid
+import shutil
+import logging
+import threading
+import collections
+
+TRASH_DIRNAME = ".trash"
+
+
+class _TrashCleaner:
+    """Remove content of trash folders in a background thread."""
+
+    log = logging.getLogger("TrashCleaner")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = collections.deque()
+        self._thread = None
+        self._idle_event = threading.Event()
+        self._idle_event.set()
+
+    def schedule(self, trash_dirpath):
+        with self._lock:
+            if trash_dirpath not in self._queue:
+                self._queue.append(trash_dirpath)
+            self._idle_event.clear()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="ayon_trash_cleaner",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def wait(self, timeout=None):
+        return self._idle_event.wait(timeout)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._thread = None
+                    self._idle_event.set()
+                    return
+                trash_dirpath = self._queue.popleft()
+            self._empty_trash(trash_dirpath)
+
+    def _empty_trash(self, trash_dirpath):
+        if not os.path.isdir(trash_dirpath):
+            return
+
+        for name in os.listdir(trash_dirpath):
+            path = os.path.join(trash_dirpath, name)
+            try:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError:
+                self.log.warning(
+                    f"Failed to remove '{path}' from trash", exc_info=True
+                )
+
+        try:
+            os.rmdir(trash_dirpath)
+        except OSError:
+            # Folder is not empty, something new was moved in
+            pass
+
+
+_cleaner = _TrashCleaner()
+
+
+def get_trash_dirpath(dirpath):
+    """Trash folder used for a directory.
+
+    Args:
+        dirpath (str): Path to a directory.
+
+    Returns:
+        str: Path to trash folder next to the directory.
+    """
+
+    return os.path.join(
+        os.path.dirname(os.path.normpath(dirpath)), TRASH_DIRNAME
+    )
+
+
+def move_to_trash(dirpath, trash_dirpath=None):
+    """Move directory to trash folder and schedule its removal.
+
+    Args:
+        dirpath (str): Path to a directory to remove.
+        trash_dirpath (Optional[str]): Trash folder where directory is
+            moved. Must be on the same volume. Folder next to the directory
+            is used if not passed.
+
+    Returns:
+        str: Path to directory in trash.
+    """
+
+    if trash_dirpath is None:
+        trash_dirpath = get_trash_dirpath(dirpath)
+    os.makedirs(trash_dirpath, exist_ok=True)
+    basename = os.path.basename(os.path.normpath(dirpath))
+    trash_path = os.path.join(
+        trash_dirpath, f"{basename}_{uuid.uuid4().hex}"
+    )
+    os.replace(dirpath, trash_path)
+    _cleaner.schedule(trash_dirpath)
+    return trash_path
+
+
+def schedule_trash_cleanup(trash_dirpath):
+    """Remove content of trash folder in background.
+
+    Args:
+        trash_dirpath (str): Path to trash folder.
+    """
+
+    if os.path.isdir(trash_dirpath):
+        _cleaner.schedule(trash_dirpath)
+
+
+def wait_for_trash_cleanup(timeout=None):
+    """Wait until all scheduled trash folders are emptied.
+
+    Args:
+        timeout (Optional[float]): Maximum time to wait in seconds.
+
+    Returns:
+        bool: Cleanup finished.
+    """
+
+    return _cleaner.wait(timeout)
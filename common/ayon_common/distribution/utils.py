@@ -1,9 +1,20 @@
 import os
 import json
+import hashlib
 import subprocess
 import tempfile
 
-from ayon_common.utils import get_launcher_storage_dir, get_ayon_launch_args
+from ayon_common.utils import (
+    get_launcher_storage_dir,
+    get_launcher_local_dir,
+    get_ayon_launch_args,
+)
+from ayon_common.state_store import STATE_STORE_FILENAME, get_state_store
+
+from .locks import is_shared_storage_enabled
+
+# Local directory with state stores of shared storage folders
+SHARED_STATE_DIRNAME = "shared_storage"
 
 
 def get_addons_dir():
@@ -50,6 +61,76 @@ def get_dependencies_dir():
     return dependencies_dir
 
 
+def get_artifacts_dir():
+    """Directory where are cached downloaded archives.
+
+    Archives are stored by their checksum, so the same archive is
+        downloaded only once.
+
+    The path is stored into environment variable 'AYON_ARTIFACTS_DIR'.
+    Value of environment variable can be overriden, but we highly recommended
+    to use that option only for development purposes.
+
+    Returns:
+        str: Path to directory where archives are cached.
+    """
+
+    artifacts_dir = os.environ.get("AYON_ARTIFACTS_DIR")
+    if not artifacts_dir:
+        artifacts_dir = get_launcher_storage_dir(
+            "artifacts", create=True
+        )
+        os.environ["AYON_ARTIFACTS_DIR"] = artifacts_dir
+    return artifacts_dir
+
+
+def get_chunks_dir():
+    """Directory where are stored chunks of chunked distribution.
+
+    The path is stored into environment variable 'AYON_CHUNKS_DIR'.
+    Value of environment variable can be overriden, but we highly recommended
+    to use that option only for development purposes.
+
+    Returns:
+        str: Path to chunk store directory.
+    """
+
+    chunks_dir = os.environ.get("AYON_CHUNKS_DIR")
+    if not chunks_dir:
+        chunks_dir = get_launcher_storage_dir(
+            "chunks", create=True
+        )
+        os.environ["AYON_CHUNKS_DIR"] = chunks_dir
+    return chunks_dir
+
+
+def get_distribution_state_store(root):
+    """State store of distributed directories in a folder.
+
+    Store is located in the folder. When launcher storage is shared by
+        multiple machines, store of each machine is located in launcher
+        local directory, because SQLite locking is not reliable on network
+        filesystems. State shared between machines is stored in files
+        (completion markers, leases and usage markers) in the folder.
+
+    Args:
+        root (str): Folder with distributed directories.
+
+    Returns:
+        StateStore: State store object.
+    """
+
+    if not is_shared_storage_enabled():
+        return get_state_store(os.path.join(root, STATE_STORE_FILENAME))
+
+    root_hash = hashlib.sha256(
+        os.path.normpath(os.path.abspath(root)).encode("utf-8")
+    ).hexdigest()[:16]
+    return get_state_store(get_launcher_local_dir(
+        SHARED_STATE_DIRNAME, root_hash, STATE_STORE_FILENAME
+    ))
+
+
 def show_missing_bundle_information(url, bundle_name=None, username=None):
     """Show missing bundle information window.
 
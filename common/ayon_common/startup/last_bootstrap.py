@@ -0,0 +1,219 @@
+"""Last successful bootstrap used for offline-first startup.
+
+AYON launcher stores result of each successful bootstrap (bundle, settings
+variant, python paths) to launcher local directory. When offline-first
+mode is enabled with 'AYON_OFFLINE_FIRST' environment variable set to
+'1', the launcher starts right away from the stored result and
+revalidates the bundle with server in background.
+
+Stored result is used only if it was validated with server in last
+'AYON_OFFLINE_FIRST_MAX_AGE' seconds, and only for the same server,
+user, AYON launcher version and requested bundle or variant. When
+revalidation finds out that bundle changed on server, the result is
+marked as changed and next launch does full bootstrap. Result is also not
+used again until the revalidation finishes, so result that could not be
+revalidated (e.g. server was not reachable) is used only once.
+
+Strict mode, enabled with 'AYON_STRICT_BOOTSTRAP' set to '1', never uses
+results that were not validated with server. It is meant for farm
+machines which must use current bundle.
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+from typing import Optional, Dict, Any
+
+from ayon_api.constants import SERVER_URL_ENV_KEY, SERVER_API_ENV_KEY
+
+from ayon_common.utils import get_launcher_local_dir
+
+LAST_BOOTSTRAP_VERSION = 2
+LAST_BOOTSTRAP_DIRNAME = "last_bootstrap"
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+# Environment variables defining what is bootstrapped
+_KEY_ENV_KEYS = (
+    "AYON_VERSION",
+    "AYON_BUNDLE_NAME",
+    "AYON_USE_DEV",
+    "AYON_USE_STAGING",
+    SERVER_URL_ENV_KEY,
+)
+
+
+def is_strict_bootstrap_enabled() -> bool:
+    """Bootstrap must use bundle validated with server.
+
+    Returns:
+        bool: Strict mode is enabled.
+
+    """
+    return os.getenv("AYON_STRICT_BOOTSTRAP") == "1"
+
+
+def is_offline_first_enabled() -> bool:
+    """Bootstrap can start from last successful bootstrap.
+
+    Offline-first mode is never enabled in strict mode.
+
+    Returns:
+        bool: Offline-first mode is enabled.
+
+    """
+    return (
+        os.getenv("AYON_OFFLINE_FIRST") == "1"
+        and not is_strict_bootstrap_enabled()
+    )
+
+
+def get_offline_first_max_age() -> float:
+    """Maximum time since last successful validation with server.
+
+    Returns:
+        float: Maximum age in seconds.
+
+    """
+    value = os.getenv("AYON_OFFLINE_FIRST_MAX_AGE")
+    if not value:
+        return DEFAULT_MAX_AGE
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        return DEFAULT_MAX_AGE
+
+
+def get_last_bootstrap_key() -> Optional[str]:
+    """Key of last bootstrap based on current environment.
+
+    Key must be created before bootstrap changes environment variables.
+
+    Returns:
+        Optional[str]: Key or None if server url or api key is not set.
+
+    """
+    api_key = os.getenv(SERVER_API_ENV_KEY)
+    if not os.getenv(SERVER_URL_ENV_KEY) or not api_key:
+        return None
+
+    content = json.dumps([
+        hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+        *(os.getenv(env_key) for env_key in _KEY_ENV_KEYS)
+    ])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _get_filepath(key: str) -> str:
+    return os.path.join(
+        get_launcher_local_dir(LAST_BOOTSTRAP_DIRNAME), f"{key}.json"
+    )
+
+
+def _read(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_get_filepath(key), "r") as stream:
+            entry = json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(entry, dict)
+        or entry.get("version") != LAST_BOOTSTRAP_VERSION
+        or not isinstance(entry.get("data"), dict)
+    ):
+        return None
+    return entry
+
+
+def _write(key: str, entry: Dict[str, Any]):
+    filepath = _get_filepath(key)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    tmp_filepath = f"{filepath}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_filepath, "w") as stream:
+        json.dump(entry, stream)
+    os.replace(tmp_filepath, filepath)
+
+
+def store_last_bootstrap(key: str, data: Dict[str, Any]):
+    """Store result of bootstrap validated with server.
+
+    Args:
+        key (str): Key from 'get_last_bootstrap_key'.
+        data (Dict[str, Any]): Bootstrap result.
+
+    """
+    _write(key, {
+        "version": LAST_BOOTSTRAP_VERSION,
+        "validated": time.time(),
+        "changed": None,
+        "pending": False,
+        "data": data,
+    })
+
+
+def load_last_bootstrap(key: str) -> Optional[Dict[str, Any]]:
+    """Load last successful bootstrap.
+
+    Returns:
+        Optional[Dict[str, Any]]: Stored entry with bootstrap result under
+            'data', time of last validation under 'validated' and message
+            under 'changed' if bundle changed on server. None if there
+            is no entry, if was not validated recently or if its
+            revalidation did not finish.
+
+    """
+    entry = _read(key)
+    if (
+        entry is None
+        or entry.get("pending")
+        or time.time() - entry["validated"] > get_offline_first_max_age()
+    ):
+        return None
+    return entry
+
+
+def mark_last_bootstrap_validated(key: str):
+    """Bundle of last bootstrap did not change on server.
+
+    Args:
+        key (str): Key from 'get_last_bootstrap_key'.
+
+    """
+    entry = _read(key)
+    if entry is not None:
+        entry["validated"] = time.time()
+        entry["pending"] = False
+        _write(key, entry)
+
+
+def mark_last_bootstrap_pending(key: str):
+    """Last bootstrap was used and its revalidation did start.
+
+    Next launch won't use the last bootstrap until the revalidation
+    finishes, see 'mark_last_bootstrap_validated'.
+
+    Args:
+        key (str): Key from 'get_last_bootstrap_key'.
+
+    """
+    entry = _read(key)
+    if entry is not None:
+        entry["pending"] = True
+        _write(key, entry)
+
+
+def mark_last_bootstrap_changed(key: str, message: str):
+    """Bundle of last bootstrap changed on server.
+
+    Next launch won't use the last bootstrap.
+
+    Args:
+        key (str): Key from 'get_last_bootstrap_key'.
+        message (str): Message about the change.
+
+    """
+    entry = _read(key)
+    if entry is not None:
+        entry["changed"] = message
+        _write(key, entry)
@@ -0,0 +1,187 @@
+"""Snapshot of bootstrap result for child AYON launcher processes.
+
+AYON launcher process stores result of bootstrap (bundle, settings
+variant, python paths) to a snapshot file after bootstrap. Path to the
+file is passed to child processes via environment variable, so they can
+skip connection validation and distribution. Environment variables set
+by bootstrap are inherited by child processes, so they are not stored.
+
+Snapshot is signed with HMAC using key derived from server url and api
+key, and has to have the same modification time as when it was created.
+Snapshot is not used if it is older than 'AYON_BOOTSTRAP_SNAPSHOT_MAX_AGE'
+seconds, if it was created by different AYON launcher version or for
+different server, bundle or variant than child process requires.
+
+Snapshots can be disabled with 'AYON_USE_BOOTSTRAP_SNAPSHOT' environment
+variable set to '0'.
+"""
+
+import os
+import json
+import time
+import hmac
+import uuid
+import hashlib
+from typing import Optional, Dict, Any
+
+from ayon_api.constants import SERVER_URL_ENV_KEY, SERVER_API_ENV_KEY
+
+from ayon_common.utils import get_launcher_local_dir
+
+SNAPSHOT_ENV_KEY = "AYON_BOOTSTRAP_SNAPSHOT"
+SNAPSHOT_MTIME_ENV_KEY = "AYON_BOOTSTRAP_SNAPSHOT_MTIME"
+SNAPSHOT_VERSION = 1
+SNAPSHOTS_DIRNAME = "bootstrap_snapshots"
+DEFAULT_MAX_AGE = 24 * 60 * 60
+# Environment variables that must match between parent and child process
+_MATCHING_ENV_KEYS = (
+    "AYON_VERSION",
+    "AYON_BUNDLE_NAME",
+    "AYON_USE_DEV",
+    "AYON_USE_STAGING",
+    SERVER_URL_ENV_KEY,
+)
+
+
+def is_snapshot_enabled() -> bool:
+    """Bootstrap snapshots are enabled.
+
+    Returns:
+        bool: Snapshots are enabled.
+
+    """
+    return os.getenv("AYON_USE_BOOTSTRAP_SNAPSHOT") != "0"
+
+
+def get_snapshot_max_age() -> float:
+    """Maximum age of snapshot that can be used.
+
+    Returns:
+        float: Maximum age in seconds.
+
+    """
+    value = os.getenv("AYON_BOOTSTRAP_SNAPSHOT_MAX_AGE")
+    if not value:
+        return DEFAULT_MAX_AGE
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        return DEFAULT_MAX_AGE
+
+
+def _get_signing_key() -> Optional[bytes]:
+    server_url = os.getenv(SERVER_URL_ENV_KEY)
+    api_key = os.getenv(SERVER_API_ENV_KEY)
+    if not server_url or not api_key:
+        return None
+    return hashlib.sha256(
+        f"{server_url}|{api_key}".encode("utf-8")
+    ).digest()
+
+
+def _sign(key: bytes, content: str) -> str:
+    return hmac.new(key, content.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _cleanup_snapshots(dirpath: str, max_age: float):
+    now = time.time()
+    try:
+        filenames = os.listdir(dirpath)
+    except OSError:
+        return
+
+    for filename in filenames:
+        path = os.path.join(dirpath, filename)
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def store_bootstrap_snapshot(data: Dict[str, Any]) -> Optional[str]:
+    """Store bootstrap snapshot for child processes.
+
+    Environment variables pointing to the snapshot are set in current
+    process, so child processes inherit them.
+
+    Args:
+        data (Dict[str, Any]): Bootstrap result with 'bundle_name',
+            'python_paths', 'sys_paths', 'disk_mapped' and 'disk_mapping'
+            keys.
+
+    Returns:
+        Optional[str]: Path to snapshot file or None if snapshot
+            can't be created.
+
+    """
+    key = _get_signing_key()
+    if key is None or not is_snapshot_enabled():
+        return None
+
+    dirpath = get_launcher_local_dir(SNAPSHOTS_DIRNAME)
+    _cleanup_snapshots(dirpath, get_snapshot_max_age())
+
+    content = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "created": time.time(),
+        "matching_env": {
+            env_key: os.getenv(env_key)
+            for env_key in _MATCHING_ENV_KEYS
+        },
+        "data": data,
+    })
+    filepath = os.path.join(
+        dirpath, f"{os.getpid()}_{uuid.uuid4().hex}.json"
+    )
+    os.makedirs(dirpath, exist_ok=True)
+    tmp_filepath = f"{filepath}.tmp"
+    with open(tmp_filepath, "w") as stream:
+        json.dump({"content": content, "hmac": _sign(key, content)}, stream)
+    os.replace(tmp_filepath, filepath)
+
+    os.environ[SNAPSHOT_ENV_KEY] = filepath
+    os.environ[SNAPSHOT_MTIME_ENV_KEY] = str(os.stat(filepath).st_mtime_ns)
+    return filepath
+
+
+def load_bootstrap_snapshot() -> Optional[Dict[str, Any]]:
+    """Load bootstrap snapshot created by parent process.
+
+    Returns:
+        Optional[Dict[str, Any]]: Bootstrap result stored by parent process
+            or None if snapshot is not available or valid.
+
+    """
+    filepath = os.getenv(SNAPSHOT_ENV_KEY)
+    expected_mtime = os.getenv(SNAPSHOT_MTIME_ENV_KEY)
+    if not filepath or not expected_mtime or not is_snapshot_enabled():
+        return None
+
+    key = _get_signing_key()
+    if key is None:
+        return None
+
+    try:
+        if str(os.stat(filepath).st_mtime_ns) != expected_mtime:
+            return None
+        with open(filepath, "r") as stream:
+            signed = json.load(stream)
+        content = signed["content"]
+        if not hmac.compare_digest(_sign(key, content), signed["hmac"]):
+            return None
+        snapshot = json.loads(content)
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+    if (
+        snapshot.get("version") != SNAPSHOT_VERSION
+        or time.time() - snapshot["created"] > get_snapshot_max_age()
+    ):
+        return None
+
+    matching_env = snapshot["matching_env"]
+    for env_key in _MATCHING_ENV_KEYS:
+        if os.getenv(env_key) != matching_env.get(env_key):
+            return None
+    return snapshot["data"]
@@ -0,0 +1,792 @@
+"""Transactional store of launcher state.
+
+State of launcher (distributed addons and dependency packages and their
+usage, known executables, used servers, checksums of verified files) is
+stored in SQLite database. Database allows concurrent launcher processes
+to change the state without rewriting whole file and without losing
+changes of other processes.
+
+Journal mode can be changed with 'AYON_STATE_STORE_JOURNAL_MODE'
+environment variable. Default 'WAL' mode requires shared memory, which
+is not available on network drives. Use e.g. 'DELETE' when the store is
+located on a network drive.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import contextlib
+from typing import Optional, Dict, List, Any, Callable, Iterator
+
+STATE_STORE_FILENAME = "launcher_state.db"
+SCHEMA_VERSION = 1
+BUSY_TIMEOUT = 30
+# Maximum number of remembered verified files
+MAX_VERIFIED_FILES = 1000
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS addons (
+        name TEXT NOT NULL,
+        version TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (name, version)
+    )""",
+    """CREATE TABLE IF NOT EXISTS dependency_packages (
+        filename TEXT PRIMARY KEY,
+        data TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS executables (
+        executable TEXT PRIMARY KEY,
+        version TEXT,
+        added TEXT
+    )""",
+    """CREATE INDEX IF NOT EXISTS executables_version
+        ON executables (version)""",
+    """CREATE TABLE IF NOT EXISTS distribution_journal (
+        dirpath TEXT PRIMARY KEY,
+        started TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS directory_usage (
+        dirname TEXT PRIMARY KEY,
+        last_used REAL,
+        size INTEGER
+    )""",
+    """CREATE TABLE IF NOT EXISTS verified_files (
+        path TEXT NOT NULL,
+        algorithm TEXT NOT NULL,
+        size INTEGER,
+        mtime_ns INTEGER,
+        inode TEXT,
+        checksum TEXT NOT NULL,
+        verified REAL,
+        PRIMARY KEY (path, algorithm)
+    )""",
+    """CREATE TABLE IF NOT EXISTS servers (
+        url TEXT PRIMARY KEY,
+        username TEXT,
+        updated_dt TEXT
+    )""",
+)
+
+
+def _get_journal_mode(default: Optional[str] = None) -> str:
+    journal_mode = (
+        os.getenv("AYON_STATE_STORE_JOURNAL_MODE") or default or "WAL"
+    )
+    journal_mode = journal_mode.upper()
+    if journal_mode not in (
+        "WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"
+    ):
+        journal_mode = "WAL"
+    return journal_mode
+
+
+class StateStore:
+    """Launcher state stored in SQLite database.
+
+    Each call opens own short-lived connection, so the object can be used
+    from multiple threads. Multiple processes can use the same database.
+
+    Args:
+        filepath (str): Path to database file.
+        journal_mode (Optional[str]): Default journal mode of database.
+            'WAL' is used if not passed.
+
+    """
+    def __init__(self, filepath: str, journal_mode: Optional[str] = None):
+        self._filepath = filepath
+        self._journal_mode = journal_mode
+        self._schema_lock = threading.Lock()
+        self._schema_created = False
+
+    @property
+    def filepath(self) -> str:
+        return self._filepath
+
+    def _connect(self) -> sqlite3.Connection:
+        dirpath = os.path.dirname(self._filepath)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        conn = sqlite3.connect(
+            self._filepath, timeout=BUSY_TIMEOUT, isolation_level=None
+        )
+        if not self._schema_created:
+            with self._schema_lock:
+                if not self._schema_created:
+                    self._create_schema(conn)
+                    self._schema_created = True
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        journal_mode = _get_journal_mode(self._journal_mode)
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)",
+                ("schema_version", json.dumps(SCHEMA_VERSION))
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction.
+
+        Transaction is started immediately, so concurrent writers wait
+        for each other instead of failing on upgrade of the lock.
+
+        Yields:
+            sqlite3.Connection: Connection with started transaction.
+
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @contextlib.contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    # --- Meta values ---
+    @staticmethod
+    def read_value(conn: sqlite3.Connection, key: str) -> Any:
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    @staticmethod
+    def write_value(conn: sqlite3.Connection, key: str, value: Any):
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (key, json.dumps(value))
+        )
+
+    def get_value(self, key: str) -> Any:
+        with self._read() as conn:
+            return self.read_value(conn, key)
+
+    def set_value(self, key: str, value: Any):
+        with self.transaction() as conn:
+            self.write_value(conn, key, value)
+
+    def migrate_json_file(
+        self,
+        migration_name: str,
+        filepath: str,
+        import_func: Callable[[sqlite3.Connection, Any], None],
+    ):
+        """Import legacy json file once.
+
+        The json file is not removed, so older versions of launcher can
+        still read it.
+
+        Args:
+            migration_name (str): Unique name of migration.
+            filepath (str): Path to json file.
+            import_func (Callable[[sqlite3.Connection, Any], None]): Function
+                importing loaded data using passed connection.
+
+        """
+        key = f"migrated_{migration_name}"
+        if self.get_value(key):
+            return
+
+        with self.transaction() as conn:
+            # Other process could migrate the file in the meantime
+            if self.read_value(conn, key):
+                return
+            data = None
+            if os.path.exists(filepath):
+                try:
+                    with open(filepath, "r") as stream:
+                        data = json.load(stream)
+                except (ValueError, OSError):
+                    print(f"Failed to read {filepath} for migration")
+            if data:
+                try:
+                    import_func(conn, data)
+                except (AttributeError, KeyError, TypeError, ValueError):
+                    print(f"Failed to migrate content of {filepath}")
+            self.write_value(conn, key, True)
+
+    # --- Addons ---
+    @staticmethod
+    def write_addon_versions(
+        conn: sqlite3.Connection,
+        addons_information: Dict[str, Dict[str, Any]]
+    ):
+        conn.executemany(
+            "INSERT OR REPLACE INTO addons (name, version, data)"
+            " VALUES (?, ?, ?)",
+            [
+                (addon_name, addon_version, json.dumps(version_data))
+                for addon_name, versions in addons_information.items()
+                for addon_version, version_data in versions.items()
+            ]
+        )
+
+    def set_addon_versions(
+        self,
+        addons_information: Dict[str, Dict[str, Any]],
+        finished_dirpaths: Optional[List[str]] = None,
+    ):
+        """Store information about distributed addon versions.
+
+        Args:
+            addons_information (Dict[str, Dict[str, Any]]): Data by addon
+                name and version.
+            finished_dirpaths (Optional[List[str]]): Directories of which
+                journal entries are removed in the same transaction.
+
+        """
+        with self.transaction() as conn:
+            self.write_addon_versions(conn, addons_information)
+            self.remove_journal_entries(conn, finished_dirpaths or [])
+
+    def get_addons(self) -> Dict[str, Dict[str, Any]]:
+        """Information about all distributed addon versions.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Data by addon name and version.
+
+        """
+        output = {}
+        with self._read() as conn:
+            for name, version, data in conn.execute(
+                "SELECT name, version, data FROM addons"
+            ):
+                output.setdefault(name, {})[version] = json.loads(data)
+        return output
+
+    def get_addon_versions(self, addon_name: str) -> Dict[str, Any]:
+        """Information about distributed versions of an addon.
+
+        Args:
+            addon_name (str): Addon name.
+
+        Returns:
+            Dict[str, Any]: Data by addon version.
+
+        """
+        with self._read() as conn:
+            return {
+                version: json.loads(data)
+                for version, data in conn.execute(
+                    "SELECT version, data FROM addons WHERE name = ?",
+                    (addon_name,)
+                )
+            }
+
+    def get_addon_version(
+        self, addon_name: str, addon_version: str
+    ) -> Optional[Dict[str, Any]]:
+        """Information about distributed addon version.
+
+        Args:
+            addon_name (str): Addon name.
+            addon_version (str): Addon version.
+
+        Returns:
+            Optional[Dict[str, Any]]: Data or None if version was
+                not distributed.
+
+        """
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT data FROM addons WHERE name = ? AND version = ?",
+                (addon_name, addon_version)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    # --- Dependency packages ---
+    @staticmethod
+    def write_dependency_packages(
+        conn: sqlite3.Connection, packages_information: Dict[str, Any]
+    ):
+        conn.executemany(
+            "INSERT OR REPLACE INTO dependency_packages (filename, data)"
+            " VALUES (?, ?)",
+            [
+                (filename, json.dumps(data))
+                for filename, data in packages_information.items()
+            ]
+        )
+
+    def set_dependency_package(
+        self,
+        filename: str,
+        data: Dict[str, Any],
+        finished_dirpaths: Optional[List[str]] = None,
+    ):
+        """Store information about distributed dependency package.
+
+        Args:
+            filename (str): Dependency package filename.
+            data (Dict[str, Any]): Distribution information.
+            finished_dirpaths (Optional[List[str]]): Directories of which
+                journal entries are removed in the same transaction.
+
+        """
+        with self.transaction() as conn:
+            self.write_dependency_packages(conn, {filename: data})
+            self.remove_journal_entries(conn, finished_dirpaths or [])
+
+    def get_dependency_packages(self) -> Dict[str, Any]:
+        """Information about all distributed dependency packages.
+
+        Returns:
+            Dict[str, Any]: Data by package filename.
+
+        """
+        with self._read() as conn:
+            return {
+                filename: json.loads(data)
+                for filename, data in conn.execute(
+                    "SELECT filename, data FROM dependency_packages"
+                )
+            }
+
+    def get_dependency_package(
+        self, filename: str
+    ) -> Optional[Dict[str, Any]]:
+        """Information about distributed dependency package.
+
+        Args:
+            filename (str): Dependency package filename.
+
+        Returns:
+            Optional[Dict[str, Any]]: Data or None if package was
+                not distributed.
+
+        """
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT data FROM dependency_packages WHERE filename = ?",
+                (filename,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    # --- Distribution journal ---
+    @staticmethod
+    def remove_journal_entries(
+        conn: sqlite3.Connection, dirpaths: List[str]
+    ):
+        conn.executemany(
+            "DELETE FROM distribution_journal WHERE dirpath = ?",
+            [(dirpath, ) for dirpath in dirpaths]
+        )
+
+    def add_journal_entries(self, dirpaths: List[str], started: str):
+        """Record directories to which distribution started.
+
+        Entries are removed when distribution of the directory finishes,
+        so entries left after crash point to unfinished distributions.
+
+        Args:
+            dirpaths (List[str]): Paths to distributed directories.
+            started (str): Formatted time when distribution started.
+
+        """
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO distribution_journal"
+                " (dirpath, started) VALUES (?, ?)",
+                [(dirpath, started) for dirpath in dirpaths]
+            )
+
+    def finish_journal_entries(self, dirpaths: List[str]):
+        """Remove journal entries of finished distributions.
+
+        Args:
+            dirpaths (List[str]): Paths to distributed directories.
+
+        """
+        with self.transaction() as conn:
+            self.remove_journal_entries(conn, dirpaths)
+
+    def get_journal_entries(self) -> Dict[str, str]:
+        """Unfinished distributions.
+
+        Returns:
+            Dict[str, str]: Time when distribution started by directory.
+
+        """
+        with self._read() as conn:
+            return dict(conn.execute(
+                "SELECT dirpath, started FROM distribution_journal"
+            ))
+
+    # --- Directory usage ---
+    def set_last_used(self, dirnames: List[str], last_used: float):
+        """Record time when distributed directories were used.
+
+        Args:
+            dirnames (List[str]): Names of directories in folder of the store.
+            last_used (float): Timestamp of usage.
+
+        """
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO directory_usage (dirname)"
+                " VALUES (?)",
+                [(dirname, ) for dirname in dirnames]
+            )
+            conn.executemany(
+                "UPDATE directory_usage SET last_used = ?"
+                " WHERE dirname = ?",
+                [(last_used, dirname) for dirname in dirnames]
+            )
+
+    def set_directory_size(self, dirname: str, size: int):
+        """Store size of distributed directory.
+
+        Args:
+            dirname (str): Name of directory in folder of the store.
+            size (int): Size of directory content in bytes.
+
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO directory_usage (dirname)"
+                " VALUES (?)",
+                (dirname, )
+            )
+            conn.execute(
+                "UPDATE directory_usage SET size = ? WHERE dirname = ?",
+                (size, dirname)
+            )
+
+    def get_directory_usage(self) -> Dict[str, Dict[str, Any]]:
+        """Usage information of distributed directories.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Last usage timestamp and size
+                by directory name. Values can be None if not known.
+
+        """
+        with self._read() as conn:
+            return {
+                dirname: {"last_used": last_used, "size": size}
+                for dirname, last_used, size in conn.execute(
+                    "SELECT dirname, last_used, size FROM directory_usage"
+                )
+            }
+
+    def remove_distributed_directory(self, dirname: str):
+        """Remove all information about a distributed directory.
+
+        Metadata of addon version or dependency package distributed to
+        the directory are removed together with its usage information.
+
+        Args:
+            dirname (str): Name of directory in folder of the store.
+
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM addons WHERE name || '_' || version = ?",
+                (dirname, )
+            )
+            conn.execute(
+                "DELETE FROM dependency_packages WHERE filename = ?",
+                (dirname, )
+            )
+            conn.execute(
+                "DELETE FROM directory_usage WHERE dirname = ?",
+                (dirname, )
+            )
+
+    # --- Verified files ---
+    def get_verified_checksum(
+        self,
+        path: str,
+        algorithm: str,
+        size: int,
+        mtime_ns: int,
+        inode: int,
+    ) -> Optional[str]:
+        """Checksum of file calculated when it had the same stat.
+
+        Args:
+            path (str): Absolute path to file.
+            algorithm (str): Checksum algorithm.
+            size (int): Current size of file.
+            mtime_ns (int): Current modification time of file.
+            inode (int): Current inode of file.
+
+        Returns:
+            Optional[str]: Checksum or None if file was not verified
+                or changed since.
+
+        """
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT checksum FROM verified_files"
+                " WHERE path = ? AND algorithm = ? AND size = ?"
+                " AND mtime_ns = ? AND inode = ?",
+                (path, algorithm, size, mtime_ns, str(inode))
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def set_verified_checksum(
+        self,
+        path: str,
+        algorithm: str,
+        size: int,
+        mtime_ns: int,
+        inode: int,
+        checksum: str,
+        verified: float,
+    ):
+        """Remember checksum of file with its stat.
+
+        Only last 'MAX_VERIFIED_FILES' verified files are kept.
+
+        Args:
+            path (str): Absolute path to file.
+            algorithm (str): Checksum algorithm.
+            size (int): Size of file.
+            mtime_ns (int): Modification time of file.
+            inode (int): Inode of file.
+            checksum (str): Calculated checksum.
+            verified (float): Timestamp of verification.
+
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO verified_files"
+                " (path, algorithm, size, mtime_ns, inode, checksum, verified)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    path, algorithm, size, mtime_ns, str(inode),
+                    checksum, verified
+                )
+            )
+            conn.execute(
+                "DELETE FROM verified_files WHERE rowid NOT IN ("
+                " SELECT rowid FROM verified_files"
+                " ORDER BY verified DESC LIMIT ?)",
+                (MAX_VERIFIED_FILES, )
+            )
+
+    # --- Executables ---
+    @staticmethod
+    def write_executables(
+        conn: sqlite3.Connection, items: List[Dict[str, Any]]
+    ):
+        conn.executemany(
+            "INSERT OR REPLACE INTO executables (executable, version, added)"
+            " VALUES (?, ?, ?)",
+            [
+                (item["executable"], item.get("version"), item.get("added"))
+                for item in items
+                if item.get("executable")
+            ]
+        )
+
+    @staticmethod
+    def _executable_rows_to_items(rows) -> List[Dict[str, Any]]:
+        return [
+            {"version": version, "executable": executable, "added": added}
+            for executable, version, added in rows
+        ]
+
+    def set_executables(self, items: List[Dict[str, Any]]):
+        """Add or update executables.
+
+        Args:
+            items (List[Dict[str, Any]]): Items with 'executable', 'version'
+                and 'added' keys.
+
+        """
+        with self.transaction() as conn:
+            self.write_executables(conn, items)
+
+    def replace_executables(self, items: List[Dict[str, Any]]):
+        """Replace all executables.
+
+        Args:
+            items (List[Dict[str, Any]]): Items with 'executable', 'version'
+                and 'added' keys.
+
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM executables")
+            self.write_executables(conn, items)
+
+    def get_executables(self) -> List[Dict[str, Any]]:
+        """All known executables in order they were added.
+
+        Returns:
+            List[Dict[str, Any]]: Items with 'executable', 'version'
+                and 'added' keys.
+
+        """
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT executable, version, added FROM executables"
+                " ORDER BY rowid"
+            ).fetchall()
+        return self._executable_rows_to_items(rows)
+
+    def get_executable(self, executable: str) -> Optional[Dict[str, Any]]:
+        """Information about an executable.
+
+        Args:
+            executable (str): Path to executable.
+
+        Returns:
+            Optional[Dict[str, Any]]: Item with 'executable', 'version'
+                and 'added' keys or None if executable is not known.
+
+        """
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT executable, version, added FROM executables"
+                " WHERE executable = ?",
+                (executable,)
+            ).fetchall()
+        items = self._executable_rows_to_items(rows)
+        if items:
+            return items[0]
+        return None
+
+    def get_executables_by_version(
+        self, version: str
+    ) -> List[Dict[str, Any]]:
+        """Known executables of a version.
+
+        Args:
+            version (str): Executable version.
+
+        Returns:
+            List[Dict[str, Any]]: Items with 'executable', 'version'
+                and 'added' keys.
+
+        """
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT executable, version, added FROM executables"
+                " WHERE version = ? ORDER BY rowid",
+                (version,)
+            ).fetchall()
+        return self._executable_rows_to_items(rows)
+
+    # --- Servers ---
+    @staticmethod
+    def write_server(
+        conn: sqlite3.Connection,
+        url: str,
+        username: Optional[str],
+        updated_dt: Optional[str],
+    ):
+        conn.execute(
+            "INSERT OR REPLACE INTO servers (url, username, updated_dt)"
+            " VALUES (?, ?, ?)",
+            (url, username, updated_dt)
+        )
+
+    def set_server(
+        self,
+        url: str,
+        username: Optional[str],
+        updated_dt: Optional[str],
+        last_server: Optional[bool] = False,
+    ):
+        """Store information about used server.
+
+        Args:
+            url (str): Server url.
+            username (Optional[str]): Name of user used to log in.
+            updated_dt (Optional[str]): Formatted time of the login.
+            last_server (Optional[bool]): Mark server as last used.
+
+        """
+        with self.transaction() as conn:
+            self.write_server(conn, url, username, updated_dt)
+            if last_server:
+                self.write_value(conn, "last_server", url)
+
+    def remove_server(self, url: str):
+        """Remove server information.
+
+        Args:
+            url (str): Server url.
+
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM servers WHERE url = ?", (url,))
+            if self.read_value(conn, "last_server") == url:
+                self.write_value(conn, "last_server", None)
+
+    def get_servers(self) -> Dict[str, Dict[str, Any]]:
+        """Information about used servers.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Data by server url.
+
+        """
+        with self._read() as conn:
+            return {
+                url: {"updated_dt": updated_dt, "username": username}
+                for url, username, updated_dt in conn.execute(
+                    "SELECT url, username, updated_dt FROM servers"
+                )
+            }
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_state_store(
+    filepath: str, journal_mode: Optional[str] = None
+) -> StateStore:
+    """State store for a database file.
+
+    Args:
+        filepath (str): Path to database file.
+        journal_mode (Optional[str]): Default journal mode of database.
+
+    Returns:
+        StateStore: Store object, same object is returned for same path.
+
+    """
+    key = os.path.normcase(os.path.abspath(filepath))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = StateStore(filepath, journal_mode)
+            _stores[key] = store
+    return store
@@ -1,20 +1,29 @@
 import os
 import sys
+import time
 import platform
 import json
+import hashlib
+import logging
+import sqlite3
 import datetime
 import subprocess
 import zipfile
 import tarfile
 import warnings
 import shutil
+import threading
+import contextlib
 from uuid import UUID
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Iterable, List, Dict, Tuple, Any
 
 import appdirs
 import semver
 from ayon_api.constants import SITE_ID_ENV_KEY
 
+from .state_store import STATE_STORE_FILENAME, StateStore, get_state_store
+
 DATE_FMT = "%Y-%m-%d %H:%M:%S"
 CLEANUP_INTERVAL = 2  # days
 IS_BUILT_APPLICATION = getattr(sys, "frozen", False)
@@ -24,9 +33,17 @@ WIN_DOWNLOAD_FOLDER_ID = UUID("{374DE290-123F-4565-9164-39C4925E467B}")
 IMPLEMENTED_ARCHIVE_FORMATS = {
     ".zip", ".tar", ".tgz", ".tar.gz", ".tar.xz", ".tar.bz2"
 }
+# Archives with less members are extracted on single thread
+PARALLEL_EXTRACT_MIN_MEMBERS = 64
+MAX_EXTRACT_WORKERS = 8
+# Size of buffer used to read files for hashing
+HASH_CHUNK_SIZE = 1024 * 1024
+MAX_HASH_WORKERS = 8
 
 ExecutablesInfo = Dict[str, Any]
 
+log = logging.getLogger(__name__)
+
 
 def _get_ayon_appdirs(*args):
     """Local app data directory of AYON launcher.
@@ -78,8 +95,8 @@ def get_launcher_storage_dir(
 
     Storage directory is used for storing shims, addons, dependencies, etc.
 
-    It is not recommended, but the location can be shared across
-        multiple machines.
+    The location can be shared across multiple machines if shared storage
+        mode is enabled with 'AYON_SHARED_STORAGE' set to '1'.
 
     Note:
         This function should be called at least once on bootstrap.
@@ -221,6 +238,9 @@ def get_ayon_launch_args(*args: str) -> List[str]:
 def get_executables_info_filepath() -> str:
     """Get path to file where information about executables is stored.
 
+    Information is stored in launcher state store, the file is kept
+    up to date for AYON shim which reads it directly.
+
     Returns:
         str: Path to json file where executables info are stored.
 
@@ -228,6 +248,31 @@ def get_executables_info_filepath() -> str:
     return get_launcher_local_dir("executables.json")
 
 
+def _import_executables_info(conn, data: ExecutablesInfo):
+    StateStore.write_executables(conn, data.get("available_versions") or [])
+    last_cleanup = data.get("last_cleanup")
+    if last_cleanup:
+        StateStore.write_value(conn, "executables_last_cleanup", last_cleanup)
+
+
+def get_launcher_state_store() -> StateStore:
+    """State store in launcher local directory.
+
+    Content of legacy executables json file is imported on first access.
+
+    Returns:
+        StateStore: State store object.
+
+    """
+    store = get_state_store(get_launcher_local_dir(STATE_STORE_FILENAME))
+    store.migrate_json_file(
+        "executables",
+        get_executables_info_filepath(),
+        _import_executables_info,
+    )
+    return store
+
+
 def _get_default_executable_info() -> ExecutablesInfo:
     return {
         "file_version": "1.0.1",
@@ -235,24 +280,25 @@ def _get_default_executable_info() -> ExecutablesInfo:
     }
 
 
-def get_executables_info(
-    check_cleanup: Optional[bool] = True
-) -> ExecutablesInfo:
-    filepath = get_executables_info_filepath()
-    if not os.path.exists(filepath):
-        return _get_default_executable_info()
-    try:
-        with open(filepath, "r") as stream:
-            data = json.load(stream)
+def _export_executables_info(store: StateStore):
+    """Write executables info from state store to json file for shim."""
+    info = _get_default_executable_info()
+    info["available_versions"] = store.get_executables()
+    last_cleanup = store.get_value("executables_last_cleanup")
+    if last_cleanup:
+        info["last_cleanup"] = last_cleanup
 
-    except Exception:
-        return _get_default_executable_info()
+    filepath = get_executables_info_filepath()
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    tmp_filepath = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_filepath, "w") as stream:
+        json.dump(info, stream, indent=4)
+    os.replace(tmp_filepath, filepath)
 
-    if not check_cleanup:
-        return data
 
+def _cleanup_executables_if_needed(store: StateStore):
     last_cleanup = None
-    last_cleanup_info = data.get("last_cleanup")
+    last_cleanup_info = store.get_value("executables_last_cleanup")
     if last_cleanup_info:
         try:
             last_cleanup_value = last_cleanup_info["value"]
@@ -264,10 +310,23 @@ def get_executables_info(
 
     now = datetime.datetime.now()
     if last_cleanup and (now - last_cleanup).days < CLEANUP_INTERVAL:
-        return data
-
+        return
     cleanup_executables_info()
-    return get_executables_info(check_cleanup=False)
+
+
+def get_executables_info(
+    check_cleanup: Optional[bool] = True
+) -> ExecutablesInfo:
+    store = get_launcher_state_store()
+    if check_cleanup:
+        _cleanup_executables_if_needed(store)
+
+    info = _get_default_executable_info()
+    info["available_versions"] = store.get_executables()
+    last_cleanup = store.get_value("executables_last_cleanup")
+    if last_cleanup:
+        info["last_cleanup"] = last_cleanup
+    return info
 
 
 def store_executables_info(info: ExecutablesInfo):
@@ -276,11 +335,12 @@ def store_executables_info(info: ExecutablesInfo):
     This will override existing information so use it wisely.
 
     """
-    filepath = get_executables_info_filepath()
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-    with open(filepath, "w") as stream:
-        json.dump(info, stream, indent=4)
+    store = get_launcher_state_store()
+    store.replace_executables(info.get("available_versions") or [])
+    last_cleanup = info.get("last_cleanup")
+    if last_cleanup:
+        store.set_value("executables_last_cleanup", last_cleanup)
+    _export_executables_info(store)
 
 
 def load_version_from_file(filepath: str) -> str:
@@ -340,9 +400,8 @@ def store_executables(executables: Iterable[str]):
         executables (Iterable[str]): Paths to executables.
 
     """
-    info = get_executables_info(check_cleanup=False)
-    info.setdefault("available_versions", [])
-
+    store = get_launcher_state_store()
+    items = []
     for executable in executables:
         if not executable or not os.path.exists(executable):
             continue
@@ -355,32 +414,21 @@ def store_executables(executables: Iterable[str]):
 
         version = load_version_from_root(root)
 
-        match_item = None
-        item_is_new = True
-        for item in info["available_versions"]:
-            # 'executable' is unique identifier if available versions
-            item_executable = item.get("executable")
-            if not item_executable or item_executable != executable:
-                continue
-
-            # Version has changed, update it
-            if item.get("version") != version:
-                match_item = item
-            item_is_new = False
-            break
-
-        if match_item is None:
-            if not item_is_new:
-                continue
-            match_item = {}
-            info["available_versions"].append(match_item)
+        # 'executable' is unique identifier if available versions
+        item = store.get_executable(executable)
+        # Skip if version did not change
+        if item is not None and item.get("version") == version:
+            continue
 
-        match_item.update({
+        items.append({
             "version": version,
             "executable": executable,
             "added": datetime.datetime.now().strftime("%y-%m-%d-%H%M"),
         })
-    store_executables_info(info)
+
+    if items:
+        store.set_executables(items)
+        _export_executables_info(store)
 
 
 def store_current_executable_info():
@@ -415,8 +463,9 @@ def get_executables_info_by_version(
         list[dict[str, Any]]: Executable info matching version.
 
     """
-    info = get_executables_info()
-    available_versions = info.setdefault("available_versions", [])
+    store = get_launcher_state_store()
+    _cleanup_executables_if_needed(store)
+    available_versions = store.get_executables_by_version(version)
     if validate:
         _available_versions = []
         for item in available_versions:
@@ -428,11 +477,7 @@ def get_executables_info_by_version(
             if executable_version == version:
                 _available_versions.append(item)
         available_versions = _available_versions
-    return [
-        item
-        for item in available_versions
-        if item.get("version") == version
-    ]
+    return available_versions
 
 
 def get_executable_paths_by_version(version: str) -> List[str]:
@@ -616,13 +661,275 @@ def get_archive_ext_and_type(
     return None, None
 
 
-def extract_archive_file(archive_file: str, dst_folder: Optional[str] = None):
+def get_tar_open_mode(archive_ext: str, stream: bool = False) -> str:
+    """Mode for 'tarfile.open' based on archive extension.
+
+    Args:
+        archive_ext (str): Archive extension from 'get_archive_ext_and_type'.
+        stream (bool): Mode for reading archive as a stream of blocks.
+
+    Returns:
+        str: Mode for 'tarfile.open'.
+
+    """
+    separator = "|" if stream else ":"
+    if archive_ext == ".tar":
+        compression = ""
+    elif archive_ext.endswith(".xz"):
+        compression = "xz"
+    elif archive_ext.endswith(".gz") or archive_ext == ".tgz":
+        compression = "gz"
+    elif archive_ext.endswith(".bz2"):
+        compression = "bz2"
+    else:
+        compression = "*"
+    return f"r{separator}{compression}"
+
+
+def get_extract_workers_count() -> int:
+    """Number of workers used to extract archive files.
+
+    Can be changed with 'AYON_EXTRACT_WORKERS' environment variable. The
+    value is limited to 'MAX_EXTRACT_WORKERS'.
+
+    Returns:
+        int: Number of workers.
+
+    """
+    count = os.cpu_count() or 1
+    value = os.getenv("AYON_EXTRACT_WORKERS")
+    if value:
+        try:
+            count = max(int(value), 1)
+        except ValueError:
+            pass
+    return min(count, MAX_EXTRACT_WORKERS)
+
+
+class _ExtractBudget:
+    lock = threading.Lock()
+    semaphore = None
+
+
+@contextlib.contextmanager
+def _extract_workers_budget():
+    """Take extraction workers from budget shared by the process.
+
+    Archives extracted at the same time share 'get_extract_workers_count'
+    workers, so concurrent extractions don't oversubscribe threads.
+    Extraction always gets at least one worker.
+
+    Yields:
+        int: Number of workers to use.
+
+    """
+    with _ExtractBudget.lock:
+        if _ExtractBudget.semaphore is None:
+            _ExtractBudget.semaphore = threading.Semaphore(
+                get_extract_workers_count()
+            )
+    semaphore = _ExtractBudget.semaphore
+
+    acquired = 0
+    while (
+        acquired < MAX_EXTRACT_WORKERS
+        and semaphore.acquire(blocking=False)
+    ):
+        acquired += 1
+    try:
+        yield max(acquired, 1)
+    finally:
+        for _ in range(acquired):
+            semaphore.release()
+
+
+def _split_by_size(
+    items: List[Any], sizes: List[int], count: int
+) -> List[List[Any]]:
+    """Split items into buckets with similar total size.
+
+    Args:
+        items (List[Any]): Items to split.
+        sizes (List[int]): Size of each item.
+        count (int): Number of buckets.
+
+    Returns:
+        List[List[Any]]: Non-empty buckets of items.
+
+    """
+    buckets = [[] for _ in range(count)]
+    bucket_sizes = [0] * count
+    for size, item in sorted(
+        zip(sizes, items), key=lambda pair: pair[0], reverse=True
+    ):
+        idx = bucket_sizes.index(min(bucket_sizes))
+        buckets[idx].append(item)
+        # Count each member at least as 1 so empty files are distributed
+        bucket_sizes[idx] += max(size, 1)
+    return [bucket for bucket in buckets if bucket]
+
+
+def _get_zip_member_dirpath(
+    member: zipfile.ZipInfo, dst_folder: str
+) -> Optional[str]:
+    """Directory created by extraction of zip member.
+
+    Mimics path sanitization of 'zipfile.ZipFile._extract_member'.
+
+    Args:
+        member (zipfile.ZipInfo): Zip member.
+        dst_folder (str): Extraction root.
+
+    Returns:
+        Optional[str]: Directory path or None if member is in root.
+
+    """
+    arcname = member.filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [
+        part
+        for part in arcname.split(os.path.sep)
+        if part not in ("", os.path.curdir, os.path.pardir)
+    ]
+    if not member.is_dir():
+        parts = parts[:-1]
+    if not parts:
+        return None
+    arcname = os.path.sep.join(parts)
+    if os.path.sep == "\\":
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.path.sep)
+    return os.path.join(dst_folder, arcname)
+
+
+def _extract_zip_members(
+    archive_file: str, members: List[zipfile.ZipInfo], dst_folder: str
+):
+    # Each worker must have own file handle
+    with ZipFileLongPaths(archive_file) as zip_file:
+        for member in members:
+            zip_file.extract(member, dst_folder)
+
+
+def _extract_zip_parallel(
+    archive_file: str, dst_folder: str, workers: int
+) -> Dict[str, float]:
+    timings = {}
+    start = time.perf_counter()
+    with ZipFileLongPaths(archive_file) as zip_file:
+        members = zip_file.infolist()
+    timings["listing"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dirpaths = set()
+    for member in members:
+        dirpath = _get_zip_member_dirpath(member, dst_folder)
+        if dirpath:
+            dirpaths.add(dirpath)
+    # Longest paths first, so parent directories are created with them
+    for dirpath in sorted(dirpaths, key=len, reverse=True):
+        if not os.path.isdir(dirpath):
+            os.makedirs(dirpath, exist_ok=True)
+    timings["directories"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    files = [member for member in members if not member.is_dir()]
+    buckets = _split_by_size(
+        files, [member.compress_size for member in files], workers
+    )
+    with ThreadPoolExecutor(len(buckets) or 1) as executor:
+        futures = [
+            executor.submit(
+                _extract_zip_members, archive_file, bucket, dst_folder
+            )
+            for bucket in buckets
+        ]
+        for future in futures:
+            future.result()
+    timings["files"] = time.perf_counter() - start
+    return timings
+
+
+def _extract_tar_members(
+    archive_file: str, members: List[tarfile.TarInfo], dst_folder: str
+):
+    # Each worker must have own file handle, offsets in members are valid
+    #   for any handle of the same uncompressed archive
+    with tarfile.open(archive_file, "r:") as tar_file:
+        for member in members:
+            tar_file.extract(member, dst_folder)
+
+
+def _extract_tar_parallel(
+    archive_file: str, dst_folder: str, workers: int
+) -> Dict[str, float]:
+    timings = {}
+    with tarfile.open(archive_file, "r:") as tar_file:
+        start = time.perf_counter()
+        members = tar_file.getmembers()
+        timings["listing"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        files = []
+        others = []
+        for member in members:
+            if member.isreg():
+                files.append(member)
+            else:
+                others.append(member)
+        dirpaths = {
+            os.path.dirname(os.path.join(dst_folder, member.name))
+            for member in files
+        }
+        for dirpath in sorted(dirpaths, key=len, reverse=True):
+            if not os.path.isdir(dirpath):
+                os.makedirs(dirpath, exist_ok=True)
+        timings["directories"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if len(files) < PARALLEL_EXTRACT_MIN_MEMBERS:
+            workers = 1
+        buckets = _split_by_size(
+            files, [member.size for member in files], workers
+        )
+        with ThreadPoolExecutor(len(buckets) or 1) as executor:
+            futures = [
+                executor.submit(
+                    _extract_tar_members, archive_file, bucket, dst_folder
+                )
+                for bucket in buckets
+            ]
+            for future in futures:
+                future.result()
+        timings["files"] = time.perf_counter() - start
+
+        # Directories and links are extracted after files, so links
+        #   have their targets and directory attributes are kept
+        start = time.perf_counter()
+        tar_file.extractall(dst_folder, members=others)
+        timings["links"] = time.perf_counter() - start
+    return timings
+
+
+def extract_archive_file(
+    archive_file: str,
+    dst_folder: Optional[str] = None,
+    workers: Optional[int] = None,
+):
     """Extract archived file to a directory.
 
+    Zip archives and uncompressed tar archives are extracted using multiple
+    threads. Compressed tar archives can be read only sequentially, so they
+    are always extracted on single thread.
+
     Args:
         archive_file (str): Path to a archive file.
         dst_folder (Optional[str]): Directory where content will be extracted.
             By default, same folder where archive file is.
+        workers (Optional[int]): Number of extraction workers. Workers
+            not used by other extractions in the process are used if not
+            passed, see 'get_extract_workers_count'.
 
     """
     if not dst_folder:
@@ -638,42 +945,124 @@ def extract_archive_file(archive_file: str, dst_folder: Optional[str] = None):
             f" Expected {', '.join(IMPLEMENTED_ARCHIVE_FORMATS)}"
         ))
 
+    if workers is not None:
+        _extract_archive_file(
+            archive_file, archive_ext, archive_type, dst_folder, workers
+        )
+        return
+
+    with _extract_workers_budget() as workers:
+        _extract_archive_file(
+            archive_file, archive_ext, archive_type, dst_folder, workers
+        )
+
+
+def _extract_archive_file(
+    archive_file: str,
+    archive_ext: str,
+    archive_type: str,
+    dst_folder: str,
+    workers: int,
+):
+    start = time.perf_counter()
+    timings = None
     if archive_type == "zip":
         zip_file = ZipFileLongPaths(archive_file)
-        zip_file.extractall(dst_folder)
-        zip_file.close()
-
-    elif archive_type == "tar":
-        if archive_ext == ".tar":
-            tar_type = "r:"
-        elif archive_ext.endswith(".xz"):
-            tar_type = "r:xz"
-        elif archive_ext.endswith(".gz"):
-            tar_type = "r:gz"
-        elif archive_ext.endswith(".bz2"):
-            tar_type = "r:bz2"
+        if workers > 1 and len(zip_file.infolist()) >= (
+            PARALLEL_EXTRACT_MIN_MEMBERS
+        ):
+            zip_file.close()
+            timings = _extract_zip_parallel(archive_file, dst_folder, workers)
         else:
-            tar_type = "r:*"
+            zip_file.extractall(dst_folder)
+            zip_file.close()
 
+    elif archive_type == "tar":
+        tar_type = get_tar_open_mode(archive_ext)
         try:
             tar_file = tarfile.open(archive_file, tar_type)
         except tarfile.ReadError:
             raise SystemExit("corrupted archive")
 
-        tar_file.extractall(dst_folder)
-        tar_file.close()
+        if archive_ext == ".tar" and workers > 1:
+            tar_file.close()
+            timings = _extract_tar_parallel(archive_file, dst_folder, workers)
+        else:
+            tar_file.extractall(dst_folder)
+            tar_file.close()
+
+    duration = time.perf_counter() - start
+    if timings:
+        phases = ", ".join(
+            "{} {:.2f}s".format(phase, phase_duration)
+            for phase, phase_duration in timings.items()
+        )
+        log.debug("Extracted in {:.2f}s using {} workers ({})".format(
+            duration, workers, phases
+        ))
+    else:
+        log.debug("Extracted in {:.2f}s".format(duration))
+
+
+def create_hash_object(checksum_algorithm: str) -> Any:
+    """Create hash object for checksum algorithm.
+
+    Any algorithm available in 'hashlib' can be used (e.g. 'blake2b').
+    Name is case-insensitive and dashes can be used instead of underscores
+        (e.g. 'SHA3-256').
+
+    Args:
+        checksum_algorithm (str): Algorithm name.
+
+    Returns:
+        Any: Hash object from 'hashlib'.
+
+    Raises:
+        ValueError: Unknown checksum algorithm.
+
+    """
+    name = (checksum_algorithm or "").lower().replace("-", "_")
+    for candidate in (name, name.replace("_", "")):
+        if candidate in hashlib.algorithms_available:
+            return hashlib.new(candidate)
+    raise ValueError(
+        "Unknown checksum algorithm '{}'".format(checksum_algorithm))
+
+
+def get_hash_workers_count() -> int:
+    """Number of workers used to hash multiple files at once.
+
+    Can be changed with 'AYON_HASH_WORKERS' environment variable.
+
+    Returns:
+        int: Number of workers.
+
+    """
+    value = os.getenv("AYON_HASH_WORKERS")
+    if value:
+        try:
+            return max(int(value), 1)
+        except ValueError:
+            pass
+    return min(os.cpu_count() or 1, MAX_HASH_WORKERS)
 
 
 def calculate_file_checksum(
-    filepath: str, checksum_algorithm: str, chunk_size: Optional[int]=10000
+    filepath: str,
+    checksum_algorithm: str,
+    chunk_size: Optional[int] = None,
 ):
     """Calculate file checksum for given algorithm.
 
+    File is read to reused buffer, hashing of large buffers releases GIL
+        so multiple files can be hashed in threads.
+
     Args:
         filepath (str): Path to a file.
-        checksum_algorithm (str): Algorithm to use. ('md5', 'sha1', 'sha256')
+        checksum_algorithm (str): Algorithm to use. ('md5', 'sha1',
+            'sha256', 'blake2b', ...)
         chunk_size (Optional[int]): Chunk size to read file.
-            Defaults to 10000.
+            Defaults to 'HASH_CHUNK_SIZE'.
 
     Returns:
         str: Calculated checksum.
@@ -682,8 +1071,6 @@ def calculate_file_checksum(
         ValueError: File not found or unknown checksum algorithm.
 
     """
-    import hashlib
-
     if not filepath:
         raise ValueError("Filepath is empty.")
 
@@ -693,23 +1080,128 @@ def calculate_file_checksum(
     if not os.path.isfile(filepath):
         raise ValueError("{} is not a file.".format(filepath))
 
-    func = getattr(hashlib, checksum_algorithm, None)
-    if func is None:
-        raise ValueError(
-            "Unknown checksum algorithm '{}'".format(checksum_algorithm))
-
-    hash_obj = func()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            hash_obj.update(chunk)
+    hash_obj = create_hash_object(checksum_algorithm)
+    buffer = bytearray(chunk_size or HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(filepath, "rb", buffering=0) as stream:
+        while True:
+            size = stream.readinto(buffer)
+            if not size:
+                break
+            hash_obj.update(view[:size])
     return hash_obj.hexdigest()
 
 
+def calculate_files_checksums(
+    filepaths: Iterable[str],
+    checksum_algorithm: str,
+    max_workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """Calculate checksums of multiple files concurrently.
+
+    Args:
+        filepaths (Iterable[str]): Paths to files.
+        checksum_algorithm (str): Algorithm to use.
+        max_workers (Optional[int]): Maximum number of threads. Output of
+            'get_hash_workers_count' is used if not passed.
+
+    Returns:
+        Dict[str, str]: Checksum by file path.
+
+    Raises:
+        ValueError: File not found or unknown checksum algorithm.
+
+    """
+    filepaths = list(dict.fromkeys(filepaths))
+    if max_workers is None:
+        max_workers = get_hash_workers_count()
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="ayon_hash"
+    ) as executor:
+        checksums = executor.map(
+            lambda filepath: calculate_file_checksum(
+                filepath, checksum_algorithm
+            ),
+            filepaths
+        )
+        return dict(zip(filepaths, checksums))
+
+
+def is_verified_files_cache_enabled() -> bool:
+    """Check if checksums of verified files are remembered.
+
+    Cache can be disabled with 'AYON_VERIFIED_FILES_CACHE' set to '0'.
+
+    Returns:
+        bool: Cache of verified files is enabled.
+
+    """
+    return os.getenv("AYON_VERIFIED_FILES_CACHE") != "0"
+
+
+def _get_cached_file_checksum(
+    filepath: str, checksum_algorithm: str
+) -> str:
+    """Calculate file checksum or use checksum calculated before.
+
+    Checksum is remembered with size, modification time and inode of
+    the file. File with the same stat is not hashed again.
+
+    Args:
+        filepath (str): Path to a file.
+        checksum_algorithm (str): Algorithm to use.
+
+    Returns:
+        str: Calculated checksum.
+
+    Raises:
+        ValueError: File not found or unknown checksum algorithm.
+
+    """
+    filepath = os.path.abspath(filepath)
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        # Let checksum calculation raise the expected error
+        return calculate_file_checksum(filepath, checksum_algorithm)
+
+    signature = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    try:
+        store = get_launcher_state_store()
+        checksum = store.get_verified_checksum(
+            filepath, checksum_algorithm, *signature
+        )
+    except sqlite3.Error:
+        store = None
+        checksum = None
+
+    if checksum is not None:
+        return checksum
+
+    checksum = calculate_file_checksum(filepath, checksum_algorithm)
+    # Don't remember checksum if file changed while it was hashed
+    stat = os.stat(filepath)
+    if store is not None and signature == (
+        stat.st_size, stat.st_mtime_ns, stat.st_ino
+    ):
+        try:
+            store.set_verified_checksum(
+                filepath, checksum_algorithm, *signature,
+                checksum, time.time()
+            )
+        except sqlite3.Error:
+            pass
+    return checksum
+
+
 def validate_file_checksum(
     filepath: str, checksum: str, checksum_algorithm: str
 ) -> bool:
     """Validate file checksum.
 
+    Checksum of file that did not change since it was verified last time
+    is not calculated again.
+
     Args:
         filepath (str): Path to file.
         checksum (str): Hash of file.
@@ -722,7 +1214,48 @@ def validate_file_checksum(
         ValueError: File not found or unknown checksum algorithm.
 
     """
-    return checksum == calculate_file_checksum(filepath, checksum_algorithm)
+    if not is_verified_files_cache_enabled():
+        return checksum == calculate_file_checksum(
+            filepath, checksum_algorithm
+        )
+    return checksum == _get_cached_file_checksum(
+        filepath, checksum_algorithm
+    )
+
+
+def validate_files_checksums(
+    files: Iterable[Tuple[str, str, str]],
+    max_workers: Optional[int] = None,
+) -> Dict[str, bool]:
+    """Validate checksums of multiple files concurrently.
+
+    Args:
+        files (Iterable[Tuple[str, str, str]]): File path, expected
+            checksum and checksum algorithm of each file.
+        max_workers (Optional[int]): Maximum number of threads. Output of
+            'get_hash_workers_count' is used if not passed.
+
+    Returns:
+        Dict[str, bool]: Validation result by file path.
+
+    Raises:
+        ValueError: File not found or unknown checksum algorithm.
+
+    """
+    files = list(files)
+    if max_workers is None:
+        max_workers = get_hash_workers_count()
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="ayon_hash"
+    ) as executor:
+        results = executor.map(
+            lambda item: validate_file_checksum(*item),
+            files
+        )
+        return {
+            item[0]: result
+            for item, result in zip(files, results)
+        }
 
 
 # --- SHIM information ---
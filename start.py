@@ -16,6 +16,12 @@ Arguments that are always handled by AYON launcher:
     --use-dev - use dev server
     --bundle <bundle_name> - specify bundle name to use
     --headless - enable headless mode - bootstrap won't show any UI
+    --verify-distribution - verify files of distributed addons and
+        dependency package and repair damaged files
+
+Commands handled by AYON launcher without bootstrap:
+    collect-garbage - remove least recently used addons and dependency
+        packages over quota ('AYON_DISTRIBUTION_QUOTA' in bytes)
 
 AYON launcher can be running in multiple different states. The top layer of
 states is 'production', 'staging' and 'dev'.
@@ -62,6 +68,17 @@ Environment variables set during bootstrap:
     - AYON_LAUNCHER_LOCAL_DIR - dir where machine specific files are stored
     - AYON_ADDONS_DIR - path to AYON addons directory
     - AYON_DEPENDENCIES_DIR - path to AYON dependencies directory
+    - AYON_BOOTSTRAP_SNAPSHOT - path to snapshot of bootstrap result used
+        by child processes to skip bootstrap
+    - AYON_BOOTSTRAP_SNAPSHOT_MTIME - modification time of the snapshot
+
+Offline-first startup is enabled with 'AYON_OFFLINE_FIRST' set to '1'.
+AYON launcher then starts from last successful bootstrap, validated in last
+'AYON_OFFLINE_FIRST_MAX_AGE' seconds, and validates the bundle with server
+in background. User is notified if the bundle changed. Disks are mapped
+with settings stored with the last bootstrap. Set
+'AYON_STRICT_BOOTSTRAP' to '1' on farm to always use bundle validated
+with server.
 
 Some of the environment variables are not in this script but in 'ayon_common'
 module.
@@ -79,6 +96,7 @@ import sys
 import site
 import time
 import traceback
+import threading
 import subprocess
 from contextlib import contextmanager
 from urllib.parse import urlparse, parse_qs
@@ -163,6 +181,12 @@ if "--use-dev" in sys.argv:
     sys.argv.remove("--use-dev")
     os.environ["AYON_USE_DEV"] = "1"
 
+# Verify files of distributed items and repair damaged files
+VERIFY_DISTRIBUTION = os.getenv("AYON_VERIFY_DISTRIBUTION") == "1"
+if "--verify-distribution" in sys.argv:
+    sys.argv.remove("--verify-distribution")
+    VERIFY_DISTRIBUTION = True
+
 SHOW_LOGIN_UI = False
 if "--ayon-login" in sys.argv:
     sys.argv.remove("--ayon-login")
@@ -218,6 +242,11 @@ elif os.getenv("AYON_HEADLESS_MODE") != "1":
 IS_BUILT_APPLICATION = getattr(sys, "frozen", False)
 HEADLESS_MODE_ENABLED = os.getenv("AYON_HEADLESS_MODE") == "1"
 AYON_IN_LOGIN_MODE = os.environ["AYON_IN_LOGIN_MODE"] == "1"
+# Connection attempts of background revalidation of last bootstrap
+REVALIDATION_TIMEOUT = 10
+REVALIDATION_ATTEMPTS = 4
+# Sleep between attempts, doubled with each attempt
+REVALIDATION_RETRY_SLEEP = 5
 
 _pythonpath = os.getenv("PYTHONPATH", "")
 _python_paths = _pythonpath.split(os.pathsep)
@@ -305,6 +334,7 @@ elif os.getenv("SSL_CERT_FILE") != certifi.where():
 
 from ayon_api import (  # noqa E402
     get_base_url,
+    is_connection_created,
     set_default_settings_variant,
     get_addons_studio_settings,
     get_event,
@@ -335,6 +365,12 @@ from ayon_common.distribution import (  # noqa E402
     show_missing_bundle_information,
     show_installer_issue_information,
     UpdateWindowManager,
+    lease_directories,
+    lease_directories_in_background,
+    is_lease_recent,
+    collect_garbage,
+    schedule_garbage_collection,
+    wait_for_trash_cleanup,
 )
 
 from ayon_common.utils import (  # noqa E402
@@ -345,9 +381,23 @@ from ayon_common.utils import (  # noqa E402
     get_launcher_storage_dir,
 )
 from ayon_common.startup import show_startup_error  # noqa E402
+from ayon_common.startup.snapshot import (  # noqa E402
+    load_bootstrap_snapshot,
+    store_bootstrap_snapshot,
+)
+from ayon_common.startup.last_bootstrap import (  # noqa E402
+    is_strict_bootstrap_enabled,
+    is_offline_first_enabled,
+    get_last_bootstrap_key,
+    load_last_bootstrap,
+    store_last_bootstrap,
+    mark_last_bootstrap_validated,
+    mark_last_bootstrap_changed,
+    mark_last_bootstrap_pending,
+)
 
 
-def _connect_to_ayon_server(force=False, username=None):
+def _connect_to_ayon_server(force=False, username=None, load_env=True):
     """Connect to AYON server.
 
     Load existing credentials to AYON server, and show login dialog if are not
@@ -361,13 +411,17 @@ def _connect_to_ayon_server(force=False, username=None):
     Args:
         force (Optional[bool]): Force login to server.
         username (Optional[str]): Username that will be forced to use.
+        load_env (Optional[bool]): Load server url and api key to
+            environment variables. Can be disabled if they were already
+            loaded.
 
     """
     if force and HEADLESS_MODE_ENABLED:
         _print("!!! Login UI was requested in headless mode.")
         sys.exit(1)
 
-    load_environments()
+    if load_env:
+        load_environments()
     need_server = need_api_key = True
     if not force:
         need_server, need_api_key = need_server_or_login(username)
@@ -452,7 +506,9 @@ def _set_default_settings_variant(use_dev, use_staging, bundle_name):
     # Make sure staging is unset when 'dev' should be used
     if not use_staging:
         os.environ.pop("AYON_USE_STAGING", None)
-    set_default_settings_variant(variant)
+    # Connection created later uses variant from environment variable
+    if is_connection_created():
+        set_default_settings_variant(variant)
 
 
 def _prepare_disk_mapping_args(src_path, dst_path):
@@ -491,23 +547,34 @@ def _prepare_disk_mapping_args(src_path, dst_path):
     return []
 
 
-def _run_disk_mapping(bundle_name):
-    """Run disk mapping logic.
+def _get_disk_mapping(bundle_name):
+    """Disk mapping for current platform from core addon settings.
+
+    To receive correct settings from server '_set_default_settings_variant'
+        must be called first.
 
-    Mapping of disks is taken from core addon settings. To run this logic
-        '_set_default_settings_variant' must be called first, so correct
-        settings are received from server.
+    Args:
+        bundle_name (str): Name of used bundle.
+
+    Returns:
+        list[dict[str, str]]: Items with 'source' and 'destination'.
     """
 
     low_platform = platform.system().lower()
     settings = get_addons_studio_settings(bundle_name)
     core_settings = settings.get("core") or {}
     disk_mapping = core_settings.get("disk_mapping") or {}
-    platform_disk_mapping = disk_mapping.get(low_platform)
-    if not platform_disk_mapping:
-        return
+    return disk_mapping.get(low_platform) or []
+
 
-    for item in platform_disk_mapping:
+def _run_disk_mapping(disk_mapping):
+    """Run disk mapping logic.
+
+    Args:
+        disk_mapping (list[dict[str, str]]): Output of '_get_disk_mapping'.
+    """
+
+    for item in disk_mapping:
         src_path = item.get("source")
         dst_path = item.get("destination")
         if not src_path or not dst_path:
@@ -533,9 +600,81 @@ def _run_disk_mapping(bundle_name):
             raise
 
 
+def _try_get_disk_mapping(bundle_name):
+    """Receive disk mapping from server and print error if it failed.
+
+    Args:
+        bundle_name (str): Name of used bundle.
+
+    Returns:
+        Union[list[dict[str, str]], None]: Disk mapping or None if it
+            could not be received.
+    """
+
+    try:
+        return _get_disk_mapping(bundle_name)
+    except Exception:
+        _print("!!! Failed to receive disk mapping settings.")
+        traceback.print_exception(*sys.exc_info())
+    return None
+
+
+def _try_run_disk_mapping(disk_mapping):
+    """Run disk mapping and print error if it failed.
+
+    Args:
+        disk_mapping (Union[list[dict[str, str]], None]): Disk mapping,
+            mapping fails if is 'None'.
+
+    Returns:
+        bool: Disk mapping did run.
+    """
+
+    if disk_mapping is None:
+        return False
+
+    try:
+        _run_disk_mapping(disk_mapping)
+    except Exception:
+        _print("!!! Failed to run disk mapping.")
+        traceback.print_exception(*sys.exc_info())
+        return False
+    return True
+
+
+def _add_distribution_paths(python_paths, sys_paths):
+    """Add paths of distributed items to 'sys.path' and PYTHONPATH.
+
+    Args:
+        python_paths (list[str]): Paths to add to PYTHONPATH.
+        sys_paths (list[str]): Paths to add only to 'sys.path'.
+    """
+
+    # TODO probably remove paths to other addons?
+    env_python_paths = [
+        path
+        for path in os.getenv("PYTHONPATH", "").split(os.pathsep)
+        if path
+    ]
+
+    for path in python_paths:
+        sys.path.insert(0, path)
+        if path not in env_python_paths:
+            env_python_paths.append(path)
+
+    for path in sys_paths:
+        sys.path.insert(0, path)
+
+    os.environ["PYTHONPATH"] = os.pathsep.join(env_python_paths)
+
+
 def _start_distribution():
     """Gets info from AYON server and updates possible missing pieces.
 
+    Returns:
+        dict[str, Any]: Bootstrap result which can be used by child
+            processes.
+
     Raises:
         RuntimeError
     """
@@ -544,6 +683,8 @@ def _start_distribution():
     distribution = AyonDistribution(
         skip_installer_dist=not IS_BUILT_APPLICATION
     )
+    # Request server information at once instead of one by one
+    distribution.prefetch_server_info()
     bundle = None
     bundle_name = None
     # Try to find required bundle and handle missing one
@@ -594,7 +735,8 @@ def _start_distribution():
         distribution.use_staging,
         bundle_name
     )
-    _run_disk_mapping(bundle_name)
+    disk_mapping = _try_get_disk_mapping(bundle_name)
+    disk_mapped = _try_run_disk_mapping(disk_mapping)
 
     # Start distribution
     update_window_manager = UpdateWindowManager()
@@ -602,7 +744,9 @@ def _start_distribution():
         update_window_manager.start()
 
     try:
-        distribution.distribute()
+        distribution.distribute(threaded=True)
+        if VERIFY_DISTRIBUTION and not distribution.need_installer_change:
+            distribution.verify_distribution()
     finally:
         update_window_manager.stop()
 
@@ -632,22 +776,272 @@ def _start_distribution():
     distribution.validate_distribution()
     os.environ["AYON_BUNDLE_NAME"] = bundle_name
 
-    # TODO probably remove paths to other addons?
-    python_paths = [
-        path
-        for path in os.getenv("PYTHONPATH", "").split(os.pathsep)
-        if path
-    ]
+    python_paths = distribution.get_python_paths()
+    sys_paths = distribution.get_sys_paths()
+    _add_distribution_paths(python_paths, sys_paths)
+    return {
+        "bundle_name": bundle_name,
+        "use_dev": distribution.use_dev,
+        "use_staging": distribution.use_staging,
+        "python_paths": python_paths,
+        "sys_paths": sys_paths,
+        "dirpaths": distribution.get_bundle_dirpaths(),
+        "bundle_fingerprint": distribution.get_bundle_fingerprint(),
+        "disk_mapped": disk_mapped,
+        "disk_mapping": disk_mapping,
+        "leased": distribution.get_lease_time(),
+    }
+
+
+def _apply_bootstrap_result(bootstrap_result):
+    """Use result of previous bootstrap without distribution.
 
-    for path in distribution.get_python_paths():
-        sys.path.insert(0, path)
-        if path not in python_paths:
-            python_paths.append(path)
+    Args:
+        bootstrap_result (dict[str, Any]): Output of '_start_distribution'.
 
-    for path in distribution.get_sys_paths():
-        sys.path.insert(0, path)
+    Returns:
+        bool: Result was used, False if distributed content is missing.
+    """
+
+    # Directories leased recently can't be removed by garbage collection,
+    #   otherwise they must be leased before they're checked
+    dirpaths = bootstrap_result["dirpaths"]
+    if is_lease_recent(bootstrap_result.get("leased")):
+        lease_directories_in_background(dirpaths)
+    else:
+        lease_directories(dirpaths)
+        bootstrap_result["leased"] = time.time()
+    python_paths = bootstrap_result["python_paths"]
+    sys_paths = bootstrap_result["sys_paths"]
+    if not all(os.path.exists(path) for path in python_paths + sys_paths):
+        return False
 
-    os.environ["PYTHONPATH"] = os.pathsep.join(python_paths)
+    bundle_name = bootstrap_result["bundle_name"]
+    _set_default_settings_variant(
+        bootstrap_result["use_dev"],
+        bootstrap_result["use_staging"],
+        bundle_name
+    )
+    os.environ["AYON_BUNDLE_NAME"] = bundle_name
+    _add_distribution_paths(python_paths, sys_paths)
+    return True
+
+
+def _boot_from_snapshot():
+    """Use bootstrap result of parent process.
+
+    Connection validation, disk mapping and distribution are skipped
+    when parent process stored valid snapshot of its bootstrap. Mapped
+    disks are available to all processes of the user session, so disk
+    mapping runs only if parent process did not map disks.
+
+    Global connection is not created, 'ayon_api' creates it with
+    validation of server and token on first use. Disks are mapped with
+    settings stored in the snapshot if available.
+
+    Returns:
+        bool: Bootstrap snapshot was used.
+    """
+
+    snapshot = load_bootstrap_snapshot()
+    if not snapshot:
+        return False
+
+    # Parent process did not validate bundle with server
+    if snapshot.get("offline_first") and is_strict_bootstrap_enabled():
+        return False
+
+    if not _apply_bootstrap_result(snapshot):
+        return False
+
+    if snapshot.get("disk_mapped"):
+        return True
+
+    disk_mapping = snapshot.get("disk_mapping")
+    if disk_mapping is None:
+        # Settings for disk mapping must be received from server
+        try:
+            create_global_connection()
+        except Exception:
+            _print("!!! Failed to connect to AYON server.")
+            traceback.print_exception(*sys.exc_info())
+            return True
+        disk_mapping = _try_get_disk_mapping(snapshot["bundle_name"])
+    _try_run_disk_mapping(disk_mapping)
+    return True
+
+
+def _is_server_reachable():
+    """Server responds in 'REVALIDATION_TIMEOUT' seconds.
+
+    Connection created by 'ayon_api' checks server availability without
+        timeout, so it could wait for unreachable server indefinitely.
+
+    Returns:
+        bool: Server is reachable.
+    """
+
+    try:
+        response = requests.get(
+            os.environ[SERVER_URL_ENV_KEY],
+            timeout=REVALIDATION_TIMEOUT,
+            verify=os.getenv("AYON_CA_FILE") or True,
+            cert=os.getenv("AYON_CERT_FILE") or None,
+        )
+    except (KeyError, requests.RequestException):
+        return False
+    return response.status_code == 200
+
+
+def _create_revalidation_connection():
+    """Create global connection for revalidation of last bootstrap.
+
+    Connection is created with retries, waiting between attempts grows
+        with each attempt.
+
+    Returns:
+        bool: Global connection is created.
+    """
+
+    for attempt in range(REVALIDATION_ATTEMPTS):
+        if attempt:
+            time.sleep(REVALIDATION_RETRY_SLEEP * 2 ** (attempt - 1))
+
+        if not _is_server_reachable():
+            continue
+
+        need_server, need_api_key = need_server_or_login()
+        if need_server or need_api_key:
+            return False
+
+        # Connection could be already created lazily by 'ayon_api'
+        if not is_connection_created():
+            create_global_connection()
+        return True
+    return False
+
+
+def _revalidate_last_bootstrap(last_bootstrap_key, bootstrap_result, mode):
+    """Validate that bundle of last bootstrap did not change on server.
+
+    User is notified when the bundle changed, next launch won't use
+        the last bootstrap. Next launch also won't use the last bootstrap
+        if the bundle could not be validated.
+
+    Args:
+        last_bootstrap_key (str): Key of last bootstrap.
+        bootstrap_result (dict[str, Any]): Used bootstrap result.
+        mode (dict[str, Any]): Requested bundle name, dev and staging
+            mode before bootstrap changed environment variables.
+    """
+
+    try:
+        if not _create_revalidation_connection():
+            _print("!!! Could not validate bundle with AYON server.")
+            return
+
+        distribution = AyonDistribution(
+            bundle_name=mode["bundle_name"],
+            use_dev=mode["use_dev"],
+            use_staging=mode["use_staging"],
+            skip_installer_dist=True,
+        )
+        try:
+            fingerprint = distribution.get_bundle_fingerprint()
+        except BundleNotFoundError:
+            fingerprint = None
+
+        installer_version = None
+        if fingerprint is not None:
+            installer_version = distribution.expected_installer_version
+
+        if (
+            IS_BUILT_APPLICATION
+            and installer_version
+            and installer_version != os.getenv("AYON_VERSION")
+        ):
+            message = (
+                f"Bundle '{bootstrap_result['bundle_name']}' requires AYON"
+                f" launcher version '{installer_version}'. Restart AYON"
+                " launcher to use the current bundle."
+            )
+        elif fingerprint == bootstrap_result["bundle_fingerprint"]:
+            mark_last_bootstrap_validated(last_bootstrap_key)
+            return
+
+        else:
+            message = (
+                f"Bundle '{bootstrap_result['bundle_name']}' changed on AYON"
+                " server. Restart AYON launcher to use the current bundle."
+            )
+
+    except Exception:
+        _print("!!! Failed to validate bundle with AYON server.")
+        traceback.print_exception(*sys.exc_info())
+        return
+
+    mark_last_bootstrap_changed(last_bootstrap_key, message)
+    _print(f"!!! {message}")
+    if not HEADLESS_MODE_ENABLED:
+        show_startup_error("Bundle changed", message)
+
+
+def _boot_offline_first(last_bootstrap_key):
+    """Start from last successful bootstrap.
+
+    Connection validation and distribution are skipped, bundle is
+        validated with server in background thread which also creates
+        global connection. Disks are mapped with settings stored with
+        the last bootstrap.
+
+    Args:
+        last_bootstrap_key (Union[str, None]): Key of last bootstrap.
+
+    Returns:
+        bool: Last bootstrap was used.
+    """
+
+    if not last_bootstrap_key or not is_offline_first_enabled():
+        return False
+
+    entry = load_last_bootstrap(last_bootstrap_key)
+    if entry is None:
+        return False
+
+    if entry["changed"]:
+        _print(f"!!! {entry['changed']}")
+        return False
+
+    # Requested mode must be stored before bootstrap result is applied
+    mode = {
+        "bundle_name": os.getenv("AYON_BUNDLE_NAME"),
+        "use_dev": is_dev_mode_enabled(),
+        "use_staging": is_staging_enabled(),
+    }
+    bootstrap_result = entry["data"]
+    if not _apply_bootstrap_result(bootstrap_result):
+        return False
+
+    _print((
+        f">>> Using bundle '{bootstrap_result['bundle_name']}'"
+        " from last launch, validating with AYON server in background."
+    ))
+    disk_mapped = _try_run_disk_mapping(bootstrap_result.get("disk_mapping"))
+    store_bootstrap_snapshot({
+        **bootstrap_result,
+        "disk_mapped": disk_mapped,
+        "offline_first": True,
+    })
+    # Last bootstrap is not used again if revalidation does not finish
+    mark_last_bootstrap_pending(last_bootstrap_key)
+    thread = threading.Thread(
+        target=_revalidate_last_bootstrap,
+        args=(last_bootstrap_key, bootstrap_result, mode),
+        name="ayon_bootstrap_revalidation",
+        daemon=True,
+    )
+    thread.start()
+    return True
 
 
 def init_launcher_executable(ensure_protocol_is_registered=False):
@@ -682,9 +1076,18 @@ def boot():
     if SITE_ID_ENV_KEY not in os.environ:
         os.environ[SITE_ID_ENV_KEY] = get_local_site_id()
 
-    _connect_to_ayon_server()
-    create_global_connection()
-    _start_distribution()
+    if not _boot_from_snapshot():
+        load_environments()
+        # Key must be created before bootstrap changes environment
+        last_bootstrap_key = get_last_bootstrap_key()
+        if not _boot_offline_first(last_bootstrap_key):
+            _connect_to_ayon_server(load_env=False)
+            create_global_connection()
+            bootstrap_result = _start_distribution()
+            store_bootstrap_snapshot(bootstrap_result)
+            if last_bootstrap_key:
+                store_last_bootstrap(last_bootstrap_key, bootstrap_result)
+        schedule_garbage_collection()
     fill_pythonpath()
 
     # Call launcher storage dir getters to make sure their
@@ -1020,6 +1423,13 @@ def main():
         init_launcher_executable(ensure_protocol_is_registered=True)
         sys.exit(0)
 
+    # Remove least recently used addons and dependency packages over quota
+    if "collect-garbage" in sys.argv:
+        for dirpath in collect_garbage():
+            _print(f">>> Removed {dirpath}")
+        wait_for_trash_cleanup()
+        sys.exit(0)
+
     if SHOW_LOGIN_UI:
         if HEADLESS_MODE_ENABLED:
             _print((